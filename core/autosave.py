@@ -1,5 +1,8 @@
 """
-Auto-save - Sauvegarde automatique périodique
+Auto-save - Sauvegarde automatique déclenchée par les modifications
+Rien n'est écrit tant que le livre ne change pas. Après une modification, la
+sauvegarde attend un moment de calme (fin d'une rafale de frappe), sans
+jamais laisser une modification non sauvegardée plus de `interval` secondes.
 """
 import threading
 import time
@@ -7,41 +10,75 @@ from typing import Callable
 
 class AutoSave:
     """Gère la sauvegarde automatique"""
-    
-    def __init__(self, save_callback: Callable, interval: int = 30):
+
+    def __init__(self, save_callback: Callable, get_revision: Callable[[], int], interval: int = 30,
+                 quiet_period: float = 3.0, poll_interval: float = 1.0):
+        """
+        Args:
+            save_callback: Sauvegarde (retourner False en cas d'échec pour réessayer)
+            get_revision: Révision courante du livre (change à chaque modification)
+            interval: Délai max (secondes) entre une modification et sa sauvegarde
+            quiet_period: Secondes sans modification avant de sauvegarder
+            poll_interval: Intervalle de vérification des modifications
+        """
         self.save_callback = save_callback
+        self.get_revision = get_revision
         self.interval = interval  # secondes
+        self.quiet_period = quiet_period
+        self.poll_interval = poll_interval
         self.running = False
         self.thread = None
         self.last_save_time = 0
-    
+
     def start(self):
         """Démarre la sauvegarde automatique"""
         if not self.running:
             self.running = True
             self.thread = threading.Thread(target=self._auto_save_loop, daemon=True)
             self.thread.start()
-    
+
     def stop(self):
         """Arrête la sauvegarde automatique"""
         self.running = False
         if self.thread:
             self.thread.join(timeout=2)
-    
+
     def _auto_save_loop(self):
         """Boucle de sauvegarde automatique"""
+        seen_revision = self.get_revision()
+        first_change = None  # Première modification non sauvegardée
+        last_change = None   # Dernière modification vue
+        retry_at = 0.0       # Après un échec, attendre avant de réessayer
         while self.running:
-            time.sleep(self.interval)
-            if self.running:
-                try:
-                    self.save_callback()
+            time.sleep(self.poll_interval)
+            if not self.running:
+                break
+
+            now = time.time()
+            revision = self.get_revision()
+            if revision != seen_revision:
+                seen_revision = revision
+                last_change = now
+                if first_change is None:
+                    first_change = now
+
+            # Calme après la rafale, ou délai max atteint pendant une frappe continue
+            if first_change is None or now < retry_at or (now - last_change < self.quiet_period and
+                                                          now - first_change < self.interval):
+                continue
+
+            first_change = None
+            try:
+                if self.save_callback() is False:
+                    first_change, retry_at = now, now + self.interval
+                else:
                     self.last_save_time = time.time()
-                except Exception as e:
-                    print(f"Erreur auto-save: {e}")
-    
+            except Exception as e:
+                first_change, retry_at = now, now + self.interval
+                print(f"Erreur auto-save: {e}")
+
     def get_last_save_elapsed(self) -> int:
         """Retourne le temps écoulé depuis la dernière sauvegarde (en secondes)"""
         if self.last_save_time == 0:
             return 0
         return int(time.time() - self.last_save_time)
-
@@ -0,0 +1,229 @@
+"""
+Backup Store - Sauvegardes dédupliquées et compressées du livre
+Le livre est découpé en blobs (métadonnées d'un chapitre, contenu français,
+une traduction) adressés par leur hash : chaque blob distinct n'est stocké
+qu'une fois, compressé. Une sauvegarde n'est qu'un petit manifeste de hash.
+Une politique de rétention élague les manifestes, puis les blobs qui ne sont
+plus référencés sont supprimés.
+"""
+import hashlib
+import json
+import os
+import zlib
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# Nom des manifestes (tri alphabétique = tri chronologique)
+TIME_FORMAT = "%Y%m%d_%H%M%S_%f"
+
+# Anciennes sauvegardes : copie JSON complète à chaque sauvegarde
+LEGACY_PATTERN = "backup_*.json"
+LEGACY_FORMAT = "backup_%Y%m%d_%H%M%S"
+
+class BackupStore:
+    """Sauvegardes du livre adressées par contenu, avec rétention et ramasse-miettes"""
+
+    def __init__(self, root: Path, keep_all: timedelta = timedelta(hours=1),
+                 keep_hourly: timedelta = timedelta(days=1), keep_daily: timedelta = timedelta(days=30)):
+        """
+        Args:
+            root: Dossier des sauvegardes (data/books/backups)
+            keep_all: Toutes les sauvegardes plus récentes sont gardées
+            keep_hourly: Au-delà de keep_all, une sauvegarde par heure
+            keep_daily: Au-delà de keep_hourly, une par jour ; plus vieux = supprimé
+        """
+        self.root = Path(root)
+        self.objects_dir = self.root / "objects"
+        self.manifests_dir = self.root / "manifests"
+        self.keep_all = keep_all
+        self.keep_hourly = keep_hourly
+        self.keep_daily = keep_daily
+
+    @staticmethod
+    def _write_atomic(path: Path, data: bytes):
+        """Écrit un fichier via un temporaire : jamais de fichier à moitié écrit"""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = path.with_suffix('.tmp')
+        with open(temp_path, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+
+    def _object_path(self, key: str) -> Path:
+        """Chemin d'un blob (sous-dossier par préfixe du hash)"""
+        return self.objects_dir / key[:2] / key[2:]
+
+    def _put(self, value) -> str:
+        """Stocke une valeur JSON (si elle n'existe pas déjà) et retourne son hash"""
+        raw = json.dumps(value, ensure_ascii=False, sort_keys=True).encode('utf-8')
+        key = hashlib.sha1(raw).hexdigest()
+        path = self._object_path(key)
+        if not path.exists():
+            self._write_atomic(path, zlib.compress(raw))
+        return key
+
+    def _get(self, key: str):
+        """Relit une valeur stockée"""
+        return json.loads(zlib.decompress(self._object_path(key).read_bytes()).decode('utf-8'))
+
+    def backup(self, data: Dict, when: Optional[datetime] = None) -> str:
+        """
+        Sauvegarde un livre (format de current_book.json)
+
+        Seuls les blobs nouveaux sont écrits : une sauvegarde après quelques
+        modifications coûte quelques blobs et un manifeste.
+
+        Returns:
+            Nom de la sauvegarde
+        """
+        when = when or datetime.now()
+        chapters = []
+        for chapter in data.get("chapters", []):
+            sources = chapter.get("translation_sources", {})
+            meta = {key: value for key, value in chapter.items()
+                    if key not in ("content_fr", "translations", "translation_sources")}
+            chapters.append({
+                "meta": self._put(meta),
+                "content": self._put(chapter.get("content_fr", "")),
+                "translations": {lang: self._put({"text": text, "sources": sources.get(lang)})
+                                 for lang, text in chapter.get("translations", {}).items()}
+            })
+
+        manifest = {
+            "created_at": when.isoformat(),
+            "book": {key: value for key, value in data.items() if key != "chapters"},
+            "chapters": chapters
+        }
+        name = when.strftime(TIME_FORMAT)
+        self._write_atomic(self.manifests_dir / f"{name}.json",
+                           json.dumps(manifest, ensure_ascii=False).encode('utf-8'))
+        return name
+
+    def list_backups(self) -> List[str]:
+        """Noms des sauvegardes, de la plus ancienne à la plus récente"""
+        if not self.manifests_dir.exists():
+            return []
+        return sorted(path.stem for path in self.manifests_dir.glob("*.json"))
+
+    @staticmethod
+    def backup_time(name: str) -> datetime:
+        """Date d'une sauvegarde"""
+        return datetime.strptime(name, TIME_FORMAT)
+
+    def find(self, at: datetime) -> Optional[str]:
+        """Dernière sauvegarde faite au plus tard à la date donnée"""
+        found = None
+        for name in self.list_backups():
+            if self.backup_time(name) > at:
+                break
+            found = name
+        return found
+
+    def restore(self, name: str) -> Dict:
+        """
+        Reconstruit un livre sauvegardé
+
+        Returns:
+            Données au format de current_book.json
+        """
+        with open(self.manifests_dir / f"{name}.json", 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+
+        chapters = []
+        for entry in manifest["chapters"]:
+            chapter = self._get(entry["meta"])
+            chapter["content_fr"] = self._get(entry["content"])
+            chapter["translations"] = {}
+            chapter["translation_sources"] = {}
+            for lang, key in entry["translations"].items():
+                translation = self._get(key)
+                chapter["translations"][lang] = translation["text"]
+                if translation["sources"] is not None:
+                    chapter["translation_sources"][lang] = translation["sources"]
+            chapters.append(chapter)
+
+        return dict(manifest["book"], chapters=chapters)
+
+    def _keep(self, times: List[datetime], now: datetime) -> set:
+        """Indices des dates gardées par la politique de rétention (plus récente par période)"""
+        keep = set()
+        buckets = set()
+        for index in sorted(range(len(times)), key=lambda i: times[i], reverse=True):
+            age = now - times[index]
+            if not keep or age <= self.keep_all:
+                keep.add(index)  # La plus récente est toujours gardée
+                continue
+            if age <= self.keep_hourly:
+                bucket = ('h', times[index].strftime("%Y%m%d%H"))
+            elif age <= self.keep_daily:
+                bucket = ('d', times[index].date())
+            else:
+                continue
+            if bucket not in buckets:
+                buckets.add(bucket)
+                keep.add(index)
+        return keep
+
+    def prune(self, now: Optional[datetime] = None) -> int:
+        """
+        Applique la politique de rétention
+
+        Les anciennes copies complètes (backup_*.json) suivent la même
+        politique : celles gardées sont importées dans le magasin.
+
+        Returns:
+            Nombre de sauvegardes supprimées
+        """
+        now = now or datetime.now()
+        candidates = [(self.backup_time(name), self.manifests_dir / f"{name}.json", False)
+                      for name in self.list_backups()]
+        for path in self.root.glob(LEGACY_PATTERN):
+            try:
+                candidates.append((datetime.strptime(path.stem, LEGACY_FORMAT), path, True))
+            except ValueError:
+                continue  # Fichier nommé par l'utilisateur : on n'y touche pas
+
+        keep = self._keep([when for when, _, _ in candidates], now)
+        removed = 0
+        for index, (when, path, legacy) in enumerate(candidates):
+            if legacy and index in keep:
+                try:
+                    with open(path, 'r', encoding='utf-8') as f:
+                        self.backup(json.load(f), when)
+                except Exception as e:
+                    print(f"[!] Ancienne sauvegarde non importée ({path.name}) : {e}")
+                    continue
+                path.unlink()
+            elif index not in keep:
+                path.unlink()
+                removed += 1
+        return removed
+
+    def gc(self) -> int:
+        """
+        Supprime les blobs qui ne sont plus référencés par aucune sauvegarde
+
+        Returns:
+            Nombre de blobs supprimés
+        """
+        if not self.objects_dir.exists():
+            return 0
+        referenced = set()
+        for name in self.list_backups():
+            with open(self.manifests_dir / f"{name}.json", 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+            for entry in manifest["chapters"]:
+                referenced.add(entry["meta"])
+                referenced.add(entry["content"])
+                referenced.update(entry["translations"].values())
+
+        removed = 0
+        for prefix_dir in self.objects_dir.iterdir():
+            for path in prefix_dir.iterdir():
+                # Les .tmp sont des écritures interrompues
+                if path.suffix == '.tmp' or prefix_dir.name + path.name not in referenced:
+                    path.unlink()
+                    removed += 1
+        return removed
@@ -0,0 +1,279 @@
+"""
+Book Library - Bibliothèque de livres (SQLite)
+Un catalogue des livres (liste sans ouvrir aucun livre), une ligne par
+chapitre et une ligne par (chapitre, langue). Ouvrir un livre ne lit que le
+français : chaque traduction est lue à son premier accès. Une sauvegarde
+n'écrit que les lignes modifiées (mêmes enregistrements que le journal de
+BookManager).
+"""
+import json
+import sqlite3
+import threading
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+class BookLibrary:
+    """Stockage SQLite de plusieurs livres, traductions lues à la demande"""
+
+    def __init__(self, db_path: Optional[Path] = None):
+        """
+        Args:
+            db_path: Fichier SQLite (défaut: data/books/library.db)
+        """
+        if db_path is None:
+            db_path = Path(__file__).parent.parent / "data" / "books" / "library.db"
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS books ("
+            " id TEXT PRIMARY KEY,"
+            " title TEXT NOT NULL,"
+            " author TEXT NOT NULL,"
+            " current_chapter_index INTEGER NOT NULL,"
+            " chapter_count INTEGER NOT NULL,"
+            " word_count INTEGER NOT NULL,"
+            " source_file TEXT,"
+            " updated_at REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS chapters ("
+            " id TEXT PRIMARY KEY,"
+            " book_id TEXT NOT NULL,"
+            " position INTEGER NOT NULL,"
+            " title TEXT NOT NULL,"
+            " mode TEXT NOT NULL,"
+            " content_fr TEXT NOT NULL,"
+            " word_count INTEGER NOT NULL,"
+            " title_translations TEXT NOT NULL,"
+            " created_at TEXT NOT NULL,"
+            " updated_at TEXT NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_chapters_book ON chapters(book_id, position)")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS translations ("
+            " chapter_id TEXT NOT NULL,"
+            " lang TEXT NOT NULL,"
+            " text TEXT NOT NULL,"
+            " source_hashes TEXT,"
+            " PRIMARY KEY (chapter_id, lang))"
+        )
+        self._conn.commit()
+
+    def list_books(self) -> List[Dict]:
+        """Catalogue : un Dict par livre (id, title, author, chapter_count, word_count, updated_at)"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, title, author, chapter_count, word_count, updated_at"
+                " FROM books ORDER BY updated_at DESC").fetchall()
+        return [{'id': book_id, 'title': title, 'author': author, 'chapter_count': chapter_count,
+                 'word_count': word_count, 'updated_at': updated_at}
+                for book_id, title, author, chapter_count, word_count, updated_at in rows]
+
+    def create_book(self, title: str, author: str) -> str:
+        """Ajoute un livre vide au catalogue et retourne son id"""
+        return self.import_book({'title': title, 'author': author, 'chapters': []})
+
+    def delete_book(self, book_id: str):
+        """Supprime un livre, ses chapitres et leurs traductions"""
+        with self._lock:
+            with self._conn:
+                self._conn.execute(
+                    "DELETE FROM translations WHERE chapter_id IN"
+                    " (SELECT id FROM chapters WHERE book_id = ?)", (book_id,))
+                self._conn.execute("DELETE FROM chapters WHERE book_id = ?", (book_id,))
+                self._conn.execute("DELETE FROM books WHERE id = ?", (book_id,))
+
+    def find_imported(self, source_file: str) -> Optional[str]:
+        """Id du livre déjà importé depuis ce fichier JSON, s'il existe"""
+        with self._lock:
+            row = self._conn.execute("SELECT id FROM books WHERE source_file = ?", (source_file,)).fetchone()
+        return row[0] if row else None
+
+    def import_book(self, data: Dict, source_file: Optional[str] = None) -> str:
+        """
+        Ajoute un livre complet (format de current_book.json) à la bibliothèque
+
+        Les chapitres reçoivent de nouveaux ids : un livre importé deux fois (ou
+        une copie d'un livre) ne partage aucune ligne avec l'autre.
+
+        Args:
+            source_file: Fichier JSON d'origine (migration : évite les imports en double)
+
+        Returns:
+            Id du nouveau livre
+        """
+        book_id = uuid.uuid4().hex
+        chapters = [dict(chapter, id=uuid.uuid4().hex) for chapter in data.get('chapters', [])]
+        with self._lock:
+            with self._conn:
+                self._conn.execute(
+                    "INSERT INTO books (id, title, author, current_chapter_index, chapter_count,"
+                    " word_count, source_file, updated_at) VALUES (?, ?, ?, ?, 0, 0, ?, ?)",
+                    (book_id, data.get('title', ''), data.get('author', ''),
+                     data.get('current_chapter_index', -1), source_file, time.time()))
+                records = [{'op': 'chapter', 'data': chapter} for chapter in chapters]
+                records.append({'op': 'order', 'ids': [chapter['id'] for chapter in chapters]})
+                self._apply(book_id, records)
+        return book_id
+
+    def load_book(self, book_id: str) -> Optional[Dict]:
+        """
+        Lit un livre sans ses traductions
+
+        Returns:
+            Données au format de current_book.json, chaque chapitre sans
+            traductions mais avec "langs" (langues ayant une traduction stockée) ;
+            None si le livre n'existe pas
+        """
+        with self._lock:
+            book = self._conn.execute(
+                "SELECT title, author, current_chapter_index FROM books WHERE id = ?", (book_id,)).fetchone()
+            if book is None:
+                return None
+            rows = self._conn.execute(
+                "SELECT id, title, mode, content_fr, word_count, title_translations, created_at, updated_at"
+                " FROM chapters WHERE book_id = ? ORDER BY position", (book_id,)).fetchall()
+            langs: Dict[str, List[str]] = {}
+            for chapter_id, lang in self._conn.execute(
+                    "SELECT t.chapter_id, t.lang FROM translations t JOIN chapters c ON c.id = t.chapter_id"
+                    " WHERE c.book_id = ?", (book_id,)):
+                langs.setdefault(chapter_id, []).append(lang)
+
+        chapters = []
+        for chapter_id, title, mode, content_fr, word_count, title_translations, created_at, updated_at in rows:
+            chapters.append({
+                'id': chapter_id,
+                'title': title,
+                'mode': mode,
+                'content_fr': content_fr,
+                'word_count': word_count,
+                'title_translations': json.loads(title_translations),
+                'created_at': created_at,
+                'updated_at': updated_at,
+                'langs': langs.get(chapter_id, [])
+            })
+        return {'title': book[0], 'author': book[1], 'current_chapter_index': book[2], 'chapters': chapters}
+
+    def export_book(self, book_id: str) -> Optional[Dict]:
+        """
+        Lit un livre complet, traductions comprises (sauvegardes de secours)
+
+        Returns:
+            Données au format de current_book.json, None si le livre n'existe pas
+        """
+        data = self.load_book(book_id)
+        if data is None:
+            return None
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT t.chapter_id, t.lang, t.text, t.source_hashes FROM translations t"
+                " JOIN chapters c ON c.id = t.chapter_id WHERE c.book_id = ?", (book_id,)).fetchall()
+        by_id = {}
+        for chapter in data['chapters']:
+            del chapter['langs']
+            chapter['translations'] = {}
+            chapter['translation_sources'] = {}
+            by_id[chapter['id']] = chapter
+        for chapter_id, lang, text, source_hashes in rows:
+            by_id[chapter_id]['translations'][lang] = text
+            if source_hashes is not None:
+                by_id[chapter_id]['translation_sources'][lang] = json.loads(source_hashes)
+        return data
+
+    def load_translation(self, chapter_id: str, lang: str) -> Tuple[str, Optional[List[str]]]:
+        """Lit une traduction : (texte, hash des paragraphes source ou None)"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT text, source_hashes FROM translations WHERE chapter_id = ? AND lang = ?",
+                (chapter_id, lang)).fetchone()
+        if row is None:
+            return "", None
+        return row[0], json.loads(row[1]) if row[1] is not None else None
+
+    def apply_records(self, book_id: str, records: List[Dict]):
+        """Applique les changements d'une sauvegarde (une transaction, lignes modifiées seulement)"""
+        with self._lock:
+            with self._conn:
+                self._apply(book_id, records)
+
+    def _apply(self, book_id: str, records: List[Dict]):
+        """Écrit les enregistrements (verrou pris, dans une transaction)"""
+        for record in records:
+            op = record['op']
+            if op == 'book':
+                self._conn.execute(
+                    "UPDATE books SET title = ?, author = ?, current_chapter_index = ? WHERE id = ?",
+                    (record['title'], record['author'], record['current_chapter_index'], book_id))
+            elif op == 'chapter':
+                data = record['data']
+                row = self._conn.execute("SELECT book_id FROM chapters WHERE id = ?", (data['id'],)).fetchone()
+                if row is not None and row[0] != book_id:
+                    # Jamais de chapitre déplacé d'un livre à l'autre (transaction annulée)
+                    raise ValueError(f"Chapitre {data['id']} déjà dans le livre {row[0]}")
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO chapters (id, book_id, position, title, mode, content_fr,"
+                    " word_count, title_translations, created_at, updated_at)"
+                    " VALUES (?, ?, -1, ?, ?, ?, ?, ?, ?, ?)",
+                    (data['id'], book_id, data['title'], data.get('mode', 'public'), data.get('content_fr', ''),
+                     data.get('word_count', 0), json.dumps(data.get('title_translations', {}), ensure_ascii=False),
+                     data.get('created_at') or datetime.now().isoformat(),
+                     data.get('updated_at') or datetime.now().isoformat()))
+                # Le chapitre complet remplace ses anciennes traductions
+                self._conn.execute("DELETE FROM translations WHERE chapter_id = ?", (data['id'],))
+                sources = data.get('translation_sources', {})
+                for lang, text in data.get('translations', {}).items():
+                    self._write_translation(data['id'], lang, text, sources.get(lang))
+            elif op == 'order':
+                ids = record['ids']
+                kept = set(ids)
+                self._conn.executemany("UPDATE chapters SET position = ? WHERE id = ? AND book_id = ?",
+                                       [(position, chapter_id, book_id) for position, chapter_id in enumerate(ids)])
+                # Chapitres supprimés
+                removed = [row[0] for row in self._conn.execute(
+                    "SELECT id FROM chapters WHERE book_id = ?", (book_id,)) if row[0] not in kept]
+                for chapter_id in removed:
+                    self._conn.execute("DELETE FROM translations WHERE chapter_id = ?", (chapter_id,))
+                    self._conn.execute("DELETE FROM chapters WHERE id = ?", (chapter_id,))
+            elif op == 'title':
+                self._conn.execute(
+                    "UPDATE chapters SET title = ?, mode = ?, title_translations = ?, updated_at = ?"
+                    " WHERE id = ? AND book_id = ?",
+                    (record['title'], record['mode'], json.dumps(record['title_translations'], ensure_ascii=False),
+                     record['updated_at'], record['id'], book_id))
+            elif op == 'content':
+                self._conn.execute(
+                    "UPDATE chapters SET content_fr = ?, word_count = ?, updated_at = ? WHERE id = ? AND book_id = ?",
+                    (record['content_fr'], record['word_count'], record['updated_at'], record['id'], book_id))
+            elif op == 'translation':
+                # Seulement pour un chapitre de ce livre
+                if self._conn.execute("UPDATE chapters SET updated_at = ? WHERE id = ? AND book_id = ?",
+                                      (record['updated_at'], record['id'], book_id)).rowcount:
+                    self._write_translation(record['id'], record['lang'], record['text'], record['sources'])
+
+        # Catalogue à jour sans ouvrir le livre
+        self._conn.execute(
+            "UPDATE books SET chapter_count = (SELECT COUNT(*) FROM chapters WHERE book_id = ?),"
+            " word_count = (SELECT COALESCE(SUM(word_count), 0) FROM chapters WHERE book_id = ?),"
+            " updated_at = ? WHERE id = ?", (book_id, book_id, time.time(), book_id))
+
+    def _write_translation(self, chapter_id: str, lang: str, text: str, source_hashes: Optional[List[str]]):
+        """Écrit une ligne (chapitre, langue) ; une traduction vide n'a pas de ligne"""
+        if not text and source_hashes is None:
+            self._conn.execute("DELETE FROM translations WHERE chapter_id = ? AND lang = ?", (chapter_id, lang))
+            return
+        self._conn.execute(
+            "INSERT OR REPLACE INTO translations (chapter_id, lang, text, source_hashes) VALUES (?, ?, ?, ?)",
+            (chapter_id, lang, text, json.dumps(source_hashes) if source_hashes is not None else None))
+
+    def close(self):
+        """Ferme la base"""
+        with self._lock:
+            self._conn.close()
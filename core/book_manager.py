@@ -1,12 +1,34 @@
 """
 Book Manager - Gestion du livre et de ses chapitres
+
+Sauvegarde : un instantané complet (current_book.json) et un journal en ajout
+seul (current_book.journal). Chaque sauvegarde n'écrit dans le journal que les
+changements par chapitre (contenu, traduction, titre, ordre) ; le journal est
+replié dans l'instantané quand il grossit, périodiquement et à la fermeture.
+Les écritures se font dans un thread dédié (voir save).
+
+Un livre peut aussi être ouvert depuis une bibliothèque SQLite (BookLibrary,
+voir open_library) : les mêmes changements y sont écrits ligne par ligne.
 """
 import json
 import os
+import threading
+import time
+import zlib
+from concurrent.futures import Future
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime
-from .chapter import Chapter
+from .backup_store import BackupStore
+from .book_library import BookLibrary
+from .chapter import Chapter, next_revision, revision_lock
+
+JOURNAL_SUFFIX = ".journal"
+
+# Repli du journal dans l'instantané au-delà de cette taille...
+COMPACT_BYTES = 8 * 1024 * 1024
+# ... ou de cette durée depuis le dernier instantané (secondes)
+COMPACT_INTERVAL = 600
 
 class BookManager:
     """Gère le livre et tous ses chapitres"""
@@ -18,12 +40,35 @@ class BookManager:
         self.current_chapter_index = -1
         self.data_dir = Path(__file__).parent.parent / "data" / "books"
         self.data_dir.mkdir(parents=True, exist_ok=True)
+        self.backups = BackupStore(self.data_dir / "backups")
+        
+        # Livre ouvert depuis une bibliothèque SQLite (None = fichiers JSON)
+        self.library: Optional[BookLibrary] = None
+        self.book_id: Optional[str] = None
+        
+        # État déjà écrit sur disque (instantané + journal), base des différences
+        self._persisted_path: Optional[Path] = None
+        self._persisted: Dict[str, Dict] = {}  # id chapitre -> état sauvegardé
+        self._persisted_order: List[str] = []
+        self._persisted_book: Dict = {}
+        self._journal_seq = 0
+        self._last_compaction = 0.0
+        
+        # Thread d'écriture et sauvegardes en attente (fichier -> relevé, instantané, futures)
+        self._save_condition = threading.Condition()
+        self._pending: Dict[Path, Tuple[Dict, bool, List[Future]]] = {}
+        self._writer: Optional[threading.Thread] = None
+        
+        # Suivi des modifications (voir get_revision)
+        self.revision = next_revision()
+        self._saved_revision = 0
         
     def add_chapter(self, title: str, mode: str = "public") -> Chapter:
         """Ajoute un nouveau chapitre"""
         chapter = Chapter(title, mode)
         self.chapters.append(chapter)
         self.current_chapter_index = len(self.chapters) - 1
+        self.revision = next_revision()
         return chapter
     
     def remove_chapter(self, index: int) -> bool:
@@ -32,6 +77,7 @@ class BookManager:
             self.chapters.pop(index)
             if self.current_chapter_index >= len(self.chapters):
                 self.current_chapter_index = len(self.chapters) - 1
+            self.revision = next_revision()
             return True
         return False
     
@@ -47,44 +93,266 @@ class BookManager:
     
     def set_current_chapter(self, index: int):
         """Définit le chapitre courant"""
-        if 0 <= index < len(self.chapters):
+        if 0 <= index < len(self.chapters) and index != self.current_chapter_index:
             self.current_chapter_index = index
+            self.revision = next_revision()
+    
+    def set_book_info(self, title: str, author: str):
+        """Définit le titre et l'auteur du livre"""
+        self.title = title
+        self.author = author
+        self.revision = next_revision()
+    
+    def get_revision(self) -> int:
+        """
+        Révision de la dernière modification du livre ou d'un de ses chapitres
+        
+        Croissante : une suppression de chapitre prend une nouvelle révision.
+        """
+        return max([self.revision] + [chapter.revision for chapter in self.chapters])
+    
+    def is_dirty(self) -> bool:
+        """True si le livre a changé depuis la dernière sauvegarde"""
+        return self.get_revision() > self._saved_revision
     
     def get_total_words(self) -> int:
         """Calcule le nombre total de mots"""
         return sum(chapter.word_count for chapter in self.chapters)
     
-    def save(self, filename: str = "current_book.json") -> bool:
-        """Sauvegarde le livre"""
+    def get_book_key(self) -> str:
+        """Identifiant du livre ouvert : id dans la bibliothèque, '' pour le livre JSON courant"""
+        return self.book_id or ''
+    
+    def save(self, filename: str = "current_book.json", compact: bool = False) -> Future:
+        """
+        Sauvegarde le livre en arrière-plan
+        
+        L'état du livre est relevé tout de suite dans le thread appelant (copie
+        légère, les textes sont partagés) ; la sérialisation et l'écriture se font
+        dans le thread d'écriture. Les sauvegardes en attente sont fusionnées :
+        seul l'état le plus récent est écrit.
+        
+        Args:
+            compact: Écrire un instantané complet (sinon, seulement les changements
+                     dans le journal, sauf s'il est temps de le replier)
+        
+        Returns:
+            Future[bool] : True une fois le livre écrit sur disque
+        """
+        future = Future()
+        filepath = self.library.db_path if self.library is not None else self.data_dir / filename
+        # Révision et état relevés ensemble : une traduction ne peut pas être
+        # comptée comme sauvegardée sans figurer dans le relevé
+        with revision_lock:
+            revision = self.get_revision()
+            
+            # Livre inchangé : rien à écrire
+            if not compact and filepath == self._persisted_path and revision <= self._saved_revision:
+                future.set_result(True)
+                return future
+            
+            snapshot = self._snapshot(revision)
+        with self._save_condition:
+            futures = [future]
+            if filepath in self._pending:
+                pending, pending_compact, pending_futures = self._pending[filepath]
+                futures += pending_futures
+                compact = compact or pending_compact
+                if pending["revision"] > revision:
+                    snapshot = pending  # Relevé plus récent déjà en attente
+            self._pending[filepath] = (snapshot, compact, futures)
+            if self._writer is None:
+                self._writer = threading.Thread(target=self._write_loop, daemon=True)
+                self._writer.start()
+            self._save_condition.notify()
+        return future
+    
+    def _write_loop(self):
+        """Thread d'écriture : une sauvegarde à la fois, la plus récente par fichier"""
+        while True:
+            with self._save_condition:
+                while not self._pending:
+                    self._save_condition.wait()
+                filepath = next(iter(self._pending))
+                snapshot, compact, futures = self._pending.pop(filepath)
+            saved = self._write(filepath, snapshot, compact)
+            for future in futures:
+                future.set_result(saved)
+    
+    def _write(self, filepath: Path, snapshot: Dict, compact: bool) -> bool:
+        """Écrit un relevé du livre (thread d'écriture)"""
         try:
-            filepath = self.data_dir / filename
-            data = {
-                "title": self.title,
-                "author": self.author,
-                "saved_at": datetime.now().isoformat(),
-                "chapters": [chapter.to_dict() for chapter in self.chapters],
-                "current_chapter_index": self.current_chapter_index
-            }
+            if self.library is not None:
+                # Bibliothèque : seulement les lignes modifiées, en une transaction
+                records = self._diff_records(snapshot)
+                if records:
+                    self.library.apply_records(self.book_id, records)
+                self._set_persisted(filepath, snapshot, compacted=False)
+                # Pas de journal à replier : sauvegarde de secours au rythme des instantanés JSON
+                if compact or (records and time.time() - self._last_compaction > COMPACT_INTERVAL):
+                    self._backup(self.library.export_book(self.book_id))
+                return True
             
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+            journal_path = filepath.with_suffix(JOURNAL_SUFFIX)
             
-            # Créer une backup horodatée
-            backup_dir = self.data_dir / "backups"
-            backup_dir.mkdir(exist_ok=True)
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            backup_file = backup_dir / f"backup_{timestamp}.json"
+            # Pas de base connue pour ce fichier : instantané complet
+            if compact or self._persisted_path != filepath:
+                return self._compact(filepath, snapshot)
             
-            with open(backup_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+            records = self._diff_records(snapshot)
+            if records:
+                self._journal_seq += 1
+                self._append_journal(journal_path, self._journal_seq, records)
+            self._set_persisted(filepath, snapshot, compacted=False)
+            
+            journal_size = journal_path.stat().st_size if journal_path.exists() else 0
+            if journal_size > COMPACT_BYTES or (
+                    journal_size and time.time() - self._last_compaction > COMPACT_INTERVAL):
+                return self._compact(filepath, snapshot)
             
             return True
         except Exception as e:
             print(f"Erreur sauvegarde: {e}")
             return False
     
+    def _book_state(self) -> Dict:
+        """Métadonnées du livre (hors chapitres)"""
+        return {
+            "title": self.title,
+            "author": self.author,
+            "current_chapter_index": self.current_chapter_index
+        }
+    
+    def _chapter_state(self, chapter: Chapter, since: int) -> Dict:
+        """
+        État sauvegardable d'un chapitre (format de Chapter.to_dict)
+        
+        Les dictionnaires sont copiés (ils continuent d'être modifiés pendant
+        l'écriture) ; les textes et les listes de hash, toujours remplacés et
+        jamais modifiés sur place, sont partagés. Pour un chapitre déjà dans la
+        bibliothèque, seules les traductions modifiées depuis la dernière
+        sauvegarde sont relevées (les autres ne sont pas lues).
+        """
+        if self.library is not None and chapter.id in self._persisted:
+            state = chapter.to_dict(include_translations=False)
+            state["translations"], state["translation_sources"] = \
+                chapter.get_changed_translations(since)
+        else:
+            state = chapter.to_dict()
+            state["translations"] = dict(chapter.translations)
+            state["translation_sources"] = dict(chapter.translation_sources)
+        state["title_translations"] = dict(chapter.title_translations)
+        return state
+    
+    def _snapshot(self, revision: int) -> Dict:
+        """Relevé du livre entier à écrire (thread appelant, sous revision_lock)"""
+        # Lue une seule fois : le thread d'écriture peut l'avancer pendant le relevé
+        since = self._saved_revision
+        return {
+            "revision": revision,
+            "book": self._book_state(),
+            "chapters": [self._chapter_state(chapter, since) for chapter in list(self.chapters)]
+        }
+    
+    def _diff_records(self, snapshot: Dict) -> List[Dict]:
+        """Enregistrements du journal : différences entre un relevé et l'état déjà sauvegardé"""
+        records = []
+        for new in snapshot["chapters"]:
+            old = self._persisted.get(new["id"])
+            if old is None:
+                records.append({"op": "chapter", "data": new})
+                continue
+            # Textes inchangés = mêmes objets str : comparaison quasi gratuite
+            if new == old:
+                continue
+            
+            base = {"id": new["id"], "updated_at": new["updated_at"]}
+            if (new["title"], new["mode"], new["title_translations"]) != \
+                    (old["title"], old["mode"], old["title_translations"]):
+                records.append(dict(base, op="title", title=new["title"], mode=new["mode"],
+                                    title_translations=new["title_translations"]))
+            if new["content_fr"] != old["content_fr"]:
+                records.append(dict(base, op="content", content_fr=new["content_fr"],
+                                    word_count=new["word_count"]))
+            for lang, text in new["translations"].items():
+                sources = new["translation_sources"].get(lang)
+                if text != old["translations"].get(lang) or sources != old["translation_sources"].get(lang):
+                    records.append(dict(base, op="translation", lang=lang, text=text, sources=sources))
+        
+        order = [state["id"] for state in snapshot["chapters"]]
+        if order != self._persisted_order:
+            # Couvre aussi les suppressions
+            records.append({"op": "order", "ids": order})
+        if snapshot["book"] != self._persisted_book:
+            records.append(dict(snapshot["book"], op="book"))
+        return records
+    
+    @staticmethod
+    def _append_journal(journal_path: Path, seq: int, records: List[Dict]):
+        """
+        Ajoute une sauvegarde au journal : une ligne "crc32 json"
+        
+        Une ligne incomplète (arrêt brutal pendant l'écriture) a un crc invalide
+        et est ignorée au chargement : la sauvegarde est tout ou rien.
+        """
+        payload = json.dumps({"seq": seq, "records": records}, ensure_ascii=False).encode('utf-8')
+        with open(journal_path, 'ab') as f:
+            f.write(b"%08x %s\n" % (zlib.crc32(payload), payload))
+            f.flush()
+            os.fsync(f.fileno())
+    
+    def _compact(self, filepath: Path, snapshot: Dict) -> bool:
+        """Écrit un instantané complet et vide le journal"""
+        book = snapshot["book"]
+        data = {
+            "title": book["title"],
+            "author": book["author"],
+            "saved_at": datetime.now().isoformat(),
+            "chapters": snapshot["chapters"],
+            "current_chapter_index": book["current_chapter_index"],
+            # Entrées du journal déjà incluses (ignorées au chargement si le journal
+            # n'a pas pu être vidé)
+            "journal_seq": self._journal_seq
+        }
+        
+        # Fichier temporaire puis remplacement atomique : jamais d'instantané à moitié écrit
+        temp_path = filepath.with_suffix('.tmp')
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, filepath)
+        
+        journal_path = filepath.with_suffix(JOURNAL_SUFFIX)
+        if journal_path.exists():
+            journal_path.unlink()
+        
+        self._set_persisted(filepath, snapshot)
+        self._backup(data)
+        return True
+    
+    def _backup(self, data: Dict):
+        """Sauvegarde dédupliquée (le livre est déjà sur disque : un échec ici n'est pas fatal)"""
+        try:
+            self.backups.backup(data)
+            self.backups.prune()
+            self.backups.gc()
+        except Exception as e:
+            print(f"[!] Erreur sauvegarde de secours : {e}")
+        self._last_compaction = time.time()
+    
+    def _set_persisted(self, filepath: Path, snapshot: Dict, compacted: bool = True):
+        """Le relevé donné est maintenant entièrement sur disque"""
+        self._persisted_path = filepath
+        self._persisted = {state["id"]: state for state in snapshot["chapters"]}
+        self._persisted_order = [state["id"] for state in snapshot["chapters"]]
+        self._persisted_book = snapshot["book"]
+        self._saved_revision = max(self._saved_revision, snapshot["revision"])
+        if compacted:
+            self._last_compaction = time.time()
+    
     def load(self, filename: str = "current_book.json") -> bool:
-        """Charge un livre"""
+        """Charge un livre (instantané, puis changements du journal)"""
         try:
             filepath = self.data_dir / filename
             if not filepath.exists():
@@ -93,14 +361,219 @@ class BookManager:
             with open(filepath, 'r', encoding='utf-8') as f:
                 data = json.load(f)
             
-            self.title = data.get("title", self.title)
-            self.author = data.get("author", self.author)
-            self.current_chapter_index = data.get("current_chapter_index", -1)
+            # Ancien format : chapitres sans id (un nouvel id est tiré à chaque
+            # chargement) ou instantané d'avant le journal
+            legacy = "journal_seq" not in data or any("id" not in ch_data for ch_data in data.get("chapters", []))
+            self._load_data(data)
+            self._journal_seq = data.get("journal_seq", 0)
             
-            self.chapters = [Chapter.from_dict(ch_data) for ch_data in data.get("chapters", [])]
+            replayed, intact = self._replay_journal(filepath.with_suffix(JOURNAL_SUFFIX))
+            with revision_lock:
+                self._set_persisted(filepath, self._snapshot(self.get_revision()))
+                if legacy or not intact:
+                    # Aucune base sur disque pour le journal : la prochaine sauvegarde
+                    # écrit un instantané complet (avec les ids) avant tout ajout
+                    self._persisted_path = None
+            if replayed:
+                print(f"[OK] {replayed} sauvegarde(s) rejouée(s) depuis le journal")
             
             return True
         except Exception as e:
             print(f"Erreur chargement: {e}")
             return False
-
+    
+    def _load_data(self, data: Dict):
+        """Remplace le livre en mémoire (format de current_book.json)"""
+        self.title = data.get("title", self.title)
+        self.author = data.get("author", self.author)
+        self.current_chapter_index = data.get("current_chapter_index", -1)
+        
+        self.chapters = [Chapter.from_dict(ch_data) for ch_data in data.get("chapters", [])]
+        self.revision = next_revision()
+        # Chapitres remplacés : plus rien n'est connu comme déjà sauvegardé
+        self._persisted = {}
+    
+    def open_library(self, library: BookLibrary, book_id: str) -> bool:
+        """
+        Ouvre un livre de la bibliothèque : le français est lu, chaque
+        traduction le sera à son premier accès. Les sauvegardes suivantes
+        vont dans la bibliothèque.
+        """
+        try:
+            data = library.load_book(book_id)
+            if data is None:
+                return False
+            
+            self._load_data(data)
+            for chapter, ch_data in zip(self.chapters, data["chapters"]):
+                chapter.set_lazy_translations(ch_data["langs"], library.load_translation)
+            self.library = library
+            self.book_id = book_id
+            # Sauvegardes de secours propres à chaque livre de la bibliothèque
+            self.backups = BackupStore(library.db_path.parent / "library_backups" / book_id)
+            
+            # Base des différences sans lire les traductions
+            self._persisted = {chapter.id: {} for chapter in self.chapters}
+            with revision_lock:
+                self._set_persisted(library.db_path, self._snapshot(self.get_revision()))
+            return True
+        except Exception as e:
+            print(f"Erreur ouverture du livre {book_id}: {e}")
+            return False
+    
+    def migrate_to_library(self, library: BookLibrary, filename: str = "current_book.json") -> Optional[str]:
+        """
+        Importe un livre JSON (instantané + journal) dans la bibliothèque
+        
+        Le fichier JSON n'est pas modifié. Un fichier déjà importé n'est pas réimporté.
+        
+        Returns:
+            Id du livre dans la bibliothèque, None si le fichier n'a pas pu être lu
+        """
+        filepath = self.data_dir / filename
+        book_id = library.find_imported(str(filepath))
+        if book_id is not None:
+            return book_id
+        
+        books = BookManager()
+        books.data_dir = self.data_dir
+        if not books.load(filename):
+            return None
+        data = dict(books._book_state(), chapters=[chapter.to_dict() for chapter in books.chapters])
+        book_id = library.import_book(data, source_file=str(filepath))
+        print(f"[OK] {filename} importé dans la bibliothèque ({len(books.chapters)} chapitre(s))")
+        return book_id
+    
+    def list_backups(self) -> List[datetime]:
+        """Dates des sauvegardes de secours disponibles (plus ancienne d'abord)"""
+        return [self.backups.backup_time(name) for name in self.backups.list_backups()]
+    
+    def restore_backup(self, at: datetime, filename: str = "current_book.json") -> bool:
+        """
+        Restaure le livre tel qu'il était à une date donnée
+        
+        Args:
+            at: Date voulue (la dernière sauvegarde faite au plus tard à cette date est utilisée)
+        """
+        try:
+            name = self.backups.find(at)
+            if name is None:
+                return False
+            data = self.backups.restore(name)
+            # L'état actuel part d'abord en sauvegarde : la restauration est réversible
+            self.save(filename, compact=True).result()
+            self._load_data(data)
+            return self.save(filename, compact=True).result()
+        except Exception as e:
+            print(f"Erreur restauration: {e}")
+            return False
+    
+    def _replay_journal(self, journal_path: Path) -> Tuple[int, bool]:
+        """
+        Applique les sauvegardes du journal postérieures à l'instantané
+        
+        Une sauvegarde qui désigne un chapitre inconnu (journal qui ne
+        correspond pas à l'instantané) arrête le rejeu : le journal est mis de
+        côté (.corrupt) au lieu de supprimer des chapitres.
+        
+        Returns:
+            (nombre de sauvegardes rejouées, False si le journal a été écarté)
+        """
+        if not journal_path.exists():
+            return 0, True
+        
+        replayed = 0
+        valid_size = 0
+        unknown = None
+        with open(journal_path, 'rb') as f:
+            for line in f:
+                crc, _, payload = line.rstrip(b"\n").partition(b" ")
+                try:
+                    if not line.endswith(b"\n") or int(crc, 16) != zlib.crc32(payload):
+                        raise ValueError("crc")
+                    entry = json.loads(payload.decode('utf-8'))
+                except ValueError:
+                    print("⚠️ Journal de sauvegarde : fin incomplète ignorée (arrêt pendant l'écriture)")
+                    break
+                valid_size += len(line)
+                if entry["seq"] <= self._journal_seq:
+                    continue  # Déjà dans l'instantané
+                # Vérifiée avant d'appliquer : une sauvegarde est rejouée entière ou pas du tout
+                unknown = self._unknown_chapter(entry["records"])
+                if unknown is not None:
+                    break
+                for record in entry["records"]:
+                    self._apply_record(record)
+                self._journal_seq = entry["seq"]
+                replayed += 1
+        
+        if unknown is not None:
+            corrupt_path = journal_path.with_suffix(JOURNAL_SUFFIX + ".corrupt")
+            os.replace(journal_path, corrupt_path)
+            print(f"[!] Journal de sauvegarde corrompu (chapitre inconnu {unknown}) : "
+                  f"rejeu arrêté, journal mis de côté dans {corrupt_path.name}")
+            return replayed, False
+        
+        # Couper la fin invalide : les prochaines sauvegardes s'ajoutent après une ligne valide
+        if valid_size < journal_path.stat().st_size:
+            with open(journal_path, 'r+b') as f:
+                f.truncate(valid_size)
+        return replayed, True
+    
+    def _unknown_chapter(self, records: List[Dict]) -> Optional[str]:
+        """Premier id de chapitre d'une sauvegarde du journal absent du livre (None si aucun)"""
+        known = {chapter.id for chapter in self.chapters}
+        for record in records:
+            op = record["op"]
+            if op == "chapter":
+                known.add(record["data"]["id"])
+            elif op == "order":
+                missing = [chapter_id for chapter_id in record["ids"] if chapter_id not in known]
+                if missing:
+                    return missing[0]
+                known = set(record["ids"])
+            elif op != "book" and record["id"] not in known:
+                return record["id"]
+        return None
+    
+    def _apply_record(self, record: Dict):
+        """Applique un enregistrement du journal au livre en mémoire"""
+        op = record["op"]
+        if op == "book":
+            self.title = record["title"]
+            self.author = record["author"]
+            self.current_chapter_index = record["current_chapter_index"]
+            return
+        
+        by_id = {chapter.id: chapter for chapter in self.chapters}
+        if op == "chapter":
+            chapter = Chapter.from_dict(record["data"])
+            if chapter.id in by_id:
+                self.chapters[self.chapters.index(by_id[chapter.id])] = chapter
+            else:
+                self.chapters.append(chapter)
+            return
+        if op == "order":
+            missing = [chapter_id for chapter_id in record["ids"] if chapter_id not in by_id]
+            if missing:
+                raise ValueError(f"Journal corrompu : chapitre inconnu {missing[0]}")
+            self.chapters = [by_id[chapter_id] for chapter_id in record["ids"]]
+            return
+        
+        chapter = by_id.get(record["id"])
+        if chapter is None:
+            raise ValueError(f"Journal corrompu : chapitre inconnu {record['id']}")
+        if op == "title":
+            chapter.title = record["title"]
+            chapter.mode = record["mode"]
+            chapter.title_translations = record["title_translations"]
+        elif op == "content":
+            chapter.content_fr = record["content_fr"]
+            chapter.word_count = record["word_count"]
+        elif op == "translation":
+            chapter.translations[record["lang"]] = record["text"]
+            if record["sources"] is None:
+                chapter.translation_sources.pop(record["lang"], None)
+            else:
+                chapter.translation_sources[record["lang"]] = record["sources"]
+        chapter.updated_at = datetime.fromisoformat(record["updated_at"])
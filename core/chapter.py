@@ -1,16 +1,38 @@
 """
 Classe Chapter - Représente un chapitre du livre
 """
+import hashlib
+import itertools
+import threading
+import uuid
 from datetime import datetime
-from typing import Dict, Optional
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+# Horloge des modifications, partagée par les chapitres et le livre :
+# une révision plus grande = une modification plus récente
+_revisions = itertools.count(1)
+
+def next_revision() -> int:
+    """Nouvelle révision (à chaque modification d'un chapitre ou du livre)"""
+    return next(_revisions)
+
+# Une traduction et sa révision sont publiées ensemble ; BookManager relève
+# révision et état du livre sous ce même verrou (jamais l'une sans l'autre)
+revision_lock = threading.RLock()
 
 class Chapter:
     """Représente un chapitre avec son contenu multilingue"""
     
     def __init__(self, title: str, mode: str = "public"):
+        self.id = uuid.uuid4().hex  # Identifiant stable (le titre et la position peuvent changer)
         self.title = title
         self.mode = mode  # "avocat", "public", "therapie"
         self.content_fr = ""
+        # Traductions stockées mais pas encore lues (bibliothèque SQLite, voir set_lazy_translations)
+        self._lazy_langs = set()
+        self._loader: Optional[Callable[[str, str], Tuple[str, Optional[List[str]]]]] = None
+        # Révision de la dernière modification de chaque traduction
+        self._translation_revisions: Dict[str, int] = {}
         self.translations = {
             "en": "",
             "es": "",
@@ -48,31 +70,172 @@ class Chapter:
             "pl": "",  # Polonais
             "th": ""   # Thaï
         }
+        # Hash des paragraphes source ayant produit chaque traduction
+        # (une entrée par ligne de content_fr, alignée sur les lignes traduites)
+        self.translation_sources: Dict[str, List[str]] = {}
         self.created_at = datetime.now()
         self.updated_at = datetime.now()
         self.word_count = 0
+        self.revision = next_revision()  # Révision de la dernière modification
     
     def update_content(self, content: str):
         """Met à jour le contenu français et recalcule les stats"""
         self.content_fr = content
         self.updated_at = datetime.now()
         self.word_count = len(content.split())
+        self.revision = next_revision()
     
-    def set_translation(self, lang: str, content: str):
-        """Définit la traduction pour une langue"""
+    def set_translation(self, lang: str, content: str, source_hashes: Optional[List[str]] = None):
+        """
+        Définit la traduction pour une langue
+        
+        Args:
+            source_hashes: Hash des paragraphes source traduits (voir get_source_hashes).
+                           Si None, la provenance est inconnue et la prochaine
+                           traduction repartira de zéro pour cette langue.
+        """
         # Accepter toutes les langues supportées (17 langues)
-        self.translations[lang] = content
-        self.updated_at = datetime.now()
+        with revision_lock:
+            self._lazy_langs.discard(lang)  # Remplacée : inutile de lire l'ancienne
+            self._translations[lang] = content
+            if source_hashes is None:
+                self._translation_sources.pop(lang, None)
+            else:
+                self._translation_sources[lang] = list(source_hashes)
+            self.updated_at = datetime.now()
+            revision = next_revision()
+            # Révision de la langue d'abord : self.revision publie la modification
+            self._translation_revisions[lang] = revision
+            self.revision = revision
+    
+    @property
+    def translations(self) -> Dict[str, str]:
+        """Traductions de toutes les langues (lit celles pas encore chargées)"""
+        self._load_all()
+        return self._translations
+    
+    @translations.setter
+    def translations(self, translations: Dict[str, str]):
+        self._translations = translations
+        self._lazy_langs = set()
+    
+    @property
+    def translation_sources(self) -> Dict[str, List[str]]:
+        """Provenance de toutes les traductions (lit celles pas encore chargées)"""
+        self._load_all()
+        return self._translation_sources
+    
+    @translation_sources.setter
+    def translation_sources(self, translation_sources: Dict[str, List[str]]):
+        self._translation_sources = translation_sources
+        self._lazy_langs = set()
+    
+    def set_lazy_translations(self, langs: Iterable[str],
+                              loader: Callable[[str, str], Tuple[str, Optional[List[str]]]]):
+        """
+        Déclare des traductions stockées mais pas encore lues
+        
+        Args:
+            langs: Langues ayant une traduction stockée
+            loader: (id chapitre, langue) -> (traduction, hash des paragraphes source)
+        """
+        self._loader = loader
+        self._lazy_langs = set(langs)
+    
+    def _load(self, lang: str):
+        """Lit une traduction à son premier accès"""
+        if lang in self._lazy_langs:
+            text, source_hashes = self._loader(self.id, lang)
+            self._translations[lang] = text
+            if source_hashes is not None:
+                self._translation_sources[lang] = source_hashes
+            self._lazy_langs.discard(lang)
+    
+    def _load_all(self):
+        """Lit toutes les traductions pas encore chargées"""
+        for lang in list(self._lazy_langs):
+            self._load(lang)
+    
+    def get_translation_sources(self, lang: str) -> Optional[List[str]]:
+        """Hash des paragraphes source ayant produit la traduction (None si inconnus)"""
+        self._load(lang)
+        return self._translation_sources.get(lang)
+    
+    def get_translated_langs(self) -> List[str]:
+        """
+        Langues ayant une traduction, sans lire celles pas encore chargées
+        
+        Les messages d'erreur ("[Erreur ...") ne sont écartés que pour les traductions lues.
+        """
+        return [lang for lang, text in self._translations.items()
+                if lang not in self._lazy_langs and text.strip() and not text.startswith('[')] + \
+            sorted(self._lazy_langs)
+    
+    def get_changed_translations(self, since: int) -> Tuple[Dict[str, str], Dict[str, List[str]]]:
+        """
+        Traductions modifiées après une révision (sauvegarde ligne par ligne)
+        
+        Returns:
+            (traductions, hash des paragraphes source) des langues modifiées
+        """
+        langs = [lang for lang, revision in self._translation_revisions.items() if revision > since]
+        return ({lang: self._translations[lang] for lang in langs},
+                {lang: self._translation_sources[lang] for lang in langs if lang in self._translation_sources})
+    
+    @staticmethod
+    def hash_paragraph(paragraph: str) -> str:
+        """Hash court et stable d'un paragraphe source"""
+        return hashlib.sha1(paragraph.strip().encode('utf-8')).hexdigest()[:16]
+    
+    def get_source_paragraphs(self) -> List[str]:
+        """Découpe le contenu français en paragraphes (une ligne = un paragraphe)"""
+        return self.content_fr.split('\n')
+    
+    def get_source_hashes(self) -> List[str]:
+        """Hash de chaque paragraphe du contenu français actuel"""
+        return [self.hash_paragraph(p) for p in self.get_source_paragraphs()]
+    
+    def plan_retranslation(self, lang: str) -> Tuple[List[str], Dict[int, str]]:
+        """
+        Compare le contenu français actuel aux paragraphes ayant produit la traduction
+        
+        Returns:
+            (paragraphes source, traductions réutilisables indexées par paragraphe).
+            Les paragraphes absents du dictionnaire doivent être (re)traduits.
+        """
+        paragraphs = self.get_source_paragraphs()
+        reusable = {}
+        
+        previous = {}
+        sources = self.get_translation_sources(lang)
+        translation = self.get_translation(lang)
+        if sources and translation:
+            translated_paragraphs = translation.split('\n')
+            # Provenance valide seulement si l'alignement ligne à ligne est intact
+            if len(translated_paragraphs) == len(sources):
+                previous = dict(zip(sources, translated_paragraphs))
+        
+        for i, paragraph in enumerate(paragraphs):
+            if not paragraph.strip():
+                reusable[i] = paragraph
+                continue
+            paragraph_hash = self.hash_paragraph(paragraph)
+            if paragraph_hash in previous:
+                reusable[i] = previous[paragraph_hash]
+        
+        return paragraphs, reusable
     
     def get_translation(self, lang: str) -> str:
-        """Récupère la traduction pour une langue"""
-        return self.translations.get(lang, "")
+        """Récupère la traduction pour une langue (lue au premier accès si stockée à part)"""
+        self._load(lang)
+        return self._translations.get(lang, "")
     
     def set_title_translation(self, lang: str, title: str):
         """Définit la traduction du titre pour une langue"""
         # Accepter toutes les langues supportées (17 langues)
         self.title_translations[lang] = title
         self.updated_at = datetime.now()
+        self.revision = next_revision()
     
     def get_title_translation(self, lang: str) -> str:
         """Récupère la traduction du titre pour une langue"""
@@ -80,23 +243,33 @@ class Chapter:
         # Si pas de traduction définie, retourner titre original
         return translated if translated else self.title
     
-    def to_dict(self) -> Dict:
-        """Convertit le chapitre en dictionnaire pour sauvegarde"""
-        return {
+    def to_dict(self, include_translations: bool = True) -> Dict:
+        """
+        Convertit le chapitre en dictionnaire pour sauvegarde
+        
+        Args:
+            include_translations: Inclure traductions et provenance (les lit toutes)
+        """
+        data = {
+            "id": self.id,
             "title": self.title,
             "mode": self.mode,
             "content_fr": self.content_fr,
-            "translations": self.translations,
             "title_translations": self.title_translations,
             "created_at": self.created_at.isoformat(),
             "updated_at": self.updated_at.isoformat(),
             "word_count": self.word_count
         }
+        if include_translations:
+            data["translations"] = self.translations
+            data["translation_sources"] = self.translation_sources
+        return data
     
     @staticmethod
     def from_dict(data: Dict) -> 'Chapter':
         """Crée un chapitre depuis un dictionnaire"""
         chapter = Chapter(data["title"], data.get("mode", "public"))
+        chapter.id = data.get("id", chapter.id)
         chapter.content_fr = data.get("content_fr", "")
         chapter.translations = data.get("translations", {
             "en": "", "es": "", "it": "", "ru": "", "ja": "", "zh": "",
@@ -108,6 +281,7 @@ class Chapter:
             "hi": "", "ar": "", "de": "", "pt": "", "tr": "", "ko": "",
             "id": "", "vi": "", "pl": "", "th": ""
         })
+        chapter.translation_sources = data.get("translation_sources", {})
         chapter.word_count = data.get("word_count", 0)
         
         if "created_at" in data:
@@ -0,0 +1,96 @@
+"""
+Char Normalizer - Normalisation des caractères pour l'export
+Une seule table de remplacements pour les polices CID (chinois, japonais,
+coréen), compilée une fois par langue/police pour str.translate, et un
+repérage en un seul passage des caractères à problème. Utilisé par
+TextCleaner (détection / correction) et par l'export PDF.
+"""
+import re
+from functools import lru_cache
+from typing import Dict, Iterable, Optional, Tuple
+
+# Langues exportées avec une police CID (script natif seulement)
+CID_LANGS = {'zh', 'ja', 'ko'}
+
+# Polices CID de reportlab (voir PDFExporter._register_unicode_fonts)
+CID_FONTS = {'STSong-Light', 'HeiseiMin-W3', 'HYSMyeongJo-Medium'}
+
+# Caractère -> (remplacement compatible CID, nom affiché)
+CID_REPLACEMENTS = {
+    '·': (' ', 'point médian'),
+    '•': (' ', 'bullet'),
+    '–': ('-', 'tiret cadratin'),
+    '—': ('-', 'tiret long'),
+    '‘': ("'", 'guillemet courbe'),
+    '’': ("'", 'guillemet courbe'),
+    '“': ('"', 'guillemet double courbe'),
+    '”': ('"', 'guillemet double courbe'),
+    '…': ('...', 'points de suspension'),
+    '€': ('EUR', 'symbole euro'),
+    '£': ('GBP', 'symbole livre'),
+    '§': ('', 'paragraphe'),
+    '©': ('(C)', 'copyright'),
+    '®': ('(R)', 'registered'),
+    '™': ('(TM)', 'trademark'),
+}
+
+# Indicateurs de caractères manquants (carré, caractère de remplacement)
+MISSING_CHARS = {
+    '□': 'carré',
+    '�': 'caractère de remplacement',
+}
+
+# Échappement du balisage des paragraphes reportlab
+MARKUP_ESCAPES = {'&': '&amp;', '<': '&lt;', '>': '&gt;'}
+
+def uses_cid_font(lang: str, font: Optional[str] = None) -> bool:
+    """True si le texte sera rendu avec une police CID (la police, si connue, décide)"""
+    if font is not None:
+        return font in CID_FONTS
+    return lang in CID_LANGS
+
+@lru_cache(maxsize=None)
+def get_table(lang: str, font: Optional[str] = None, markup: bool = False) -> Optional[Dict[int, str]]:
+    """
+    Table str.translate pour une langue/police (compilée une seule fois)
+
+    Args:
+        markup: Échapper aussi &, < et > (texte de Paragraph reportlab)
+
+    Returns:
+        Table, ou None si le texte n'a rien à remplacer
+    """
+    mapping = {}
+    if uses_cid_font(lang, font):
+        mapping.update({char: replacement for char, (replacement, _) in CID_REPLACEMENTS.items()})
+    if markup:
+        mapping.update(MARKUP_ESCAPES)
+    return str.maketrans(mapping) if mapping else None
+
+def normalize(text: str, lang: str, font: Optional[str] = None, markup: bool = False) -> str:
+    """Remplace en un seul passage les caractères non supportés par la police cible"""
+    table = get_table(lang, font, markup)
+    if table is None or not text:
+        return text
+    return text.translate(table)
+
+@lru_cache(maxsize=None)
+def _char_pattern(chars: str):
+    """Classe de caractères compilée pour un ensemble de caractères"""
+    return re.compile(f"[{re.escape(chars)}]")
+
+def scan_chars(text: str, chars: Iterable[str]) -> Dict[str, Tuple[int, int]]:
+    """
+    Repère en un seul passage les caractères donnés
+
+    Returns:
+        Dict caractère -> (nombre d'occurrences, position de la première)
+    """
+    found = {}
+    for match in _char_pattern(''.join(chars)).finditer(text):
+        char = match.group()
+        if char in found:
+            found[char][0] += 1
+        else:
+            found[char] = [1, match.start()]
+    return {char: (count, first) for char, (count, first) in found.items()}
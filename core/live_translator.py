@@ -0,0 +1,207 @@
+"""
+Live Translator - Traduction spéculative pendant l'écriture
+Les paragraphes qui n'ont plus bougé depuis quelques secondes sont traduits au
+repos vers les langues actives. Les résultats remplissent la mémoire de
+traduction : "Tout traduire" et l'export n'ont presque plus rien à envoyer aux
+modèles. Un paragraphe modifié change de hash, son ancienne version sort de la
+file sans être traduite.
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from .translator import TARGET_LANGS
+
+# Intervalle de scrutation des chapitres modifiés (secondes)
+POLL_INTERVAL = 1.0
+
+# Chapitres suivis au plus (les plus récemment modifiés)
+MAX_CHAPTERS = 4
+
+# Durée de validité des langues par défaut (langues déjà traduites du livre, secondes)
+LANGS_REFRESH = 30.0
+
+class LiveTranslator:
+    """Traduit en arrière-plan les paragraphes stables des chapitres en cours d'écriture"""
+
+    def __init__(self, translator, delay: float = 5.0, busy: Optional[Callable[[], bool]] = None,
+                 default_langs: Optional[Callable[[], List[str]]] = None,
+                 route_langs: Optional[List[str]] = None):
+        """
+        Args:
+            translator: Translator de l'application (avec mémoire de traduction)
+            delay: Secondes sans modification avant de traduire un paragraphe
+            busy: Vrai pendant une traduction demandée (moteur, file, ferme) : la
+                  traduction en direct attend qu'elle soit terminée
+            default_langs: Langues cibles des chapitres signalés sans langues
+                           (appelé dans le thread de traduction, pas à chaque frappe)
+            route_langs: Lot pour lequel les routes sont planifiées (défaut: les
+                         langues de "Tout traduire") : mêmes routes, donc mêmes
+                         entrées de mémoire de traduction
+        """
+        self.translator = translator
+        self.delay = float(delay)
+        self.busy = busy
+        self.default_langs = default_langs
+        self.route_langs = list(route_langs or TARGET_LANGS)
+        # id chapitre -> (chapitre, langues demandées ou None), le plus récemment modifié en dernier
+        self._chapters: 'OrderedDict[str, Tuple]' = OrderedDict()
+        self._langs: Dict[str, List[str]] = {}            # id chapitre -> langues cibles
+        self._dirty = set()                               # Chapitres modifiés depuis la dernière scrutation
+        self._seen: Dict[str, Dict[str, float]] = {}      # id chapitre -> {hash paragraphe: instant d'apparition}
+        self._texts: Dict[str, Dict[str, str]] = {}       # id chapitre -> {hash paragraphe: texte}
+        self._done: Dict[str, Set[Tuple[str, str]]] = {}  # id chapitre -> (hash paragraphe, langue) déjà traduits
+        self._cached_langs: List[str] = []
+        self._cached_at = 0.0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        # Statistiques
+        self.translated = 0     # Paragraphes traduits d'avance
+        self.invalidated = 0    # Paragraphes modifiés avant d'avoir été traduits
+
+    def start(self) -> bool:
+        """
+        Démarre le thread de traduction au repos
+
+        Returns:
+            False si la traduction spéculative ne servirait à rien (pas de mémoire)
+        """
+        if not self.translator.available:
+            return False
+        if self.translator.memory is None:
+            print("⚠️ Traduction en direct désactivée : mémoire de traduction indisponible")
+            return False
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        print(f"[OK] Traduction en direct active (paragraphes stables depuis {self.delay:.0f}s)")
+        return True
+
+    def stop(self):
+        """Arrête le thread (le paragraphe en cours de traduction se termine)"""
+        self._stop.set()
+        if self.translated:
+            print(f"[OK] Traduction en direct : {self.translated} paragraphe(s) traduit(s) d'avance, "
+                  f"{self.invalidated} modifié(s) avant traduction")
+
+    def note_edit(self, chapter, langs: Optional[List[str]] = None):
+        """
+        Signale une modification du chapitre (appelé à chaque frappe, reste léger)
+
+        Args:
+            langs: Langues cibles actives (None = default_langs)
+        """
+        with self._lock:
+            self._chapters[chapter.id] = (chapter, list(langs) if langs is not None else None)
+            self._chapters.move_to_end(chapter.id)
+            self._dirty.add(chapter.id)
+            # Chapitres les moins récemment modifiés : plus suivis
+            while len(self._chapters) > MAX_CHAPTERS:
+                chapter_id, _ = self._chapters.popitem(last=False)
+                self._dirty.discard(chapter_id)
+                for tracked in (self._langs, self._seen, self._texts, self._done):
+                    tracked.pop(chapter_id, None)
+
+    def _get_default_langs(self) -> List[str]:
+        """Langues par défaut, recalculées au plus toutes les LANGS_REFRESH secondes"""
+        if self.default_langs is not None and time.time() - self._cached_at > LANGS_REFRESH:
+            try:
+                self._cached_langs = list(self.default_langs())
+                self._cached_at = time.time()
+            except Exception as e:
+                # Livre modifié pendant le calcul : on garde les langues précédentes
+                print(f"⚠️ Traduction en direct : langues cibles non recalculées ({e})")
+        return self._cached_langs
+
+    def _scan(self):
+        """Relit les chapitres modifiés : les nouveaux paragraphes repartent de zéro"""
+        with self._lock:
+            dirty = [(chapter_id,) + self._chapters[chapter_id] for chapter_id in self._dirty]
+            self._dirty.clear()
+
+        now = time.time()
+        for chapter_id, chapter, langs in dirty:
+            if langs is None:
+                langs = self._get_default_langs()
+            texts = {paragraph_hash: paragraph for paragraph_hash, paragraph
+                     in zip(chapter.get_source_hashes(), chapter.get_source_paragraphs())
+                     if paragraph.strip()}
+            with self._lock:
+                if chapter_id not in self._chapters:
+                    continue  # Plus suivi entre-temps
+                previous = self._seen.get(chapter_id, {})
+                done = self._done.get(chapter_id, set())
+                self.invalidated += sum(1 for paragraph_hash in previous
+                                        if paragraph_hash not in texts and
+                                        any((paragraph_hash, lang) not in done for lang in langs))
+                self._langs[chapter_id] = langs
+                self._seen[chapter_id] = {paragraph_hash: previous.get(paragraph_hash, now)
+                                          for paragraph_hash in texts}
+                self._texts[chapter_id] = texts
+                # Paragraphes disparus : plus rien à retenir
+                self._done[chapter_id] = {(paragraph_hash, lang) for paragraph_hash, lang in done
+                                          if paragraph_hash in texts}
+
+    def _next_paragraph(self) -> Optional[Tuple[str, str, str, List[str]]]:
+        """Premier paragraphe stable qui manque dans au moins une langue active"""
+        now = time.time()
+        candidates = []
+        with self._lock:
+            for chapter_id, seen in self._seen.items():
+                langs = self._langs[chapter_id]
+                done = self._done[chapter_id]
+                stable = []
+                for paragraph_hash, since in seen.items():
+                    todo = [lang for lang in langs if (paragraph_hash, lang) not in done]
+                    if todo and now - since >= self.delay:
+                        stable.append((paragraph_hash, self._texts[chapter_id][paragraph_hash], todo))
+                if stable:
+                    candidates.append((chapter_id, self._chapters[chapter_id][0], stable))
+
+        # Hors verrou : lire les traductions du chapitre peut toucher la bibliothèque
+        for chapter_id, chapter, stable in candidates:
+            sources = {}
+            for paragraph_hash, text, todo in stable:
+                # Déjà couvert par une traduction du chapitre encore valide
+                for lang in todo:
+                    if lang not in sources:
+                        sources[lang] = set(chapter.get_translation_sources(lang) or ())
+                todo = [lang for lang in todo if paragraph_hash not in sources[lang]]
+                if todo:
+                    return chapter_id, paragraph_hash, text, todo
+        return None
+
+    def _run(self):
+        """Boucle du thread : scruter, puis traduire les paragraphes stables un par un"""
+        while not self._stop.wait(POLL_INTERVAL):
+            self._translate_stable()
+
+    def _translate_stable(self):
+        """Traduit les paragraphes stables un par un, tant qu'aucune traduction n'est demandée"""
+        while not self._stop.is_set():
+            self._scan()
+            # Céder la place aux traductions demandées explicitement
+            if self.translator._active_work or (self.busy is not None and self.busy()):
+                return
+            job = self._next_paragraph()
+            if job is None:
+                return
+            chapter_id, paragraph_hash, text, langs = job
+            try:
+                # Remplit la mémoire de traduction, routes planifiées comme "Tout traduire"
+                self.translator.translate_titles([text], langs, route_langs=self.route_langs)
+                self.translated += 1
+            except Exception as e:
+                print(f"⚠️ Traduction en direct impossible: {e}")
+            with self._lock:
+                # Même en cas d'erreur : un essai par paragraphe et par langue
+                if chapter_id in self._done:
+                    self._done[chapter_id].update((paragraph_hash, lang) for lang in langs)
+
+    def get_stats(self) -> Dict[str, int]:
+        """Paragraphes suivis, traduits d'avance et invalidés"""
+        with self._lock:
+            tracked = sum(len(seen) for seen in self._seen.values())
+        return {'tracked': tracked, 'translated': self.translated, 'invalidated': self.invalidated}
@@ -0,0 +1,178 @@
+"""
+Quality Scan - Vérification qualité de tout le livre (chapitres x langues)
+TextCleaner.detect_errors tourne dans un pool de processus ; les résultats sont
+mis en cache par hash du texte, si bien qu'une nouvelle vérification ne
+réanalyse que les traductions modifiées depuis la précédente.
+"""
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .text_cleaner import TextCleaner
+
+CACHE_FILE = Path(__file__).parent.parent / "data" / "quality_cache.json"
+
+# À incrémenter quand les règles de TextCleaner changent (invalide le cache)
+CACHE_VERSION = 2
+
+# En dessous, analyser dans le processus courant (démarrer un pool coûte plus cher)
+MIN_POOL_TEXTS = 8
+
+# TextCleaner propre à chaque processus d'analyse
+_worker_cleaner: Optional[TextCleaner] = None
+
+def _scan_text(text: str, lang: str) -> Dict:
+    """Analyse un texte (dans un processus d'analyse)"""
+    global _worker_cleaner
+    if _worker_cleaner is None:
+        _worker_cleaner = TextCleaner()
+    return _worker_cleaner.detect_errors(text, lang)
+
+def _fix_text(text: str, lang: str) -> Tuple[str, List[str]]:
+    """Corrige un texte (dans un processus d'analyse)"""
+    global _worker_cleaner
+    if _worker_cleaner is None:
+        _worker_cleaner = TextCleaner()
+    return _worker_cleaner.auto_fix(text, lang)
+
+class QualityScanner:
+    """Analyse qualité du livre entier, en parallèle et avec cache"""
+
+    def __init__(self, cache_path: Optional[Path] = None, workers: int = 0):
+        """
+        Args:
+            cache_path: Résultats par hash de texte (défaut: data/quality_cache.json)
+            workers: Processus d'analyse (0 = nombre de cœurs)
+        """
+        self.cache_path = Path(cache_path) if cache_path else CACHE_FILE
+        self.workers = workers or os.cpu_count() or 1
+        self._cache: Dict[str, Dict] = {}
+        self._load_cache()
+
+    def _load_cache(self):
+        """Charge les résultats des vérifications précédentes"""
+        try:
+            if self.cache_path.exists():
+                with open(self.cache_path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if data.get('version') == CACHE_VERSION:
+                    self._cache = data.get('results', {})
+        except Exception as e:
+            print(f"[!] Erreur chargement cache qualité : {e}")
+
+    def _save_cache(self, keys: set):
+        """Écrit le cache (seulement les textes de la dernière vérification : taille bornée)"""
+        self._cache = {key: result for key, result in self._cache.items() if key in keys}
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = self.cache_path.with_suffix('.tmp')
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump({'version': CACHE_VERSION, 'results': self._cache}, f, ensure_ascii=False)
+            os.replace(temp_path, self.cache_path)
+        except Exception as e:
+            print(f"[!] Erreur sauvegarde cache qualité : {e}")
+
+    @staticmethod
+    def text_hash(text: str, lang: str) -> str:
+        """Clé de cache d'un texte (la langue change les règles appliquées)"""
+        return hashlib.sha1(f"{lang}\n{text}".encode('utf-8')).hexdigest()
+
+    def _run(self, function: Callable, texts: List[Tuple[str, str]],
+             progress_callback: Optional[Callable[[int, int], None]] = None) -> List:
+        """Applique function(texte, langue) à chaque texte, en parallèle si le lot le justifie"""
+        total = len(texts)
+        results = []
+        if total < MIN_POOL_TEXTS or self.workers <= 1:
+            for done, (text, lang) in enumerate(texts, 1):
+                results.append(function(text, lang))
+                if progress_callback:
+                    progress_callback(done, total)
+            return results
+
+        with ProcessPoolExecutor(max_workers=min(self.workers, total)) as pool:
+            chunksize = max(1, total // (self.workers * 4))
+            for done, result in enumerate(pool.map(function, [t for t, _ in texts], [l for _, l in texts],
+                                                   chunksize=chunksize), 1):
+                results.append(result)
+                if progress_callback:
+                    progress_callback(done, total)
+        return results
+
+    def scan(self, chapters: List, langs: List[str],
+             progress_callback: Optional[Callable[[int, int], None]] = None) -> Dict:
+        """
+        Vérifie toutes les traductions des chapitres dans les langues données
+
+        Args:
+            progress_callback: Appelé avec (textes analysés, textes à analyser)
+
+        Returns:
+            Dict avec :
+            - matrix: Dict id chapitre -> {langue: nombre d'erreurs, None si pas de traduction}
+            - results: Dict (id chapitre, langue) -> résultat de detect_errors
+            - scanned / cached: textes analysés / repris du cache
+            - seconds: durée de la vérification
+        """
+        start = time.perf_counter()
+        matrix = {chapter.id: {lang: None for lang in langs} for chapter in chapters}
+        cells: Dict[str, List[Tuple[str, str]]] = {}  # hash -> cellules (id chapitre, langue)
+        todo = []
+        for chapter in chapters:
+            for lang in langs:
+                text = chapter.get_translation(lang)
+                if not text or not text.strip():
+                    continue
+                key = self.text_hash(text, lang)
+                if key not in cells and key not in self._cache:
+                    todo.append((key, text, lang))
+                cells.setdefault(key, []).append((chapter.id, lang))
+
+        for (key, _, _), result in zip(todo, self._run(_scan_text, [(text, lang) for _, text, lang in todo],
+                                                       progress_callback)):
+            self._cache[key] = result
+        self._save_cache(set(cells))
+
+        results = {}
+        for key, positions in cells.items():
+            for chapter_id, lang in positions:
+                results[(chapter_id, lang)] = self._cache[key]
+                matrix[chapter_id][lang] = self._cache[key]['error_count'] if self._cache[key]['has_errors'] else 0
+
+        return {
+            'matrix': matrix,
+            'results': results,
+            'scanned': len(todo),
+            'cached': len(cells) - len(todo),
+            'seconds': time.perf_counter() - start
+        }
+
+    def auto_fix_all(self, chapters: List, report: Dict,
+                     progress_callback: Optional[Callable[[int, int], None]] = None) -> Dict[Tuple[str, str], List[str]]:
+        """
+        Applique TextCleaner.auto_fix à toutes les traductions ayant des erreurs corrigeables
+
+        Les corrections conservent les lignes : la provenance des paragraphes
+        (retraduction incrémentale) est gardée.
+
+        Returns:
+            Dict (id chapitre, langue) -> corrections appliquées
+        """
+        by_id = {chapter.id: chapter for chapter in chapters}
+        todo = []
+        for (chapter_id, lang), result in report['results'].items():
+            if chapter_id in by_id and any(error['auto_fixable'] for error in result['errors']):
+                todo.append((by_id[chapter_id], lang))
+
+        fixes = self._run(_fix_text, [(chapter.get_translation(lang), lang) for chapter, lang in todo],
+                          progress_callback)
+        applied = {}
+        for (chapter, lang), (fixed_text, corrections) in zip(todo, fixes):
+            if not corrections:
+                continue
+            chapter.set_translation(lang, fixed_text, source_hashes=chapter.get_translation_sources(lang))
+            applied[(chapter.id, lang)] = corrections
+        return applied
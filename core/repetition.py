@@ -0,0 +1,159 @@
+"""
+Repetition - Détection et suppression des répétitions en temps linéaire
+Moteur commun à TextCleaner (détection / correction) et au Translator
+(nettoyage des sorties chinoises et japonaises).
+
+Le texte est découpé en unités (mots, ou caractères pour le chinois et le
+japonais). Pour chaque période p (1 = mot ou caractère répété, 2+ = groupe
+répété), les unités sont comparées d'un coup à celles situées p plus loin :
+une suite d'égalités assez longue est une répétition. Chaque période coûte un
+passage linéaire (comparaisons faites en C), sans retour arrière : le coût
+reste O(n) même sur des sorties de plusieurs mégaoctets sans espaces.
+"""
+import operator
+import re
+from typing import Dict, List, Tuple
+
+# Langues sans espaces entre les mots : répétitions cherchées aussi caractère par caractère
+CHAR_LANGS = {'zh', 'ja'}
+
+WORD = re.compile(r'\S+')
+
+class RepetitionEngine:
+    """Trouve et réduit les mots, groupes de mots et caractères répétés consécutivement"""
+
+    def __init__(self, word_threshold: int = 5, char_threshold: int = 4, phrase_repeats: int = 3,
+                 max_word_period: int = 8, max_char_period: int = 16):
+        """
+        Args:
+            word_threshold: Un mot répété plus de word_threshold fois est une erreur
+            char_threshold: Un caractère (zh/ja) répété plus de char_threshold fois est une erreur
+            phrase_repeats: Un groupe (2 unités ou plus) répété au moins phrase_repeats fois est une erreur
+            max_word_period: Taille max (en mots) d'un groupe répété
+            max_char_period: Taille max (en caractères) d'un groupe répété (zh/ja)
+        """
+        self.word_threshold = word_threshold
+        self.char_threshold = char_threshold
+        self.phrase_repeats = phrase_repeats
+        self.max_word_period = max_word_period
+        self.max_char_period = max_char_period
+
+    def find(self, text: str, lang: str = '') -> List[Dict]:
+        """
+        Cherche toutes les répétitions, ligne par ligne
+
+        Returns:
+            Liste de Dict (ordre du texte) avec :
+            - kind: 'word', 'phrase' ou 'char'
+            - unit: texte répété (une occurrence)
+            - count: nombre d'occurrences consécutives
+            - start / end: position dans le texte (caractères) de toute la répétition
+            - unit_end: fin de la première occurrence (ce que garde clean)
+        """
+        found = []
+        offset = 0
+        for line in text.split('\n'):
+            if lang in CHAR_LANGS:
+                found.extend(self._find_chars(line, offset))
+            found.extend(self._find_words(line, offset))
+            offset += len(line) + 1
+        found.sort(key=lambda repetition: repetition['start'])
+        return found
+
+    def clean(self, text: str, lang: str = '') -> Tuple[str, List[Dict]]:
+        """
+        Réduit chaque répétition à une seule occurrence (mise en forme conservée)
+
+        Returns:
+            (texte nettoyé, répétitions supprimées)
+        """
+        removed = []
+        lines = []
+        for line in text.split('\n'):
+            if lang in CHAR_LANGS:
+                line = self._collapse(line, self._find_chars(line, 0), removed)
+            line = self._collapse(line, self._find_words(line, 0), removed)
+            lines.append(line)
+        return '\n'.join(lines), removed
+
+    @staticmethod
+    def _collapse(line: str, repetitions: List[Dict], removed: List[Dict]) -> str:
+        """Garde la première occurrence de chaque répétition (les répétitions ne se chevauchent pas)"""
+        if not repetitions:
+            return line
+        parts = []
+        position = 0
+        for repetition in sorted(repetitions, key=lambda r: r['start']):
+            parts.append(line[position:repetition['unit_end']])
+            position = repetition['end']
+        parts.append(line[position:])
+        removed.extend(repetitions)
+        return ''.join(parts)
+
+    def _find_words(self, line: str, offset: int) -> List[Dict]:
+        """Mots et groupes de mots répétés d'une ligne"""
+        matches = list(WORD.finditer(line))
+        if len(matches) < 2:
+            return []
+        words = [match.group() for match in matches]
+        found = []
+        for start, end, period, count in self._runs(words, self.word_threshold, self.max_word_period):
+            found.append({
+                'kind': 'word' if period == 1 else 'phrase',
+                'unit': line[matches[start].start():matches[start + period - 1].end()],
+                'count': count,
+                'start': offset + matches[start].start(),
+                'end': offset + matches[end - 1].end(),
+                'unit_end': offset + matches[start + period - 1].end()
+            })
+        return found
+
+    def _find_chars(self, line: str, offset: int) -> List[Dict]:
+        """Caractères et suites de caractères répétés d'une ligne (zh/ja)"""
+        found = []
+        for start, end, period, count in self._runs(line, self.char_threshold, self.max_char_period):
+            unit = line[start:start + period]
+            # Espaces et nombres (100000, 121212) ne sont pas des erreurs de traduction
+            if not unit.strip() or unit.isdigit():
+                continue
+            found.append({
+                'kind': 'char' if period == 1 else 'phrase',
+                'unit': unit,
+                'count': count,
+                'start': offset + start,
+                'end': offset + end,
+                'unit_end': offset + start + period
+            })
+        return found
+
+    def _runs(self, units, threshold: int, max_period: int) -> List[Tuple[int, int, int, int]]:
+        """
+        Répétitions d'une suite d'unités (chaîne ou liste), plus petite période d'abord
+
+        Returns:
+            Liste (début, fin, période, occurrences) en indices d'unités, sans chevauchement
+        """
+        length = len(units)
+        covered = bytearray(length)
+        covered_total = 0
+        runs = []
+        for period in range(1, min(max_period, length // 2) + 1):
+            if covered_total == length:
+                break
+            repeats = threshold + 1 if period == 1 else self.phrase_repeats
+            # Égalités consécutives unité[i] == unité[i + p] nécessaires
+            needed = (repeats - 1) * period
+            if needed > length - period:
+                continue
+            equal = bytes(map(operator.eq, units, units[period:]))
+            for match in re.finditer(b'\x01{%d,}' % needed, equal):
+                start = match.start()
+                count = (match.end() - start + period) // period
+                end = start + count * period
+                # Déjà couverte par une période plus petite (ex: "a a a a a a" vu comme "a a" x3)
+                if covered.find(1, start, end) != -1:
+                    continue
+                covered[start:end] = b'\x01' * (end - start)
+                covered_total += end - start
+                runs.append((start, end, period, count))
+        return runs
@@ -0,0 +1,251 @@
+"""
+Route Planner - Choix du chemin de traduction le moins coûteux
+Construit un graphe à partir des packs Argos installés (une arête par pack) et
+cherche, pour chaque langue cible, le chemin le plus rapide depuis le français.
+Un pack direct FR -> X évite un passage complet par le modèle FR -> EN.
+
+Pour un lot de langues cibles, le pivot FR -> EN n'est calculé qu'une fois :
+son coût n'est compté qu'une fois pour tout le lot (plan_batch).
+"""
+import heapq
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+STATS_FILE = Path(__file__).parent.parent / "data" / "route_stats.json"
+
+# Coût d'une arête jamais mesurée (secondes pour 1000 caractères, ordre de grandeur CPU)
+DEFAULT_EDGE_COST = 1.0
+
+# Pénalité par modèle traversé : chaque passage dégrade un peu la qualité
+HOP_PENALTY = 0.25
+
+# Poids de la nouvelle mesure dans la moyenne glissante du débit
+MEASURE_WEIGHT = 0.3
+
+# Délai minimal entre deux écritures du fichier de mesures
+SAVE_INTERVAL = 30
+
+class RoutePlanner:
+    """Plus courts chemins (Dijkstra) sur le graphe des packs installés"""
+
+    def __init__(self, stats_path: Optional[Path] = None):
+        """
+        Args:
+            stats_path: Débits mesurés par paire (défaut: data/route_stats.json)
+        """
+        self.stats_path = Path(stats_path) if stats_path else STATS_FILE
+        self.throughput: Dict[str, float] = {}  # "fr>en" -> caractères / seconde
+        self._edges: Dict[str, Dict[str, float]] = {}
+        self._signature: Optional[Tuple] = None
+        self._routes: Dict[Tuple[str, str], Optional[List[str]]] = {}
+        self._batches: Dict[Tuple, Dict[str, Optional[List[str]]]] = {}
+        self._dirty: Dict[str, float] = {}
+        self._last_save = 0.0
+        self._lock = threading.Lock()
+        self._load_stats()
+
+    def _load_stats(self):
+        """Charge les débits mesurés lors des sessions précédentes"""
+        try:
+            if self.stats_path.exists():
+                with open(self.stats_path, 'r', encoding='utf-8') as f:
+                    self.throughput.update(json.load(f))
+        except Exception as e:
+            print(f"[!] Erreur chargement mesures de traduction : {e}")
+
+    def edge_cost(self, source_lang: str, target_lang: str) -> float:
+        """Coût d'un passage par le pack source -> cible (secondes / 1000 car. + pénalité)"""
+        speed = self.throughput.get(f"{source_lang}>{target_lang}")
+        cost = 1000.0 / speed if speed else DEFAULT_EDGE_COST
+        return cost + HOP_PENALTY
+
+    def update(self, packages: Iterable) -> bool:
+        """
+        Reconstruit le graphe si l'ensemble des packs installés a changé
+
+        Returns:
+            True si les routes ont été recalculées
+        """
+        packages = list(packages)
+        signature = tuple(sorted((p.from_code, p.to_code, str(getattr(p, 'package_version', '')))
+                                 for p in packages))
+        with self._lock:
+            if signature == self._signature:
+                return False
+            self._edges = {}
+            for p in packages:
+                self._edges.setdefault(p.from_code, {})[p.to_code] = self.edge_cost(p.from_code, p.to_code)
+            self._signature = signature
+            self._routes = {}
+            self._batches = {}
+            return True
+
+    def get_route(self, source_lang: str, target_lang: str) -> Optional[List[str]]:
+        """
+        Chemin le moins coûteux entre deux langues
+
+        Returns:
+            Liste des langues traversées (ex: ['fr', 'en', 'ja'] ou ['fr', 'es']),
+            None si aucun chemin n'existe
+        """
+        key = (source_lang, target_lang)
+        with self._lock:
+            if key not in self._routes:
+                best, previous = self._shortest_paths(source_lang)
+                self._routes[key] = self._path(previous, source_lang, target_lang) if target_lang in best else None
+            return self._routes[key]
+
+    def plan_batch(self, source_lang: str, target_langs: Iterable[str],
+                   pivot: str = 'en') -> Dict[str, Optional[List[str]]]:
+        """
+        Routes d'un lot de langues cibles traduites ensemble
+
+        Le texte pivot (source -> pivot) est calculé une seule fois pour tout le
+        lot : une fois payé, passer par le pivot ne coûte plus que la suite de la
+        route (et la pénalité de qualité de chaque modèle traversé). Deux plans
+        sont comparés : sans pivot (chaque cible évite le pivot), et avec le
+        pivot payé une fois (chaque cible prend alors le moins coûteux entre sa
+        route sans pivot et la route via le pivot).
+
+        Returns:
+            Dict langue cible -> liste des langues traversées (None si injoignable)
+        """
+        targets = tuple(sorted(set(target_langs)))
+        key = (source_lang, pivot, targets)
+        with self._lock:
+            if key not in self._batches:
+                self._batches[key] = self._plan_batch(source_lang, targets, pivot)
+            return dict(self._batches[key])
+
+    def _plan_batch(self, source_lang: str, targets: Tuple[str, ...],
+                    pivot: str) -> Dict[str, Optional[List[str]]]:
+        """Calcul de plan_batch (verrou pris)"""
+        inf = float('inf')
+        best, previous = self._shortest_paths(source_lang)
+        avoid_best, avoid_previous = self._shortest_paths(source_lang, avoid=pivot)
+
+        def without_pivot(target):
+            if target not in avoid_best:
+                return inf, None
+            return avoid_best[target], self._path(avoid_previous, source_lang, target)
+
+        # Plans (coût payé une fois pour le lot, routes) ; sans pivot : impossible si le pivot est demandé
+        plans = []
+        if pivot not in targets:
+            plans.append((0.0, {target: without_pivot(target) for target in targets}))
+
+        # Plan avec le pivot payé une seule fois
+        if pivot in best and pivot != source_lang:
+            pivot_route = self._path(previous, source_lang, pivot)
+            penalty = HOP_PENALTY * (len(pivot_route) - 1)
+            after_best, after_previous = self._shortest_paths(pivot, avoid=source_lang)
+            routes = {}
+            for target in targets:
+                if target == pivot:
+                    routes[target] = (0.0, pivot_route)
+                    continue
+                cost, route = without_pivot(target)
+                if target in after_best and penalty + after_best[target] < cost:
+                    cost = penalty + after_best[target]
+                    route = pivot_route + self._path(after_previous, pivot, target)[1:]
+                routes[target] = (cost, route)
+            plans.append((best[pivot], routes))
+
+        if not plans:
+            # Pivot demandé mais injoignable : les autres cibles gardent leur route sans pivot
+            return {target: without_pivot(target)[1] for target in targets}
+
+        def score(plan):
+            # D'abord le plus de cibles joignables, puis le coût total
+            shared, routes = plan
+            reachable = [cost for cost, route in routes.values() if route is not None]
+            return -len(reachable), shared + sum(reachable)
+
+        _, chosen = min(plans, key=score)
+        return {target: route for target, (_, route) in chosen.items()}
+
+    def _shortest_paths(self, source_lang: str, avoid: Optional[str] = None) -> Tuple[Dict, Dict]:
+        """
+        Dijkstra depuis une langue (les arêtes sont peu nombreuses : une par pack installé)
+
+        Args:
+            avoid: Langue à ne jamais traverser
+
+        Returns:
+            (coût minimal par langue joignable, langue précédente sur ce chemin)
+        """
+        best = {source_lang: 0.0}
+        previous = {}
+        heap = [(0.0, source_lang)]
+        while heap:
+            cost, lang = heapq.heappop(heap)
+            if cost > best.get(lang, float('inf')):
+                continue
+            for neighbour, edge in self._edges.get(lang, {}).items():
+                if neighbour == avoid:
+                    continue
+                candidate = cost + edge
+                if candidate < best.get(neighbour, float('inf')):
+                    best[neighbour] = candidate
+                    previous[neighbour] = lang
+                    heapq.heappush(heap, (candidate, neighbour))
+        return best, previous
+
+    @staticmethod
+    def _path(previous: Dict, source_lang: str, target_lang: str) -> List[str]:
+        """Remonte le chemin source -> cible d'un arbre de Dijkstra"""
+        route = [target_lang]
+        lang = target_lang
+        while lang != source_lang:
+            lang = previous[lang]
+            route.append(lang)
+        return route[::-1]
+
+    def record(self, source_lang: str, target_lang: str, characters: int, seconds: float):
+        """
+        Enregistre le débit observé pour une paire (moyenne glissante)
+
+        Les routes déjà calculées ne changent pas : les nouvelles mesures servent
+        au prochain calcul (nouvelle session ou nouveaux packs).
+        """
+        if characters <= 0 or seconds <= 0:
+            return
+        pair = f"{source_lang}>{target_lang}"
+        speed = characters / seconds
+        with self._lock:
+            previous = self.throughput.get(pair)
+            if previous:
+                speed = (1 - MEASURE_WEIGHT) * previous + MEASURE_WEIGHT * speed
+            self.throughput[pair] = speed
+            self._dirty[pair] = speed
+            if time.time() - self._last_save >= SAVE_INTERVAL:
+                self._save_locked()
+
+    def save(self):
+        """Écrit les mesures en attente sur disque"""
+        with self._lock:
+            self._save_locked()
+
+    def _save_locked(self):
+        """Fusionne les mesures avec le fichier (plusieurs processus peuvent écrire)"""
+        if not self._dirty:
+            return
+        try:
+            stored = {}
+            if self.stats_path.exists():
+                with open(self.stats_path, 'r', encoding='utf-8') as f:
+                    stored = json.load(f)
+            stored.update(self._dirty)
+            self.stats_path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = self.stats_path.with_suffix(f".{os.getpid()}.tmp")
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(stored, f, indent=2)
+            os.replace(temp_path, self.stats_path)
+            self._dirty = {}
+            self._last_save = time.time()
+        except Exception as e:
+            print(f"[!] Erreur sauvegarde mesures de traduction : {e}")
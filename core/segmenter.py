@@ -0,0 +1,209 @@
+"""
+Segmenter - Découpage rapide en phrases par règles
+Remplace la détection de phrases Stanza d'Argos (lente à charger, gourmande en RAM)
+"""
+import multiprocessing
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# Abréviations qui ne terminent jamais une phrase (comparées sans le point final)
+ABBREVIATIONS = {
+    'fr': {
+        'm', 'mm', 'mme', 'mmes', 'mlle', 'mlles', 'dr', 'drs', 'pr', 'me', 'mgr', 'st', 'ste',
+        'cf', 'p', 'pp', 'vol', 'chap', 'fig', 'n', 'no', 'art', 'env', 'av', 'apr', 'ex',
+        'éd', 'al', 'hab', 'tél', 'bd', 'boul', 'janv', 'févr', 'avr', 'juil', 'sept', 'oct',
+        'nov', 'déc', 'j.-c', 'c.-à-d', 'càd', 'vs',
+    },
+    'en': {
+        'mr', 'mrs', 'ms', 'dr', 'drs', 'prof', 'st', 'jr', 'sr', 'mt', 'gen', 'col', 'lt', 'sgt',
+        'capt', 'rev', 'hon', 'vs', 'cf', 'fig', 'no', 'vol', 'p', 'pp', 'ch', 'jan', 'feb',
+        'mar', 'apr', 'jun', 'jul', 'aug', 'sep', 'sept', 'oct', 'nov', 'dec', 'approx', 'dept',
+    },
+}
+
+# Ponctuation finale latine, éventuellement suivie de guillemets/parenthèses fermants
+LATIN_BOUNDARY = re.compile(r'[.!?…]+[»"”’)\]]*(\s+)')
+
+# Ponctuation finale CJK (pas d'espace obligatoire après)
+CJK_BOUNDARY = re.compile(r'[。！？．]+[」』）】〕"”’]*(\s*)|[!?]+[」』）】"”’]*(\s+)')
+
+# Thaï : pas de ponctuation finale, les phrases sont séparées par des espaces
+THAI_BOUNDARY = re.compile(r'(?<=[฀-๿])(\s+)(?=[฀-๿])')
+
+# Un début de phrase latine : majuscule, chiffre, guillemet/tiret ouvrant
+SENTENCE_START = re.compile(r'[A-ZÀ-ÖØ-Þ0-9«"“‘¿¡(\[—–-]')
+
+# Sigles pointés (U.S, e.g, i.e) et initiales (J. K. Rowling)
+DOTTED_ACRONYM = re.compile(r'^(?:\w\.)+\w$')
+
+CJK_LANGS = {'zh', 'ja', 'ko'}
+
+class SentenceSegmenter:
+    """Découpe un paragraphe en phrases avec des règles par langue"""
+
+    def split(self, paragraph: str, lang: str = 'fr') -> List[str]:
+        """
+        Découpe un paragraphe
+
+        Returns:
+            Liste alternée [phrase, séparateur, phrase, ...] : ''.join(...) redonne
+            exactement le paragraphe d'origine
+        """
+        if not paragraph:
+            return [paragraph]
+
+        if lang in CJK_LANGS:
+            cuts = [(m.end() - len(m.group(1) or m.group(2) or ''), m.end())
+                    for m in CJK_BOUNDARY.finditer(paragraph)]
+        elif lang == 'th':
+            cuts = [(m.start(1), m.end(1)) for m in THAI_BOUNDARY.finditer(paragraph)]
+        else:
+            cuts = [(m.start(1), m.end(1)) for m in LATIN_BOUNDARY.finditer(paragraph)
+                    if self._is_latin_boundary(paragraph, m, lang)]
+
+        parts = []
+        position = 0
+        for start, end in cuts:
+            if end >= len(paragraph) or start <= position:
+                continue
+            parts.append(paragraph[position:start])
+            parts.append(paragraph[start:end])
+            position = end
+        parts.append(paragraph[position:])
+        return parts
+
+    def _is_latin_boundary(self, paragraph: str, match, lang: str) -> bool:
+        """Vérifie qu'une ponctuation finale latine termine vraiment la phrase"""
+        following = paragraph[match.end():match.end() + 1]
+        if following and not SENTENCE_START.match(following):
+            # Une phrase ne commence pas par une minuscule
+            return False
+
+        punctuation = match.group(0).strip()
+        if not punctuation.startswith('.') or punctuation.startswith('...'):
+            return True
+
+        # Mot précédant le point : abréviation, initiale ou sigle ?
+        words = paragraph[:match.start()].split()
+        if not words:
+            return True
+        word = words[-1].lstrip('«"“‘([').lower()
+        if len(word) == 1 and word.isalpha():
+            return False
+        if DOTTED_ACRONYM.match(word):
+            return False
+        return word not in ABBREVIATIONS.get(lang, ABBREVIATIONS['en'])
+
+def _peak_rss_mb() -> Optional[float]:
+    """Pic de mémoire résidente du processus courant en Mo (mémoire native comprise)"""
+    try:
+        import resource
+    except ImportError:
+        # Windows : psutil s'il est installé
+        try:
+            import psutil
+        except ImportError:
+            return None
+        return psutil.Process().memory_info().peak_wset / 1e6
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Ko sous Linux, octets sous macOS
+    return peak / 1e6 if sys.platform == 'darwin' else peak / 1e3
+
+def _benchmark_engine(engine: str, text: str, lang: str, stanza_dir: Optional[Path]) -> Dict:
+    """Mesure un moteur (dans un processus neuf, voir benchmark_segmenters)"""
+    paragraphs = [p for p in text.split('\n') if p.strip()]
+    base = _peak_rss_mb()
+    start = time.perf_counter()
+    if engine == 'rules':
+        segmenter = SentenceSegmenter()
+        count = lambda paragraph: len(segmenter.split(paragraph, lang)[0::2])
+    else:
+        import stanza
+
+        if stanza_dir is None:
+            import argostranslate.package
+            package = next(p for p in argostranslate.package.get_installed_packages()
+                           if p.from_code == lang)
+            stanza_dir = Path(package.package_path) / "stanza"
+        pipeline = stanza.Pipeline(lang=lang, dir=str(stanza_dir), processors='tokenize',
+                                   use_gpu=False, logging_level='WARNING', download_method=None)
+        count = lambda paragraph: len(pipeline(paragraph).sentences)
+    loaded = time.perf_counter()
+    sentences = sum(count(p) for p in paragraphs)
+    done = time.perf_counter()
+    return {
+        'load_s': loaded - start,
+        'split_s': done - loaded,
+        'sentences': sentences,
+        'chars_per_s': len(text) / max(done - loaded, 1e-9),
+        'peak_mb': _peak_rss_mb(),
+        'base_mb': base,
+    }
+
+def _benchmark_worker(conn, engine: str, text: str, lang: str, stanza_dir: Optional[Path]):
+    """Point d'entrée du processus de mesure : renvoie ('ok', stats) ou ('error', message)"""
+    try:
+        conn.send(('ok', _benchmark_engine(engine, text, lang, stanza_dir)))
+    except Exception as e:
+        conn.send(('error', f"{type(e).__name__}: {e}"))
+    finally:
+        conn.close()
+
+def benchmark_segmenters(text: str, lang: str = 'fr', stanza_dir: Optional[Path] = None) -> Dict[str, Dict]:
+    """
+    Compare le segmenteur par règles au pipeline Stanza utilisé par Argos
+
+    Chaque moteur est mesuré dans son propre processus (spawn) : le pic de
+    mémoire résidente (RSS) compte aussi la mémoire native de torch et ne
+    mélange pas les deux moteurs.
+
+    Args:
+        text: Chapitre d'exemple (paragraphes séparés par des sauts de ligne)
+        lang: Langue du texte
+        stanza_dir: Dossier 'stanza' d'un pack Argos (défaut: pack FR -> EN installé)
+
+    Returns:
+        Dict moteur -> {load_s, split_s, sentences, chars_per_s, peak_mb, base_mb}
+        (peak_mb : pic RSS du processus de mesure, base_mb : pic avant chargement
+        du moteur, interpréteur seul ; None si la plateforme ne le fournit pas)
+    """
+    results = {}
+    context = multiprocessing.get_context('spawn')
+    for engine in ('rules', 'stanza'):
+        receiver, sender = context.Pipe(duplex=False)
+        process = context.Process(target=_benchmark_worker, args=(sender, engine, text, lang, stanza_dir))
+        process.start()
+        sender.close()
+        try:
+            status, value = receiver.recv()
+        except EOFError:
+            status, value = 'error', f"processus de mesure arrêté (code {process.exitcode})"
+        finally:
+            receiver.close()
+            process.join()
+        if status == 'ok':
+            results[engine] = value
+        else:
+            print(f"[!] Benchmark {engine} impossible : {value}")
+
+    return results
+
+def _format_mb(value: Optional[float]) -> str:
+    """Mémoire lisible (n/d si non mesurée)"""
+    return "n/d" if value is None else f"{value:.1f} Mo"
+
+if __name__ == "__main__":
+    # Usage : python -m core.segmenter chapitre.txt [langue]
+    if len(sys.argv) < 2:
+        print("Usage : python -m core.segmenter chapitre.txt [langue]")
+        sys.exit(1)
+
+    sample = Path(sys.argv[1]).read_text(encoding='utf-8')
+    sample_lang = sys.argv[2] if len(sys.argv) > 2 else 'fr'
+    for name, stats in benchmark_segmenters(sample, sample_lang).items():
+        print(f"{name:7s} chargement {stats['load_s']:.3f}s | découpage {stats['split_s']:.3f}s | "
+              f"{stats['sentences']} phrases | {stats['chars_per_s']:,.0f} car/s | "
+              f"pic RSS {_format_mb(stats['peak_mb'])} (interpréteur {_format_mb(stats['base_mb'])})")
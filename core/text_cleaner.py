@@ -6,12 +6,16 @@ Créé par Maman pour PHOBOS - 22/01/2026
 import re
 from typing import Dict, List, Tuple
 
+from .char_normalizer import CID_REPLACEMENTS, MISSING_CHARS, normalize, scan_chars
+from .repetition import RepetitionEngine
+
 class TextCleaner:
     """Détecte et corrige automatiquement les erreurs de traduction"""
     
     def __init__(self):
         """Initialise le nettoyeur de texte"""
         self.max_repetition_threshold = 5  # Nombre max de répétitions acceptables
+        self.repetitions = RepetitionEngine(word_threshold=self.max_repetition_threshold)
         
     def detect_errors(self, text: str, lang: str) -> Dict[str, any]:
         """
@@ -33,7 +37,7 @@ class TextCleaner:
         errors = []
         
         # 1. Détecter répétitions excessives
-        repetition_errors = self._detect_repetitions(text)
+        repetition_errors = self._detect_repetitions(text, lang)
         errors.extend(repetition_errors)
         
         # 2. Détecter caractères problématiques pour CID
@@ -55,78 +59,41 @@ class TextCleaner:
             'error_count': len(errors)
         }
     
-    def _detect_repetitions(self, text: str) -> List[Dict]:
-        """Détecte les répétitions excessives de mots/phrases"""
+    def _detect_repetitions(self, text: str, lang: str = '') -> List[Dict]:
+        """Détecte toutes les répétitions excessives de mots, groupes de mots et caractères (zh/ja)"""
         errors = []
-        
-        # Pattern : mot ou groupe de mots répété plus de X fois consécutivement
-        # Exemple : "Like Like Like Like Like"
-        
-        words = text.split()
-        
-        for i in range(len(words)):
-            if i + self.max_repetition_threshold >= len(words):
-                break
+        labels = {'word': 'Le mot', 'phrase': 'Le groupe', 'char': 'Le caractère'}
+        
+        # Exemple : "Like Like Like Like Like", "我爱你我爱你我爱你"
+        for repetition in self.repetitions.find(text, lang):
+            unit = repetition['unit']
+            count = repetition['count']
+            # Contexte borné (une répétition peut couvrir des mégaoctets)
+            start = repetition['start']
+            context = text[max(0, start - 40):min(repetition['end'], start + 80)]
             
-            # Vérifier si le mot actuel est répété
-            current_word = words[i]
-            repetition_count = 1
-            
-            for j in range(i + 1, min(i + 50, len(words))):  # Check jusqu'à 50 mots
-                if words[j] == current_word:
-                    repetition_count += 1
-                else:
-                    break
-            
-            if repetition_count > self.max_repetition_threshold:
-                # Extraire contexte
-                start_idx = max(0, i - 5)
-                end_idx = min(len(words), i + repetition_count + 5)
-                context = ' '.join(words[start_idx:end_idx])
-                
-                errors.append({
-                    'type': 'excessive_repetition',
-                    'word': current_word,
-                    'count': repetition_count,
-                    'position': i,
-                    'context': context,
-                    'auto_fixable': True,
-                    'severity': 'high',
-                    'message': f'Le mot "{current_word}" est répété {repetition_count} fois consécutivement'
-                })
-                
-                # Éviter de détecter la même répétition plusieurs fois
-                break
+            errors.append({
+                'type': 'excessive_repetition',
+                'word': unit,
+                'count': count,
+                'position': start,  # Position dans le texte (caractères)
+                'context': context,
+                'auto_fixable': True,
+                'severity': 'high',
+                'message': f'{labels[repetition["kind"]]} "{unit}" est répété {count} fois consécutivement'
+            })
         
         return errors
     
     def _detect_cid_problems(self, text: str, lang: str) -> List[Dict]:
-        """Détecte les caractères non-CID qui poseront problème en PDF"""
+        """Détecte les caractères non-CID qui poseront problème en PDF (un seul passage)"""
         errors = []
         
-        # Caractères problématiques pour CID
-        problematic_chars = {
-            '·': 'point médian',
-            '•': 'bullet',
-            '–': 'tiret cadratin',
-            '—': 'tiret long',
-            ''': 'guillemet courbe',
-            ''': 'guillemet courbe',
-            '"': 'guillemet double courbe',
-            '"': 'guillemet double courbe',
-            '…': 'points de suspension',
-            '€': 'symbole euro',
-            '£': 'symbole livre',
-            '©': 'copyright',
-            '®': 'registered',
-            '™': 'trademark',
-        }
-        
-        for char, name in problematic_chars.items():
-            if char in text:
-                count = text.count(char)
-                # Trouver première occurrence pour contexte
-                idx = text.index(char)
+        found = scan_chars(text, CID_REPLACEMENTS)
+        for char, (_, name) in CID_REPLACEMENTS.items():
+            if char in found:
+                count, idx = found[char]
+                # Contexte autour de la première occurrence
                 start = max(0, idx - 20)
                 end = min(len(text), idx + 20)
                 context = text[start:end]
@@ -148,14 +115,11 @@ class TextCleaner:
         """Détecte les caractères de remplacement (carrés, ?)"""
         errors = []
         
-        # Pattern pour carrés/caractères manquants
-        # Note : □ et � sont des indicateurs de caractères manquants
-        missing_patterns = ['□', '�', '\ufffd']
-        
-        for pattern in missing_patterns:
-            if pattern in text:
-                count = text.count(pattern)
-                idx = text.index(pattern)
+        # Note : □ et \ufffd sont des indicateurs de caractères manquants
+        found = scan_chars(text, MISSING_CHARS)
+        for pattern in MISSING_CHARS:
+            if pattern in found:
+                count, idx = found[pattern]
                 start = max(0, idx - 20)
                 end = min(len(text), idx + 20)
                 context = text[start:end]
@@ -186,97 +150,44 @@ class TextCleaner:
         fixed_text = text
         
         # 1. Corriger répétitions excessives
-        fixed_text, rep_corrections = self._fix_repetitions(fixed_text)
+        fixed_text, rep_corrections = self._fix_repetitions(fixed_text, lang)
         corrections.extend(rep_corrections)
         
         # 2. Corriger caractères CID
         if lang in ['zh', 'ja', 'ko']:
-            fixed_text, cid_corrections = self._fix_cid_chars(fixed_text)
+            fixed_text, cid_corrections = self._fix_cid_chars(fixed_text, lang)
             corrections.extend(cid_corrections)
         
         return fixed_text, corrections
     
-    def _fix_repetitions(self, text: str) -> Tuple[str, List[str]]:
+    def _fix_repetitions(self, text: str, lang: str = '') -> Tuple[str, List[str]]:
         """Corrige les répétitions excessives EN PRÉSERVANT LA MISE EN FORME"""
         corrections = []
         
-        # Travailler ligne par ligne pour préserver les sauts de ligne
-        lines = text.split('\n')
-        fixed_lines = []
+        # Une seule occurrence conservée ; espaces et sauts de ligne intacts
+        fixed_text, removed = self.repetitions.clean(text, lang)
+        for repetition in removed:
+            correction = f'Répétition excessive "{repetition["unit"]}" ({repetition["count"]}x) → réduite à 1x'
+            if correction not in corrections:  # Éviter doublons
+                corrections.append(correction)
         
-        for line in lines:
-            if not line.strip():
-                # Ligne vide : conserver telle quelle
-                fixed_lines.append(line)
-                continue
-            
-            # Traiter la ligne
-            words = line.split()
-            fixed_words = []
-            i = 0
-            
-            while i < len(words):
-                current_word = words[i]
-                repetition_count = 1
-                
-                # Compter répétitions consécutives
-                while i + repetition_count < len(words) and words[i + repetition_count] == current_word:
-                    repetition_count += 1
-                
-                if repetition_count > self.max_repetition_threshold:
-                    # Garder seulement 1 occurrence
-                    fixed_words.append(current_word)
-                    if len(corrections) == 0 or current_word not in corrections[-1]:  # Éviter doublons
-                        corrections.append(
-                            f'Répétition excessive "{current_word}" ({repetition_count}x) → réduite à 1x'
-                        )
-                    i += repetition_count
-                else:
-                    # Garder toutes les occurrences (répétition normale)
-                    for _ in range(repetition_count):
-                        fixed_words.append(current_word)
-                    i += repetition_count
-            
-            # Reconstruire la ligne avec les espaces d'origine préservés autant que possible
-            fixed_line = ' '.join(fixed_words)
-            fixed_lines.append(fixed_line)
-        
-        # Reconstruire le texte avec les sauts de ligne originaux
-        fixed_text = '\n'.join(fixed_lines)
         return fixed_text, corrections
     
-    def _fix_cid_chars(self, text: str) -> Tuple[str, List[str]]:
+    def _fix_cid_chars(self, text: str, lang: str = 'zh') -> Tuple[str, List[str]]:
         """Corrige les caractères incompatibles CID (PRÉSERVE MISE EN FORME)"""
         corrections = []
-        fixed_text = text
         
-        # Remplacements simples qui préservent la structure
-        replacements = {
-            '·': ' ',
-            '•': ' ',
-            '–': '-',
-            '—': '-',
-            ''': "'",
-            ''': "'",
-            '"': '"',
-            '"': '"',
-            '…': '...',
-            '€': 'EUR',
-            '£': 'GBP',
-            '§': '',
-            '©': '(C)',
-            '®': '(R)',
-            '™': '(TM)',
-        }
-        
-        # Simple remplacement caractère par caractère
+        # Un passage pour compter, un passage str.translate pour remplacer
         # Ne touche PAS aux sauts de ligne, tabs, ou espaces multiples
-        for old_char, new_char in replacements.items():
-            if old_char in fixed_text:
-                count = fixed_text.count(old_char)
-                fixed_text = fixed_text.replace(old_char, new_char)
+        found = scan_chars(text, CID_REPLACEMENTS)
+        if not found:
+            return text, corrections
+        fixed_text = normalize(text, lang)
+        
+        for char, (replacement, _) in CID_REPLACEMENTS.items():
+            if char in found:
                 corrections.append(
-                    f'Caractère "{old_char}" ({count}x) → remplacé par "{new_char}"'
+                    f'Caractère "{char}" ({found[char][0]}x) → remplacé par "{replacement}"'
                 )
         
         return fixed_text, corrections
@@ -0,0 +1,61 @@
+"""
+Translation Config - Réglages du moteur de traduction (data/translation_config.json)
+"""
+import json
+from pathlib import Path
+from typing import Dict
+
+CONFIG_FILE = Path(__file__).parent.parent / "data" / "translation_config.json"
+
+# Valeurs par défaut (complétées par le fichier de configuration s'il existe)
+DEFAULT_CONFIG = {
+    'workers': 1,               # Processus de traduction (1 = dans le processus de l'application)
+    'threads_per_worker': 1,    # Threads CTranslate2 par processus
+    'inter_threads': 1,         # CTranslate2 : traductions simultanées par modèle
+    'intra_threads': 0,         # CTranslate2 : threads par traduction (0 = automatique)
+    'compute_type': 'int8',     # CTranslate2 : 'int8' (rapide) ou 'float32' (précis)
+    'beam_size': 4,             # Largeur du faisceau de décodage (1 = glouton)
+    'adaptive_decoding': True,  # 1er jet glouton, faisceau large seulement si TextCleaner détecte une erreur
+    'draft_beam_size': 1,       # Faisceau du premier jet (décodage adaptatif)
+    'repetition_penalty': 1.2,  # Rattrapage : pénalité des tokens déjà produits
+    'no_repeat_ngram_size': 3,  # Rattrapage : interdit de répéter un n-gramme de cette taille
+    'max_batch_tokens': 2048,   # Taille max d'un lot envoyé au modèle (en tokens)
+    'model_memory_mb': 1024,    # Budget mémoire des modèles chargés, LRU au-delà (0 = illimité)
+    'warm_up': True,            # Préchauffer les modèles en arrière-plan après l'ouverture
+    'warm_up_langs': 3,         # Nombre de langues cibles préchauffées (les plus traduites du livre)
+    'segmenter': 'rules',       # 'rules' (découpage intégré) ou 'stanza' (découpage Argos)
+    'classify_segments': True,  # Ne pas traduire URL, nombres, code, listes de noms ; anglais cité sans pivot
+    'daemon': False,            # Utiliser le démon de traduction local s'il tourne
+    'daemon_port': 47615,       # Port localhost du démon (python -m core.translation_daemon)
+    'daemon_timeout': 120,      # Secondes sans réponse du démon avant le repli local
+    'farm': False,              # Coordinateur : répartir "Tout traduire" sur des machines travailleuses
+    'farm_host': '127.0.0.1',   # Interface d'écoute du coordinateur ('0.0.0.0' = exposer au réseau)
+    'farm_port': 47616,         # Port TCP du coordinateur (python -m core.translation_farm worker HOTE)
+    'farm_job_timeout': 600,    # Secondes avant de redonner un travail sans réponse
+    'farm_idle_timeout': 120,   # Secondes sans travailleur capable avant d'abandonner un travail
+    'live_translation': False,  # Traduire au repos les paragraphes stables pendant l'écriture
+    'live_translation_delay': 5,  # Secondes sans modification avant de traduire un paragraphe
+    'live_translation_langs': [],  # Langues de la traduction en direct ([] = langues déjà traduites du livre)
+}
+
+def load_translation_config() -> Dict:
+    """Charge la configuration de traduction (valeurs par défaut si absente)"""
+    config = dict(DEFAULT_CONFIG)
+    try:
+        if CONFIG_FILE.exists():
+            with open(CONFIG_FILE, 'r', encoding='utf-8') as f:
+                config.update(json.load(f))
+    except Exception as e:
+        print(f"[!] Erreur chargement configuration traduction : {e}")
+    return config
+
+def save_translation_config(config: Dict) -> bool:
+    """Sauvegarde la configuration de traduction"""
+    try:
+        CONFIG_FILE.parent.mkdir(parents=True, exist_ok=True)
+        with open(CONFIG_FILE, 'w', encoding='utf-8') as f:
+            json.dump(config, f, ensure_ascii=False, indent=2)
+        return True
+    except Exception as e:
+        print(f"[ERREUR] Sauvegarde configuration traduction : {e}")
+        return False
@@ -0,0 +1,227 @@
+"""
+Translation Daemon - Serveur de traduction local (modèles gardés en mémoire)
+Un processus séparé charge les packs Argos une fois pour toutes ; l'application
+et les scripts s'y connectent (localhost + clé d'authentification) au lieu de
+recharger les modèles à chaque lancement. Le travail lourd quitte ainsi le
+processus Tk.
+
+Usage :
+    python -m core.translation_daemon            Démarre le serveur
+    python -m core.translation_daemon --stop     Arrête le serveur
+    python -m core.translation_daemon --status   Affiche l'état du serveur
+"""
+import os
+import sys
+import threading
+from multiprocessing.connection import Client, Listener
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .translation_config import load_translation_config
+
+KEY_FILE = Path(__file__).parent.parent / "data" / "translation_daemon.key"
+
+def load_authkey(create: bool = False) -> Optional[bytes]:
+    """
+    Clé partagée entre le serveur et ses clients (créée par le serveur)
+
+    Les messages sont des objets pickle : qui a la clé peut exécuter du code
+    dans le démon. Le fichier est créé lisible par son seul propriétaire et
+    une clé lisible par d'autres utilisateurs est refusée.
+    """
+    try:
+        if create:
+            KEY_FILE.parent.mkdir(parents=True, exist_ok=True)
+            try:
+                fd = os.open(KEY_FILE, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+            except FileExistsError:
+                pass  # Clé déjà créée : lue ci-dessous
+            else:
+                key = os.urandom(32)
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(key)
+                return key
+        if not KEY_FILE.exists():
+            return None
+        with open(KEY_FILE, 'rb') as f:
+            if os.name == 'posix' and os.fstat(f.fileno()).st_mode & 0o077:
+                print(f"[!] Clé du démon de traduction lisible par d'autres utilisateurs, refusée "
+                      f"(chmod 600 {KEY_FILE})")
+                return None
+            return f.read()
+    except Exception as e:
+        print(f"[!] Clé du démon de traduction illisible : {e}")
+    return None
+
+class DaemonClient:
+    """Connexion à un démon de traduction local"""
+
+    def __init__(self, port: int, authkey: bytes, timeout: float = 2.0, call_timeout: float = 120.0):
+        """
+        Args:
+            timeout: Délai de réponse au ping de connexion (secondes)
+            call_timeout: Délai max d'un appel (secondes) ; au-delà le démon est
+                          considéré comme bloqué
+
+        Raises:
+            ConnectionError / OSError: si le démon ne répond pas
+        """
+        self.port = port
+        self.call_timeout = call_timeout
+        self._lock = threading.Lock()
+        self._conn = Client(('127.0.0.1', port), authkey=authkey)
+        # Vérifier que le démon répond (et n'est pas bloqué)
+        self._conn.send(('ping', ()))
+        if not self._conn.poll(timeout):
+            self._conn.close()
+            raise ConnectionError("Démon de traduction muet")
+        self._conn.recv()
+
+    @staticmethod
+    def connect(port: Optional[int] = None) -> Optional['DaemonClient']:
+        """Se connecte au démon s'il tourne, sinon retourne None"""
+        config = load_translation_config()
+        if port is None:
+            port = int(config.get('daemon_port', 47615))
+        authkey = load_authkey()
+        if authkey is None:
+            return None
+        try:
+            return DaemonClient(port, authkey, call_timeout=float(config.get('daemon_timeout', 120)))
+        except (OSError, EOFError, ConnectionError):
+            return None
+
+    def call(self, method: str, *args):
+        """
+        Appelle une méthode du démon
+
+        Raises:
+            ConnectionError / OSError / EOFError: démon injoignable
+            TimeoutError: pas de réponse en call_timeout (la connexion est fermée)
+            RuntimeError: erreur de traduction côté démon
+        """
+        with self._lock:
+            self._conn.send((method, args))
+            if not self._conn.poll(self.call_timeout):
+                # Une réponse tardive décalerait les suivantes : connexion abandonnée
+                self._conn.close()
+                raise TimeoutError(f"pas de réponse du démon en {self.call_timeout:.0f}s ({method})")
+            status, result = self._conn.recv()
+        if status != 'ok':
+            raise RuntimeError(result)
+        return result
+
+    def close(self):
+        """Ferme la connexion"""
+        try:
+            self._conn.close()
+        except OSError:
+            pass
+
+class TranslationDaemon:
+    """Serveur : un Translator résident partagé par tous les clients"""
+
+    def __init__(self, port: Optional[int] = None):
+        from .translator import Translator
+
+        config = load_translation_config()
+        self.port = int(port or config.get('daemon_port', 47615))
+        # Le démon traduit lui-même : jamais de client vers un autre démon
+        self.translator = Translator(settings={'daemon': False})
+        self._listener = None
+        self._running = False
+
+    def _status(self) -> Dict:
+        """État du traducteur résident (langues, routes, versions des packs)"""
+        return {
+            'pid': os.getpid(),
+            'available': self.translator.available,
+            'installed_languages': sorted(self.translator.installed_languages),
+            'routes': self.translator.routes,
+            'package_versions': [[src, tgt, version] for (src, tgt), version
+                                 in self.translator.package_versions.items()],
+        }
+
+    def _translate_sentences(self, source_lang: str, target_lang: str, sentences: List[str]) -> List[str]:
+        """Traduit des phrases avec le modèle résident de la paire (débit mesuré ici)"""
+        return self.translator._translate_sentences(source_lang, target_lang, sentences)
+
+    def _refresh_routes(self) -> Dict:
+        """Relit les packs installés (après une installation) et renvoie le nouvel état"""
+        self.translator.refresh_routes()
+        return self._status()
+
+    def _handle_client(self, conn):
+        """Répond aux requêtes d'un client jusqu'à sa déconnexion"""
+        methods = {
+            'ping': lambda: 'pong',
+            'status': self._status,
+            'translate_sentences': self._translate_sentences,
+            'refresh_routes': self._refresh_routes,
+            'decoding_stats': self.translator.get_decoding_stats,
+            'residency_stats': self.translator.get_residency_stats,
+        }
+        try:
+            while True:
+                method, args = conn.recv()
+                if method == 'shutdown':
+                    conn.send(('ok', None))
+                    self.stop()
+                    return
+                try:
+                    conn.send(('ok', methods[method](*args)))
+                except Exception as e:
+                    conn.send(('error', f"{type(e).__name__}: {e}"))
+        except (EOFError, OSError):
+            pass
+        finally:
+            conn.close()
+
+    def serve_forever(self):
+        """Accepte les clients (un thread par connexion) jusqu'à l'arrêt"""
+        authkey = load_authkey(create=True)
+        if authkey is None:
+            # Jamais de serveur sans authentification
+            print("[ERREUR] Démon de traduction non démarré : pas de clé d'authentification utilisable")
+            return
+        self._listener = Listener(('127.0.0.1', self.port), authkey=authkey)
+        self._running = True
+        print(f"[OK] Démon de traduction prêt sur 127.0.0.1:{self.port} "
+              f"(langues: {', '.join(sorted(self.translator.installed_languages))})")
+        while self._running:
+            try:
+                conn = self._listener.accept()
+            except Exception as e:
+                if self._running:
+                    print(f"[!] Connexion refusée : {e}")
+                continue
+            threading.Thread(target=self._handle_client, args=(conn,), daemon=True).start()
+
+    def stop(self):
+        """Arrête le serveur"""
+        self._running = False
+        self.translator.route_planner.save()
+        if self._listener is not None:
+            try:
+                # Débloquer accept() avec une dernière connexion
+                Client(('127.0.0.1', self.port), authkey=load_authkey()).close()
+            except Exception:
+                pass
+            self._listener.close()
+
+if __name__ == "__main__":
+    if '--stop' in sys.argv or '--status' in sys.argv:
+        client = DaemonClient.connect()
+        if client is None:
+            print("[!] Aucun démon de traduction en cours")
+            sys.exit(1)
+        if '--stop' in sys.argv:
+            client.call('shutdown')
+            print("[OK] Démon de traduction arrêté")
+        else:
+            status = client.call('status')
+            print(f"[OK] Démon PID {status['pid']} - langues: {', '.join(status['installed_languages'])}")
+        client.close()
+        sys.exit(0)
+
+    TranslationDaemon().serve_forever()
@@ -0,0 +1,292 @@
+"""
+Translation Engine - Traduction parallèle multi-processus
+Chaque processus garde son propre Translator (modèles chargés) et les travaux
+(chapitre, langue) sont ordonnancés du plus long au plus court. Les mêmes
+travaux peuvent aussi partir vers une ferme de machines (translation_farm).
+"""
+import heapq
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .translation_queue import TranslationQueue
+from .translator import Translator
+
+# Translator propre à chaque processus de travail (créé une seule fois)
+_worker_translator: Optional[Translator] = None
+
+def _init_worker(threads_per_worker: int, model_memory_mb: float = 0):
+    """Initialise un processus de travail : budget de threads et de mémoire, puis modèles"""
+    global _worker_translator
+    # Lu par argostranslate/CTranslate2 à l'import : doit précéder Translator()
+    os.environ['ARGOS_INTER_THREADS'] = '1'
+    os.environ['ARGOS_INTRA_THREADS'] = str(threads_per_worker)
+    os.environ['OMP_NUM_THREADS'] = str(threads_per_worker)
+    _worker_translator = Translator(settings={'inter_threads': 1,
+                                              'intra_threads': threads_per_worker,
+                                              'model_memory_mb': model_memory_mb,
+                                              'daemon': False})
+
+def _run_job(hops: List[str], paragraphs: List[str]) -> Tuple[List[str], int, Dict]:
+    """
+    Exécute un travail dans un processus de travail (pivot FR -> EN ou route vers une cible)
+
+    La route est choisie par le processus principal : un processus de travail
+    démarré plus tard pourrait avoir mesuré d'autres débits.
+    """
+    lines, stats = _worker_translator.translate_job(paragraphs, hops)
+    return lines, os.getpid(), stats
+
+class TranslationEngine:
+    """Répartit la traduction d'un livre sur un pool de processus"""
+
+    def __init__(self, translator: Translator, workers: int = 1, threads_per_worker: int = 1,
+                 queue: Optional[TranslationQueue] = None, farm=None):
+        """
+        Args:
+            translator: Translator du processus principal (planification, repli séquentiel)
+            workers: Nombre de processus de traduction (1 = séquentiel, sans pool)
+            threads_per_worker: Threads de calcul alloués à chaque processus
+            queue: File persistante où chaque résultat est enregistré dès qu'il est prêt
+                   (None = pas de reprise possible après interruption)
+            farm: FarmCoordinator démarré : les travaux partent vers les machines
+                  de la ferme au lieu du pool de processus local
+        """
+        self.translator = translator
+        self.queue = queue
+        self.farm = farm
+        self.workers = max(1, int(workers))
+        self.threads_per_worker = max(1, int(threads_per_worker))
+        self._pool = None
+        self._lock = threading.Lock()
+        self._worker_stats: Dict = {}  # PID ou travailleur de la ferme -> stats de décodage cumulées
+        self._runs = 0                 # translate_book en cours (voir is_busy)
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        """Crée le pool à la première utilisation puis le garde (modèles chauds)"""
+        with self._lock:
+            if self._pool is None:
+                # Le budget mémoire des modèles est partagé entre les processus
+                budget = float(self.translator.settings.get('model_memory_mb', 0) or 0)
+                self._pool = ProcessPoolExecutor(max_workers=self.workers,
+                                                 initializer=_init_worker,
+                                                 initargs=(self.threads_per_worker,
+                                                           budget / self.workers))
+            return self._pool
+
+    def shutdown(self):
+        """Arrête les processus de traduction"""
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = None
+
+    def is_busy(self) -> bool:
+        """Vrai pendant une traduction de livre (pool local, ferme ou repli séquentiel)"""
+        return self._runs > 0
+
+    def get_decoding_stats(self) -> Dict[str, float]:
+        """Statistiques du décodage adaptatif (processus principal + processus de travail)"""
+        all_stats = [self.translator.get_decoding_stats()] + list(self._worker_stats.values())
+        segments = sum(stats['segments'] for stats in all_stats)
+        retranslated = sum(stats['retranslated'] for stats in all_stats)
+        return {
+            'segments': segments,
+            'retranslated': retranslated,
+            'slow_fraction': retranslated / segments if segments else 0.0
+        }
+
+    def _report_decoding_stats(self):
+        """Affiche la part des phrases passées par le décodage lent"""
+        stats = self.get_decoding_stats()
+        if stats['segments']:
+            print(f"[OK] Décodage adaptatif : {stats['retranslated']}/{stats['segments']} phrases "
+                  f"retraduites en faisceau large ({stats['slow_fraction']:.1%}, cumul de la session)")
+
+    def translate_book(self, chapters: List, target_langs: List[str],
+                       progress_callback: Optional[Callable[[int, int], None]] = None,
+                       result_callback: Optional[Callable] = None, book_id: str = '') -> Dict[str, int]:
+        """
+        Traduit (incrémentalement) tous les chapitres vers les langues demandées
+
+        Les résultats sont enregistrés dans chaque Chapter (set_translation) au fil
+        de l'eau, dans le processus principal, et dans la file persistante si elle
+        existe. Les résultats d'une exécution interrompue sont d'abord réappliqués :
+        seuls les travaux restants sont recalculés.
+
+        Args:
+            progress_callback: Appelé avec (chapitres terminés, total chapitres)
+            result_callback: Appelé avec (chapitre, langue) dès qu'une traduction est enregistrée
+            book_id: Livre traduit (clé de la file persistante, voir BookManager.get_book_key)
+
+        Returns:
+            Dict langue -> nombre de paragraphes traduits
+        """
+        with self._lock:
+            self._runs += 1
+        try:
+            return self._translate_book(chapters, target_langs, progress_callback, result_callback, book_id)
+        finally:
+            with self._lock:
+                self._runs -= 1
+
+    def _translate_book(self, chapters: List, target_langs: List[str],
+                        progress_callback: Optional[Callable[[int, int], None]],
+                        result_callback: Optional[Callable], book_id: str) -> Dict[str, int]:
+        """Traduction du livre (voir translate_book)"""
+        counts = {lang: 0 for lang in ['en'] + list(target_langs)}
+        todo = [chapter for chapter in chapters if chapter.content_fr.strip()]
+        total = len(todo)
+
+        if self.queue is not None:
+            restored = self.queue.restore(todo, book_id)
+            if restored:
+                print(f"[OK] Reprise : {restored} traduction(s) déjà terminée(s) réappliquée(s)")
+            pivot = ['en'] if self.translator.needs_pivot(target_langs) else []
+            self.queue.enqueue(todo, pivot + [lang for lang in target_langs if lang != 'en'], book_id)
+            user_callback = result_callback
+
+            def result_callback(chapter, lang):
+                self.queue.checkpoint(chapter, lang, book_id)
+                if user_callback:
+                    user_callback(chapter, lang)
+
+        # Repli séquentiel (un seul processus ou traducteur indisponible)
+        if self.farm is None and (self.workers <= 1 or not self.translator.available):
+            for done, chapter in enumerate(todo, 1):
+                # Chaque (chapitre, langue) est enregistré dès qu'il est terminé
+                stored = (lambda lang, chapter=chapter: result_callback(chapter, lang)) if result_callback else None
+                for lang, count in self.translator.translate_chapter_to_many(
+                        chapter, target_langs, result_callback=stored).items():
+                    counts[lang] = counts.get(lang, 0) + count
+                if progress_callback:
+                    progress_callback(done, total)
+            self._report_decoding_stats()
+            return counts
+
+        try:
+            counts = self._translate_book_parallel(todo, target_langs, counts,
+                                                   progress_callback, result_callback)
+            self._report_decoding_stats()
+            return counts
+        except BrokenProcessPool:
+            # Un processus est mort (mémoire, plantage modèle) : repartir d'un pool neuf
+            self.shutdown()
+            raise
+
+    def _translate_book_parallel(self, todo: List, target_langs: List[str], counts: Dict[str, int],
+                                 progress_callback: Optional[Callable[[int, int], None]],
+                                 result_callback: Optional[Callable]) -> Dict[str, int]:
+        """Traduction via le pool de processus (voir translate_book)"""
+        total = len(todo)
+        pool = self._get_pool() if self.farm is None else None
+        plans = {}
+        outstanding = {}
+        ready = []          # Tas (-taille, ordre, index chapitre, langue, paragraphes)
+        sequence = [0]
+        finished = [0]
+        skipped = {index: 0 for index in range(total)}  # Tokens non envoyés au modèle par chapitre
+
+        def push(index, lang, paragraphs):
+            size = sum(len(paragraph) for paragraph in paragraphs)
+            heapq.heappush(ready, (-size, sequence[0], index, lang, paragraphs))
+            sequence[0] += 1
+            outstanding[index] += 1
+
+        def stored(index, lang):
+            if result_callback:
+                result_callback(todo[index], lang)
+
+        def chapter_job_done(index):
+            outstanding[index] -= 1
+            if outstanding[index] == 0:
+                finished[0] += 1
+                self.translator._report_chapter_skips(todo[index], skipped[index])
+                if progress_callback:
+                    progress_callback(finished[0], total)
+
+        def start_langs(index, source_lang):
+            # Lancer les langues cibles dont la route part de source_lang
+            chapter, plan = todo[index], plans[index]
+            for lang in plan['langs']:
+                if plan['sources'][lang] != source_lang:
+                    continue
+                if lang not in self.translator.installed_languages:
+                    chapter.set_translation(lang, f"[Langue {lang.upper()} non installee]")
+                    stored(index, lang)
+                elif plan['missing'][lang]:
+                    push(index, lang, self.translator.plan_inputs(plan, lang, plan['missing'][lang]))
+                else:
+                    self.translator.store_plan_result(chapter, plan, lang, {})
+                    stored(index, lang)
+
+        def pivot_ready(index):
+            # Le pivot EN est complet : l'enregistrer et lancer les langues qui en partent
+            chapter, plan = todo[index], plans[index]
+            self.translator.store_plan_result(chapter, plan, 'en', plan['pivot'])
+            counts['en'] += len(plan['pivot_needed'])
+            stored(index, 'en')
+            start_langs(index, 'en')
+
+        for index, chapter in enumerate(todo):
+            plan = self.translator.plan_chapter(chapter, target_langs)
+            plans[index] = plan
+            # +1 : le travail en cours de planification, libéré ci-dessous
+            outstanding[index] = 1
+            # Routes directes FR -> X : indépendantes du pivot
+            start_langs(index, 'fr')
+            if plan['pivot_needed']:
+                push(index, 'en', [plan['paragraphs'][i] for i in plan['pivot_needed']])
+            elif plan['pivot_used']:
+                pivot_ready(index)
+            chapter_job_done(index)
+
+        in_flight = {}
+        while ready or in_flight:
+            # Toujours soumettre le plus long travail prêt dès qu'un processus est libre
+            capacity = self.workers if self.farm is None else self.farm.capacity()
+            while ready and len(in_flight) < capacity:
+                _, _, index, lang, paragraphs = heapq.heappop(ready)
+                source_lang = 'fr' if lang == 'en' else plans[index]['sources'][lang]
+                hops = self.translator.get_hops(source_lang, lang, target_langs)
+                if self.farm is not None:
+                    future = self.farm.submit(hops, paragraphs)
+                else:
+                    future = pool.submit(_run_job, hops, paragraphs)
+                in_flight[future] = (index, lang)
+
+            # Délai : la capacité de la ferme change quand des travailleurs arrivent
+            done, _ = wait(in_flight, timeout=1.0, return_when=FIRST_COMPLETED)
+            for future in done:
+                index, lang = in_flight.pop(future)
+                chapter, plan = todo[index], plans[index]
+                try:
+                    lines, worker, stats = future.result()
+                    self._worker_stats[worker] = stats
+                    skipped[index] += stats.get('skipped_tokens', 0)
+                except Exception as e:
+                    error = f"[Erreur traduction {lang.upper()}: {str(e)[:50]}]"
+                    if lang == 'en':
+                        # Le pivot manque : les langues qui en dépendent échouent aussi
+                        failed_langs = ['en'] + [l for l in plan['langs'] if plan['sources'][l] == 'en']
+                    else:
+                        failed_langs = [lang]
+                    for failed_lang in failed_langs:
+                        chapter.set_translation(failed_lang, error)
+                        stored(index, failed_lang)
+                    chapter_job_done(index)
+                    continue
+
+                if lang == 'en':
+                    plan['pivot'].update(zip(plan['pivot_needed'], lines))
+                    pivot_ready(index)
+                else:
+                    self.translator.store_plan_result(chapter, plan, lang,
+                                                      dict(zip(plan['missing'][lang], lines)))
+                    counts[lang] += len(plan['missing'][lang])
+                    stored(index, lang)
+                chapter_job_done(index)
+
+        return counts
@@ -0,0 +1,395 @@
+"""
+Translation Farm - Traduction répartie sur plusieurs machines
+Le coordinateur (l'application) distribue des travaux (lot de paragraphes,
+route de langues) ; des travailleurs sur d'autres machines s'enregistrent en
+TCP et les tirent un par un. Un travail perdu (machine coupée, délai dépassé)
+est redonné à un autre travailleur.
+
+Le coordinateur s'utilise comme exécuteur du TranslationEngine : la
+planification, la fusion dans Chapter.translations et la reprise restent les
+mêmes que pour le pool de processus local.
+
+Par défaut le coordinateur n'écoute que sur 127.0.0.1 : pour accepter des
+machines du réseau, régler farm_host (ex. '0.0.0.0') dans la configuration.
+
+Sécurité : les messages sont des objets pickle, la clé est la seule
+protection. Une clé divulguée permet d'exécuter du code à distance sur le
+coordinateur comme sur les travailleurs. data/translation_farm.key est créé
+lisible par son seul propriétaire (une clé lisible par d'autres est refusée) ;
+la transmettre aux travailleurs par un canal sûr et n'ouvrir le port que sur
+un réseau de confiance (pas de chiffrement).
+
+Usage (travailleur) :
+    python -m core.translation_farm key                              Affiche la clé du coordinateur
+    python -m core.translation_farm worker HOTE[:PORT] --key CLE [--workers N] [--threads N]
+"""
+import itertools
+import os
+import socket
+import sys
+import threading
+import time
+from concurrent.futures import Future
+from multiprocessing.connection import Client, Listener
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .translation_config import load_translation_config
+
+KEY_FILE = Path(__file__).parent.parent / "data" / "translation_farm.key"
+
+# Nombre max de tentatives d'un travail (travailleurs perdus ou en erreur)
+MAX_ATTEMPTS = 3
+
+# Attente max d'un travail côté travailleur avant de redemander
+PULL_WAIT = 5.0
+
+# Intervalle de vérification des travaux sans travailleur capable (secondes)
+WATCH_INTERVAL = 1.0
+
+def load_farm_key(create: bool = False) -> Optional[bytes]:
+    """
+    Clé d'authentification des travailleurs (créée par le coordinateur)
+
+    Créée lisible par son seul propriétaire ; une clé lisible par le groupe ou
+    les autres utilisateurs est refusée (voir Sécurité en tête du module).
+    """
+    try:
+        if create:
+            KEY_FILE.parent.mkdir(parents=True, exist_ok=True)
+            try:
+                fd = os.open(KEY_FILE, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+            except FileExistsError:
+                pass  # Clé déjà créée : lue ci-dessous
+            else:
+                key = os.urandom(32)
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(key)
+                return key
+        if not KEY_FILE.exists():
+            return None
+        with open(KEY_FILE, 'rb') as f:
+            if os.name == 'posix' and os.fstat(f.fileno()).st_mode & 0o077:
+                print(f"[!] Clé de la ferme de traduction lisible par d'autres utilisateurs, refusée "
+                      f"(chmod 600 {KEY_FILE})")
+                return None
+            return f.read()
+    except Exception as e:
+        print(f"[!] Clé de la ferme de traduction illisible : {e}")
+    return None
+
+class FarmJob:
+    """Un lot de paragraphes à traduire le long d'une route"""
+
+    def __init__(self, job_id: int, hops: List[str], paragraphs: List[str]):
+        self.id = job_id
+        self.hops = hops
+        self.paragraphs = paragraphs
+        self.pairs = set(zip(hops, hops[1:]))
+        self.attempts = 0
+        self.excluded = set()       # Travailleurs ayant échoué sur ce travail
+        self.idle_since = None      # Début de l'attente sans travailleur capable
+        self.future = Future()
+
+class FarmCoordinator:
+    """Distribue les travaux aux travailleurs connectés et récupère les résultats"""
+
+    def __init__(self, host: Optional[str] = None, port: Optional[int] = None,
+                 job_timeout: Optional[float] = None, idle_timeout: Optional[float] = None,
+                 authkey: Optional[bytes] = None):
+        """
+        Args:
+            host: Interface d'écoute (défaut: farm_host, '127.0.0.1' = cette machine seulement ;
+                  '0.0.0.0' expose le coordinateur à tout le réseau)
+            port: Port TCP (défaut: farm_port ; 0 = port libre choisi par le système)
+            job_timeout: Délai max d'un travail avant de le redonner (secondes)
+            idle_timeout: Délai max d'un travail sans aucun travailleur connecté
+                          capable de le traiter avant de le déclarer en échec (secondes)
+            authkey: Clé des travailleurs (défaut: data/translation_farm.key, créée si absente)
+        """
+        config = load_translation_config()
+        self.host = host or config.get('farm_host', '127.0.0.1')
+        self.port = int(config.get('farm_port', 47616) if port is None else port)
+        self.job_timeout = float(job_timeout or config.get('farm_job_timeout', 600))
+        self.idle_timeout = float(idle_timeout or config.get('farm_idle_timeout', 120))
+        self.authkey = authkey or load_farm_key(create=True)
+
+        self._pending: List[FarmJob] = []
+        self._active: Dict[int, FarmJob] = {}   # Travaux envoyés à un travailleur
+        self._workers: Dict[str, Dict] = {}
+        self._condition = threading.Condition()
+        self._ids = itertools.count(1)
+        self._connections = itertools.count(1)
+        self._listener = None
+        self._running = False
+
+        # Statistiques
+        self.completed = 0
+        self.retries = 0
+        self.lost_workers = 0
+
+    def start(self):
+        """Ouvre le port et accepte les travailleurs en arrière-plan"""
+        if not self.authkey:
+            # Jamais de port ouvert sans authentification
+            raise RuntimeError("pas de clé d'authentification utilisable (data/translation_farm.key)")
+        self._listener = Listener((self.host, self.port), authkey=self.authkey)
+        self.port = self._listener.address[1]
+        self._running = True
+        threading.Thread(target=self._accept_loop, daemon=True).start()
+        threading.Thread(target=self._watch_loop, daemon=True).start()
+        print(f"[OK] Ferme de traduction à l'écoute sur {self.host}:{self.port}")
+
+    def _accept_loop(self):
+        while self._running:
+            try:
+                conn = self._listener.accept()
+            except Exception as e:
+                if self._running:
+                    print(f"[!] Travailleur refusé : {e}")
+                continue
+            threading.Thread(target=self._serve_worker, args=(conn,), daemon=True).start()
+
+    def _watch_loop(self):
+        """Fait échouer les travaux restés idle_timeout sans travailleur capable"""
+        with self._condition:
+            while self._running:
+                now = time.time()
+                for job in list(self._pending):
+                    capable = any(w not in job.excluded and job.pairs <= info['pairs']
+                                  for w, info in self._workers.items())
+                    if capable:
+                        job.idle_since = None
+                    elif job.idle_since is None:
+                        job.idle_since = now
+                    elif now - job.idle_since >= self.idle_timeout:
+                        self._pending.remove(job)
+                        self._resolve(job, error=RuntimeError(
+                            f"aucun travailleur capable ({'->'.join(job.hops)}) "
+                            f"depuis {self.idle_timeout:.0f}s"))
+                self._condition.wait(WATCH_INTERVAL)
+
+    def _resolve(self, job: FarmJob, result=None, error: Optional[Exception] = None):
+        """Termine le Future d'un travail (verrou pris ; ignoré s'il est déjà annulé)"""
+        self._active.pop(job.id, None)
+        if job.future.done():
+            return
+        if error is not None:
+            job.future.set_exception(error)
+        else:
+            job.future.set_result(result)
+
+    def submit(self, hops: List[str], paragraphs: List[str]) -> Future:
+        """
+        Ajoute un travail
+
+        Returns:
+            Future résolu avec (lignes traduites, identifiant travailleur, stats de décodage)
+        """
+        job = FarmJob(next(self._ids), hops, paragraphs)
+        with self._condition:
+            self._pending.append(job)
+            self._condition.notify_all()
+        return job.future
+
+    def capacity(self) -> int:
+        """Travaux à garder en circulation : un en cours et un d'avance par travailleur"""
+        with self._condition:
+            return max(1, 2 * len(self._workers))
+
+    def _next_job(self, worker_id: str, pairs: set) -> Optional[FarmJob]:
+        """Premier travail que ce travailleur sait faire (attend PULL_WAIT au plus)"""
+        deadline = time.time() + PULL_WAIT
+        with self._condition:
+            while self._running:
+                for job in self._pending:
+                    if worker_id not in job.excluded and job.pairs <= pairs:
+                        self._pending.remove(job)
+                        self._active[job.id] = job
+                        job.attempts += 1
+                        return job
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    return None
+                self._condition.wait(remaining)
+        return None
+
+    def _retry(self, job: FarmJob, worker_id: str, reason: str):
+        """
+        Redonne un travail à un autre travailleur, ou le déclare en échec
+
+        Sans travailleur capable, le travail attend qu'il s'en connecte un :
+        _watch_loop le fait échouer après idle_timeout.
+        """
+        with self._condition:
+            job.excluded.add(worker_id)
+            self._active.pop(job.id, None)
+            if job.future.done():
+                return  # Annulé par shutdown()
+            if job.attempts >= MAX_ATTEMPTS or not self._running:
+                self._resolve(job, error=RuntimeError(f"Travail abandonné ({reason})"))
+                return
+            self.retries += 1
+            job.idle_since = None
+            self._pending.insert(0, job)
+            self._condition.notify_all()
+
+    def _serve_worker(self, conn):
+        """Dialogue avec un travailleur : enregistrement puis travaux tirés un par un"""
+        worker_id = None
+        job = None
+        try:
+            kind, info = conn.recv()
+            if kind != 'register':
+                return
+            # Le compteur distingue les reconnexions (et les PID réutilisés)
+            worker_id = f"{info['host']}:{info['pid']}#{next(self._connections)}"
+            with self._condition:
+                self._workers[worker_id] = {'pairs': {tuple(p) for p in info['pairs']},
+                                            'since': time.time(), 'done': 0}
+                self._condition.notify_all()
+            print(f"[OK] Travailleur connecté : {worker_id} ({len(info['pairs'])} packs)")
+
+            while self._running:
+                request = conn.recv()
+                if request[0] != 'pull':
+                    continue
+                job = self._next_job(worker_id, self._workers[worker_id]['pairs'])
+                if job is None:
+                    conn.send(('wait', None))
+                    continue
+
+                conn.send(('job', job.id, job.hops, job.paragraphs))
+                if not conn.poll(self.job_timeout):
+                    raise TimeoutError(f"pas de réponse en {self.job_timeout:.0f}s")
+                reply = conn.recv()
+                if reply[0] == 'result':
+                    _, _, lines, stats = reply
+                    with self._condition:
+                        self._resolve(job, result=(lines, worker_id, stats))
+                        self.completed += 1
+                        self._workers[worker_id]['done'] += 1
+                else:
+                    self._retry(job, worker_id, reply[2])
+                job = None
+        except (EOFError, OSError, TimeoutError) as e:
+            if worker_id:
+                print(f"[!] Travailleur perdu : {worker_id} ({e or type(e).__name__})")
+                self.lost_workers += 1
+        finally:
+            conn.close()
+            if worker_id:
+                with self._condition:
+                    self._workers.pop(worker_id, None)
+            if job is not None and not job.future.done():
+                self._retry(job, worker_id, "travailleur perdu")
+
+    def get_stats(self) -> Dict:
+        """Travailleurs connectés et compteurs"""
+        with self._condition:
+            return {
+                'workers': {w: info['done'] for w, info in self._workers.items()},
+                'pending': len(self._pending),
+                'completed': self.completed,
+                'retries': self.retries,
+                'lost_workers': self.lost_workers
+            }
+
+    def shutdown(self):
+        """Arrête le coordinateur (les travaux en attente ou en cours sont annulés)"""
+        self._running = False
+        with self._condition:
+            for job in self._pending + list(self._active.values()):
+                job.future.cancel()
+            self._pending = []
+            self._active = {}
+            self._condition.notify_all()
+        if self._listener is not None:
+            self._listener.close()
+
+class FarmWorker:
+    """Travailleur : traduit avec son propre Translator les travaux du coordinateur"""
+
+    def __init__(self, host: str, port: int, authkey: bytes, threads: int = 0, translator=None):
+        """
+        Args:
+            translator: Traducteur à utiliser (défaut: Translator local, modèles installés)
+        """
+        self.address = (host, port)
+        self.authkey = authkey
+        if translator is None:
+            from .translator import Translator
+            translator = Translator(settings={'daemon': False, 'intra_threads': threads})
+        self.translator = translator
+
+    def run(self, retry_delay: float = 5.0):
+        """Tire et traduit des travaux jusqu'à l'arrêt (reconnexion automatique)"""
+        pairs = [list(pair) for pair in self.translator.package_versions]
+        while True:
+            try:
+                conn = Client(self.address, authkey=self.authkey)
+            except OSError as e:
+                print(f"[!] Coordinateur injoignable ({e}), nouvel essai dans {retry_delay:.0f}s")
+                time.sleep(retry_delay)
+                continue
+
+            try:
+                conn.send(('register', {'host': socket.gethostname(), 'pid': os.getpid(), 'pairs': pairs}))
+                print(f"[OK] Connecté au coordinateur {self.address[0]}:{self.address[1]}")
+                while True:
+                    conn.send(('pull', None))
+                    message = conn.recv()
+                    if message[0] != 'job':
+                        continue
+                    _, job_id, hops, paragraphs = message
+                    try:
+                        lines, stats = self.translator.translate_job(paragraphs, hops)
+                        conn.send(('result', job_id, lines, stats))
+                    except Exception as e:
+                        conn.send(('error', job_id, f"{type(e).__name__}: {str(e)[:200]}"))
+            except (EOFError, OSError) as e:
+                print(f"[!] Connexion perdue ({e}), reconnexion...")
+                conn.close()
+                time.sleep(retry_delay)
+
+def _run_worker(host: str, port: int, authkey: bytes, threads: int):
+    """Point d'entrée d'un processus travailleur local"""
+    FarmWorker(host, port, authkey, threads).run()
+
+if __name__ == "__main__":
+    if len(sys.argv) >= 2 and sys.argv[1] == 'key':
+        key = load_farm_key(create=True)
+        if key is None:
+            sys.exit(1)
+        print(key.hex())
+        sys.exit(0)
+
+    if len(sys.argv) < 3 or sys.argv[1] != 'worker':
+        print(__doc__)
+        sys.exit(1)
+
+    def option(name, default):
+        return sys.argv[sys.argv.index(name) + 1] if name in sys.argv else default
+
+    address = sys.argv[2]
+    worker_host, _, worker_port = address.partition(':')
+    worker_port = int(worker_port or load_translation_config().get('farm_port', 47616))
+    worker_key = option('--key', None)
+    worker_key = bytes.fromhex(worker_key) if worker_key else load_farm_key()
+    if worker_key is None:
+        print("[!] Clé requise : --key (python -m core.translation_farm key sur le coordinateur)")
+        sys.exit(1)
+    count = int(option('--workers', 1))
+    threads = int(option('--threads', 0))
+
+    if count <= 1:
+        _run_worker(worker_host, worker_port, worker_key, threads)
+    else:
+        import multiprocessing
+        processes = [multiprocessing.Process(target=_run_worker,
+                                             args=(worker_host, worker_port, worker_key, threads))
+                     for _ in range(count)]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
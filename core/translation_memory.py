@@ -0,0 +1,196 @@
+"""
+Translation Memory - Mémoire de traduction persistante (SQLite)
+Chaque phrase déjà traduite est retrouvée sur disque au lieu de repasser par Argos
+"""
+import hashlib
+import sqlite3
+import threading
+import time
+import unicodedata
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+# Recompte réel de la table toutes les N phrases ajoutées (autres processus sur la même base)
+RECOUNT_INTERVAL = 10000
+
+class TranslationMemory:
+    """Cache disque des traductions, phrase par phrase, avec éviction LRU"""
+
+    def __init__(self, db_path: Optional[Path] = None, max_entries: int = 500000):
+        """
+        Args:
+            db_path: Fichier SQLite (défaut: data/translation_memory.db)
+            max_entries: Nombre max de phrases conservées avant éviction
+        """
+        if db_path is None:
+            db_path = Path(__file__).parent.parent / "data" / "translation_memory.db"
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+
+        # Compteurs de session
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        # Nombre de phrases en base, tenu à jour sans COUNT(*) (None = pas encore compté)
+        self._entries: Optional[int] = None
+        self._added_since_count = 0
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS memory ("
+            " key TEXT PRIMARY KEY,"
+            " source_lang TEXT NOT NULL,"
+            " target_lang TEXT NOT NULL,"
+            " translation TEXT NOT NULL,"
+            " last_used REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_memory_last_used ON memory(last_used)")
+        self._conn.commit()
+
+    @staticmethod
+    def normalize(sentence: str) -> str:
+        """Normalise une phrase (Unicode NFC + espaces compactés)"""
+        return ' '.join(unicodedata.normalize('NFC', sentence).split())
+
+    @staticmethod
+    def make_key(sentence: str, source_lang: str, target_lang: str, version: str = "") -> str:
+        """Clé unique : phrase normalisée + paire de langues + version du pack"""
+        raw = f"{source_lang}\x1f{target_lang}\x1f{version}\x1f{TranslationMemory.normalize(sentence)}"
+        return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+    def get_many(self, sentences: Iterable[str], source_lang: str, target_lang: str,
+                 version: str = "") -> Dict[str, str]:
+        """
+        Recherche plusieurs phrases dans la mémoire
+
+        Returns:
+            Dict phrase normalisée -> traduction (uniquement les phrases trouvées)
+        """
+        keys = {}
+        for sentence in sentences:
+            normalized = self.normalize(sentence)
+            if normalized:
+                keys[self.make_key(normalized, source_lang, target_lang, version)] = normalized
+
+        if not keys:
+            return {}
+
+        found = {}
+        key_list = list(keys)
+        with self._lock:
+            # SQLite limite le nombre de paramètres par requête
+            for start in range(0, len(key_list), 500):
+                chunk = key_list[start:start + 500]
+                placeholders = ','.join('?' * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT key, translation FROM memory WHERE key IN ({placeholders})", chunk
+                ).fetchall()
+                for key, translation in rows:
+                    found[keys[key]] = translation
+
+            if found:
+                now = time.time()
+                hit_keys = [(now, key) for key, normalized in keys.items() if normalized in found]
+                self._conn.executemany("UPDATE memory SET last_used = ? WHERE key = ?", hit_keys)
+                self._conn.commit()
+
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+
+        return found
+
+    def put_many(self, translations: Dict[str, str], source_lang: str, target_lang: str,
+                 version: str = ""):
+        """Enregistre des traductions (phrase source -> phrase traduite)"""
+        if not translations:
+            return
+
+        now = time.time()
+        rows = []
+        for sentence, translation in translations.items():
+            normalized = self.normalize(sentence)
+            if normalized:
+                rows.append((self.make_key(normalized, source_lang, target_lang, version),
+                             source_lang, target_lang, translation, now))
+
+        with self._lock:
+            # rowcount = phrases réellement nouvelles ; les autres sont mises à jour
+            added = self._conn.executemany(
+                "INSERT OR IGNORE INTO memory (key, source_lang, target_lang, translation, last_used)"
+                " VALUES (?, ?, ?, ?, ?)", rows
+            ).rowcount
+            if added < len(rows):
+                self._conn.executemany(
+                    "UPDATE memory SET translation = ?, last_used = ? WHERE key = ?",
+                    [(translation, last_used, key) for key, _, _, translation, last_used in rows])
+            self._evict_if_needed(max(added, 0))
+            self._conn.commit()
+
+    def _count_entries(self) -> int:
+        """Nombre réel de phrases en base (verrou pris)"""
+        self._entries = self._conn.execute("SELECT COUNT(*) FROM memory").fetchone()[0]
+        self._added_since_count = 0
+        return self._entries
+
+    def _evict_if_needed(self, added: int):
+        """
+        Supprime les phrases les moins récemment utilisées au-delà de la limite
+
+        Le compte est tenu en mémoire : COUNT(*) n'est relancé qu'au premier
+        appel, tous les RECOUNT_INTERVAL ajouts (d'autres processus écrivent
+        dans la même base) et avant une éviction.
+        """
+        if self._entries is None:
+            self._count_entries()
+        else:
+            self._entries += added
+            self._added_since_count += added
+            if self._added_since_count >= RECOUNT_INTERVAL:
+                self._count_entries()
+        if self._entries <= self.max_entries:
+            return
+
+        count = self._count_entries()
+        if count <= self.max_entries:
+            return
+
+        # Libérer 10% de marge pour ne pas évincer à chaque insertion
+        to_remove = count - int(self.max_entries * 0.9)
+        self._conn.execute(
+            "DELETE FROM memory WHERE key IN "
+            "(SELECT key FROM memory ORDER BY last_used ASC LIMIT ?)", (to_remove,)
+        )
+        self._entries = count - to_remove
+        self.evictions += to_remove
+
+    def get_stats(self) -> Dict[str, float]:
+        """Retourne les statistiques du cache (hits, misses, taille...)"""
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM memory").fetchone()[0]
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'entries': entries,
+            'max_entries': self.max_entries,
+            'evictions': self.evictions
+        }
+
+    def clear(self):
+        """Vide complètement la mémoire de traduction"""
+        with self._lock:
+            self._conn.execute("DELETE FROM memory")
+            self._conn.commit()
+            self._entries = 0
+            self._added_since_count = 0
+
+    def close(self):
+        """Ferme la connexion SQLite"""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,174 @@
+"""
+Translation Queue - File de travaux de traduction persistante (SQLite)
+Chaque travail (livre, chapitre, langue) terminé est enregistré sur disque dès
+qu'il finit : une traduction interrompue (plantage, fermeture) reprend là où
+elle s'était arrêtée au lieu de repartir du chapitre 1
+
+Le livre fait partie de la clé : un livre importé dans la bibliothèque garde
+les id de chapitres de son fichier JSON d'origine.
+"""
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+PENDING = 'pending'
+DONE = 'done'
+FAILED = 'failed'
+
+class TranslationQueue:
+    """Travaux (livre, chapitre, langue, hash source) et leurs résultats, conservés sur disque"""
+
+    def __init__(self, db_path: Optional[Path] = None):
+        """
+        Args:
+            db_path: Fichier SQLite (défaut: data/translation_queue.db)
+        """
+        if db_path is None:
+            db_path = Path(__file__).parent.parent / "data" / "translation_queue.db"
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        columns = [row[1] for row in self._conn.execute("PRAGMA table_info(jobs)")]
+        if columns and 'book_id' not in columns:
+            # Ancienne file sans livre : ses travaux appartenaient au livre JSON courant ('')
+            self._conn.execute("ALTER TABLE jobs RENAME TO jobs_old")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            " book_id TEXT NOT NULL,"
+            " chapter_id TEXT NOT NULL,"
+            " lang TEXT NOT NULL,"
+            " source_hash TEXT NOT NULL,"
+            " status TEXT NOT NULL,"
+            " translation TEXT,"
+            " source_hashes TEXT,"
+            " updated_at REAL NOT NULL,"
+            " PRIMARY KEY (book_id, chapter_id, lang))"
+        )
+        if columns and 'book_id' not in columns:
+            self._conn.execute(
+                "INSERT INTO jobs SELECT '', chapter_id, lang, source_hash, status, translation,"
+                " source_hashes, updated_at FROM jobs_old")
+            self._conn.execute("DROP TABLE jobs_old")
+        self._conn.commit()
+
+    @staticmethod
+    def content_hash(chapter) -> str:
+        """Hash du contenu français complet d'un chapitre"""
+        return hashlib.sha1(chapter.content_fr.encode('utf-8')).hexdigest()
+
+    def enqueue(self, chapters: List, langs: List[str], book_id: str = '') -> int:
+        """
+        Enregistre les travaux d'une traduction (un par chapitre et par langue)
+
+        Les travaux déjà terminés pour le même contenu source sont conservés :
+        ils ne seront pas recalculés.
+
+        Args:
+            book_id: Livre des chapitres ('' = livre JSON courant, voir BookManager.get_book_key)
+
+        Returns:
+            Nombre de travaux du livre restant à faire
+        """
+        now = time.time()
+        with self._lock:
+            for chapter in chapters:
+                if not chapter.content_fr.strip():
+                    continue
+                source_hash = self.content_hash(chapter)
+                for lang in langs:
+                    row = self._conn.execute(
+                        "SELECT source_hash, status FROM jobs WHERE book_id = ? AND chapter_id = ? AND lang = ?",
+                        (book_id, chapter.id, lang)).fetchone()
+                    if row and row[0] == source_hash and row[1] != FAILED:
+                        continue
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO jobs"
+                        " (book_id, chapter_id, lang, source_hash, status, translation, source_hashes, updated_at)"
+                        " VALUES (?, ?, ?, ?, ?, NULL, NULL, ?)",
+                        (book_id, chapter.id, lang, source_hash, PENDING, now))
+            self._conn.commit()
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM jobs WHERE book_id = ? AND status != ?", (book_id, DONE)).fetchone()[0]
+
+    def checkpoint(self, chapter, lang: str, book_id: str = ''):
+        """
+        Enregistre la traduction d'un chapitre dès qu'elle est terminée
+
+        Une traduction sans provenance (message d'erreur) est marquée en échec
+        et sera refaite à la reprise.
+        """
+        source_hashes = chapter.get_translation_sources(lang)
+        status = DONE if source_hashes is not None else FAILED
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO jobs"
+                " (book_id, chapter_id, lang, source_hash, status, translation, source_hashes, updated_at)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (book_id, chapter.id, lang, self.content_hash(chapter), status,
+                 chapter.get_translation(lang),
+                 json.dumps(source_hashes) if source_hashes is not None else None,
+                 time.time()))
+            self._conn.commit()
+
+    def restore(self, chapters: List, book_id: str = '') -> int:
+        """
+        Réapplique aux chapitres les traductions terminées mais pas encore sauvegardées
+
+        Un résultat n'est réappliqué que si le contenu français n'a pas changé depuis.
+
+        Returns:
+            Nombre de traductions réappliquées
+        """
+        by_id = {chapter.id: chapter for chapter in chapters}
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT chapter_id, lang, source_hash, translation, source_hashes FROM jobs"
+                " WHERE book_id = ? AND status = ?", (book_id, DONE)).fetchall()
+
+        restored = 0
+        for chapter_id, lang, source_hash, translation, source_hashes in rows:
+            chapter = by_id.get(chapter_id)
+            if chapter is None or self.content_hash(chapter) != source_hash:
+                continue
+            hashes = json.loads(source_hashes)
+            if chapter.get_translation(lang) == translation and \
+                    chapter.get_translation_sources(lang) == hashes:
+                continue
+            chapter.set_translation(lang, translation, source_hashes=hashes)
+            restored += 1
+        return restored
+
+    def get_pending(self, book_id: str = '') -> List[Tuple[str, str]]:
+        """Travaux non terminés d'un livre : liste (id chapitre, langue)"""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT chapter_id, lang FROM jobs WHERE book_id = ? AND status != ?"
+                " ORDER BY chapter_id, lang", (book_id, DONE)).fetchall()
+
+    def get_stats(self) -> Dict[str, int]:
+        """Nombre de travaux par état"""
+        stats = {PENDING: 0, DONE: 0, FAILED: 0}
+        with self._lock:
+            for status, count in self._conn.execute(
+                    "SELECT status, COUNT(*) FROM jobs GROUP BY status"):
+                stats[status] = count
+        return stats
+
+    def clear(self, book_id: str = ''):
+        """Vide la file d'un livre (à appeler une fois le livre sauvegardé)"""
+        with self._lock:
+            self._conn.execute("DELETE FROM jobs WHERE book_id = ?", (book_id,))
+            self._conn.commit()
+
+    def close(self):
+        """Ferme la connexion SQLite"""
+        with self._lock:
+            self._conn.close()
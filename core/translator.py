@@ -4,15 +4,512 @@ Translator - Moteur de traduction locale avec Argos Translate
 import os
 import sys
 import re
-from typing import Optional
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from .repetition import CHAR_LANGS, RepetitionEngine
+from .route_planner import RoutePlanner
+from .segmenter import SentenceSegmenter
+from .text_cleaner import TextCleaner
+from .translation_config import load_translation_config
+from .translation_memory import TranslationMemory
+
+# Streaming : lots de paragraphes croissants (1, 2, 4... jusqu'à 32)
+STREAM_MAX_CHUNK = 32
+
+# Décodage adaptatif : erreurs de TextCleaner qui justifient une retraduction
+# (les caractères incompatibles CID se corrigent après coup, pas au décodage)
+RETRY_ERROR_TYPES = {'excessive_repetition', 'missing_character'}
+
+# Caractère répété 5 fois ou plus (bégaiement du modèle en chinois/japonais)
+REPEATED_CHAR = re.compile(r'(.)\1{4,}')
+
+# Nettoyage des sorties chinoises/japonaises (caractères, mots et groupes répétés)
+REPETITIONS = RepetitionEngine()
+
+# Phrase factice du préchauffage, par langue source
+WARM_UP_TEXT = {'fr': "Bonjour, comment allez-vous ?", 'en': "Hello, how are you?"}
+
+# Langues cibles - 17 LANGUES TOTAL avec le français !
+TARGET_LANGS = ['en', 'es', 'it', 'ru', 'ja', 'zh', 'hi', 'ar', 'de', 'pt', 'tr', 'ko', 'id', 'vi', 'pl', 'th']
+
+# Classement des phrases avant traduction
+TRANSLATE = 'translate'       # À traduire normalement
+PASSTHROUGH = 'passthrough'   # Recopiée telle quelle (URL, nombres, code, liste de noms)
+ENGLISH = 'english'           # Déjà en anglais : saute l'étape FR -> EN
+
+# Trigrammes les plus fréquents (espaces compris) de l'anglais et du français
+LANGUAGE_TRIGRAMS = {
+    # Sans les trigrammes fréquents aussi en français sans accents ('ou ', 'as ',
+    # 'is ', 'it ', 'er '...) : "Ou vas-tu avec ton sac ?" n'est pas de l'anglais
+    'en': {
+        ' th', 'the', 'he ', 'ing', 'ng ', 'and', ' an', 'nd ', ' of', 'of ', ' to', 'to ',
+        'ed ', ' in', ' is', 'hat', 'tha', 'at ', ' wa', 'was', ' it', 'for', ' fo', 'his',
+        ' hi', 'you', ' yo', 'wit', 'ith', 'th ', ' be', 'are', 'ere', 'her', ' wh', 'hic',
+        'ly ', 'ght', 'ave', ' ha', 'hav', 'thi', ' we', 'wou', 'uld', ' sh', 'ill', 'ey ',
+        ' my', 'my ', ' ca', 'can', 'wil',
+    },
+    'fr': {
+        ' de', 'de ', 'es ', ' le', 'le ', 'ent', 'nt ', ' la', 'la ', 'les', ' qu', 'que',
+        'ue ', 'ion', 'on ', ' et', 'et ', 're ', 'ne ', ' po', 'pou', 'our', 'ur ', ' un',
+        'une', 'un ', ' pa', 'par', 'ait', 'ais', 'est', ' es', 'st ', 'des', ' da', 'dan',
+        'ans', 'ns ', ' ne', ' au', 'aux', 'eur', 'ous', 'nou', 'vou', ' vo', ' no', ' du',
+        'du ', 'lle', ' il', 'il ', ' ce', 'ce ', 'qui', ' se', 'se ', 'tre', ' je', 'je ',
+    },
+}
+
+FRENCH_LETTERS = re.compile(r'[éèêëàâùûüôîïçœÉÈÊÀÇŒ]')
+URL_OR_EMAIL = re.compile(r'^(?:https?://\S+|www\.\S+|[\w.+-]+@[\w-]+(?:\.[\w-]+)+)[.,;:!?)]*$', re.IGNORECASE)
+CODE_START = re.compile(r'^(?:def |class |import |from \S+ import |return\b|#include|function\b|var |let |const |'
+                        r'public |private |print\(|console\.|SELECT |>>> |\$ |</?[a-zA-Z][^>]*>)')
+CODE_SYMBOLS = set('{}[]();=<>_/\\|')
+# Mots-outils anglais absents du français : il en faut au moins deux
+ENGLISH_WORDS = {
+    'the', 'and', 'of', 'is', 'was', 'to', 'in', 'it', 'that', 'with', 'for', 'you', 'are',
+    'this', 'have', 'be', 'would', 'will', 'can', 'my', 'his', 'what', 'which', 'were', 'from',
+}
+NAME_PARTICLES = {'de', 'du', 'des', "d'", 'van', 'von', 'der', 'den', 'la', 'le', 'di', 'da', 'del', 'bin', 'al'}
+NAME_SEPARATORS = re.compile(r'\s*(?:[,;]|\bet\b|\band\b|&)\s*')
+
+class SegmentClassifier:
+    """
+    Repère les phrases qui ne doivent pas passer par le modèle
+    
+    Règles (URL, nombres seuls, code, listes de noms propres) puis
+    identification de langue par trigrammes de caractères (anglais cité
+    dans un texte français).
+    """
+    
+    def classify(self, sentence: str, source_lang: str = 'fr') -> str:
+        """Retourne TRANSLATE, PASSTHROUGH ou ENGLISH"""
+        text = sentence.strip()
+        if not any(char.isalpha() for char in text):
+            return PASSTHROUGH
+        if URL_OR_EMAIL.match(text) or self._looks_like_code(text) or self._is_name_list(text):
+            return PASSTHROUGH
+        if source_lang != 'en' and self._is_english(text):
+            return ENGLISH
+        return TRANSLATE
+    
+    def _looks_like_code(self, text: str) -> bool:
+        """Ligne de code : début typique ou forte densité de symboles de programmation"""
+        if CODE_START.match(text):
+            return True
+        symbols = sum(1 for char in text if char in CODE_SYMBOLS)
+        return symbols >= 4 and symbols / len(text) >= 0.12 and any(char in text for char in '{};=')
+    
+    def _is_name_list(self, text: str) -> bool:
+        """Au moins 3 éléments séparés par des virgules, chacun fait de noms propres"""
+        items = [item for item in NAME_SEPARATORS.split(text.rstrip('.!?…')) if item]
+        if len(items) < 3:
+            return False
+        for item in items:
+            words = item.split()
+            if not 1 <= len(words) <= 4:
+                return False
+            for word in words:
+                if word.lower() not in NAME_PARTICLES and not word[0].isupper():
+                    return False
+        return True
+    
+    def _is_english(self, text: str) -> bool:
+        """Identification anglais / français par trigrammes (prudente : dans le doute, français)"""
+        if FRENCH_LETTERS.search(text):
+            return False
+        letters = re.sub(r'[^a-z\']+', ' ', text.lower())
+        if sum(1 for char in letters if char.isalpha()) < 15:
+            return False
+        padded = f" {' '.join(letters.split())} "
+        trigrams = [padded[i:i + 3] for i in range(len(padded) - 2)]
+        english = sum(1 for trigram in trigrams if trigram in LANGUAGE_TRIGRAMS['en'])
+        french = sum(1 for trigram in trigrams if trigram in LANGUAGE_TRIGRAMS['fr'])
+        if english < 4 or english <= 2 * french:
+            return False
+        return sum(1 for word in letters.split() if word in ENGLISH_WORDS) >= 2
+
+class TranslationHandle:
+    """
+    Traduction résidente pour une paire de langues
+    
+    Le pack Argos est résolu une seule fois ; le modèle CTranslate2 et le
+    tokenizer SentencePiece sont chargés au premier usage puis gardés en mémoire.
+    Si CTranslate2/SentencePiece ne sont pas utilisables, l'objet traduction
+    d'Argos (résolu une seule fois lui aussi) sert de repli.
+    
+    Décodage adaptatif : un premier jet glouton (faisceau de draft_beam_size)
+    pour toutes les phrases, puis seules les phrases jugées fautives par
+    TextCleaner sont retraduites avec le faisceau large et des pénalités de
+    répétition.
+    """
+    
+    def __init__(self, package, argos_translation, settings: Dict,
+                 residency: Optional['ModelResidencyManager'] = None):
+        self.package = package
+        self.argos_translation = argos_translation
+        self.settings = settings
+        self.residency = residency
+        self.busy = 0          # Traductions en cours (un modèle occupé n'est jamais évincé)
+        self._size_mb = None
+        self._translator = None
+        self._tokenizer = None
+        self._direct = None
+        self._lock = threading.Lock()
+        self._cleaner = TextCleaner()
+        self.batches = 0       # Appels de traduction (le premier paie le chargement)
+        # Statistiques du décodage adaptatif
+        self.segments = 0
+        self.retranslated = 0
+    
+    def _load(self) -> bool:
+        """Charge le modèle CTranslate2 (une seule fois). Retourne True si disponible"""
+        if self._direct is not None:
+            return self._direct
+        
+        with self._lock:
+            if self._direct is not None:
+                return self._direct
+            try:
+                import ctranslate2
+                import sentencepiece
+                
+                package_path = Path(self.package.package_path)
+                self._tokenizer = sentencepiece.SentencePieceProcessor(
+                    model_file=str(package_path / "sentencepiece.model"))
+                self._translator = ctranslate2.Translator(
+                    str(package_path / "model"),
+                    device='cpu',
+                    compute_type=self.settings.get('compute_type', 'int8'),
+                    inter_threads=int(self.settings.get('inter_threads', 1)),
+                    intra_threads=int(self.settings.get('intra_threads', 0)))
+                self._direct = True
+            except Exception as e:
+                print(f"⚠️ CTranslate2 direct indisponible ({self.package.from_code} -> "
+                      f"{self.package.to_code}), repli Argos: {e}")
+                self._direct = False
+            return self._direct
+    
+    @property
+    def loaded(self) -> bool:
+        """Vrai si le modèle CTranslate2 est en mémoire"""
+        return self._direct is True
+    
+    @property
+    def warm(self) -> bool:
+        """Vrai si la prochaine traduction ne paiera pas de chargement de modèle"""
+        if self.settings.get('segmenter') == 'stanza' or self._direct is False:
+            return self.batches > 0  # Objet Argos : chargé lors de son premier appel
+        return self.loaded
+    
+    def size_mb(self) -> float:
+        """Empreinte mémoire estimée du modèle (taille des fichiers du pack)"""
+        if self._size_mb is None:
+            package_path = Path(self.package.package_path)
+            try:
+                files = [path for path in (package_path / "model").rglob('*') if path.is_file()]
+                files.append(package_path / "sentencepiece.model")
+                self._size_mb = sum(path.stat().st_size for path in files if path.exists()) / 1e6
+            except OSError:
+                self._size_mb = 0.0
+        return self._size_mb
+    
+    def warm_up(self) -> bool:
+        """
+        Charge le modèle puis fait une inférence factice (la première est toujours lente)
+        
+        Returns:
+            True si le modèle CTranslate2 est prêt
+        """
+        if self.residency is not None:
+            self.residency.acquire(self)
+        try:
+            if not self._load():
+                return False
+            text = WARM_UP_TEXT.get(self.package.from_code, WARM_UP_TEXT['en'])
+            self._decode([self._tokenizer.encode(text, out_type=str)], 1)
+            return True
+        finally:
+            if self.residency is not None:
+                self.residency.release(self)
+    
+    def unload(self):
+        """Libère le modèle CTranslate2 (il sera rechargé au prochain usage)"""
+        with self._lock:
+            if self._direct is not True:
+                return
+            try:
+                self._translator.unload_model()
+            except Exception:
+                pass
+            self._translator = None
+            self._tokenizer = None
+            self._direct = None
+    
+    def translate_sentences(self, sentences: List[str]) -> List[str]:
+        """
+        Traduit une liste de phrases (l'ordre est conservé)
+        
+        Les phrases sont regroupées par longueur (en tokens) puis envoyées au
+        modèle par lots d'au plus max_batch_tokens tokens (remplissage compris),
+        ce qui évite de calculer du padding inutile.
+        """
+        if not sentences:
+            return []
+        self.batches += 1
+        
+        # Mode 'stanza' : Argos fait lui-même le découpage (pipeline Stanza)
+        if self.settings.get('segmenter') == 'stanza':
+            return [self.argos_translation.translate(sentence) for sentence in sentences]
+        
+        if self.residency is None:
+            return self._translate_loaded(sentences)
+        self.residency.acquire(self)
+        try:
+            return self._translate_loaded(sentences)
+        finally:
+            self.residency.release(self)
+    
+    def _translate_loaded(self, sentences: List[str]) -> List[str]:
+        """Traduit avec le modèle chargé (ou l'objet Argos si CTranslate2 est indisponible)"""
+        if not self._load():
+            return [self.argos_translation.translate(sentence) for sentence in sentences]
+        
+        tokens = [self._tokenizer.encode(sentence, out_type=str) for sentence in sentences]
+        if not self.settings.get('adaptive_decoding', True):
+            return self._decode(tokens, int(self.settings.get('beam_size', 4)))
+        
+        # 1er passage rapide pour tout le monde
+        translated = self._decode(tokens, int(self.settings.get('draft_beam_size', 1)))
+        
+        # 2e passage soigné uniquement pour les phrases fautives
+        retry = [i for i, text in enumerate(translated) if self._needs_retry(text)]
+        if retry:
+            results = self._decode([tokens[i] for i in retry], int(self.settings.get('beam_size', 4)),
+                                   careful=True)
+            for i, result in zip(retry, results):
+                translated[i] = result
+        
+        with self._lock:
+            self.segments += len(sentences)
+            self.retranslated += len(retry)
+        return translated
+    
+    def _needs_retry(self, text: str) -> bool:
+        """Vrai si le premier jet présente une erreur de décodage (répétitions, caractères manquants)"""
+        if REPEATED_CHAR.search(text):
+            return True
+        report = self._cleaner.detect_errors(text, self.package.to_code)
+        return any(error['type'] in RETRY_ERROR_TYPES for error in report['errors'])
+    
+    def _decode(self, tokens: List[List[str]], beam_size: int, careful: bool = False) -> List[str]:
+        """Traduit des phrases tokenisées par lots de longueur voisine (ordre conservé)"""
+        translated = [""] * len(tokens)
+        for batch in self._make_buckets(tokens):
+            results = self._translate_tokens([tokens[i] for i in batch], beam_size, careful)
+            for i, result in zip(batch, results):
+                translated[i] = result
+        return translated
+    
+    def _make_buckets(self, tokens: List[List[str]]) -> List[List[int]]:
+        """Groupe les indices de phrases de longueur voisine en lots bornés en tokens"""
+        max_tokens = max(1, int(self.settings.get('max_batch_tokens', 2048)))
+        order = sorted(range(len(tokens)), key=lambda i: len(tokens[i]))
+        
+        buckets = []
+        current = []
+        for i in order:
+            # Coût d'un lot = nb phrases x longueur max (tout est complété au plus long)
+            longest = max(len(tokens[i]), 1)
+            if current and (len(current) + 1) * longest > max_tokens:
+                buckets.append(current)
+                current = []
+            current.append(i)
+        if current:
+            buckets.append(current)
+        return buckets
+    
+    def _translate_tokens(self, batch: List[List[str]], beam_size: int, careful: bool = False) -> List[str]:
+        """
+        Envoie un lot de phrases tokenisées au modèle CTranslate2
+        
+        Args:
+            careful: Ajoute les pénalités anti-répétition (passage de rattrapage)
+        """
+        prefix = getattr(self.package, 'target_prefix', '') or ''
+        options = {}
+        if careful:
+            options['repetition_penalty'] = float(self.settings.get('repetition_penalty', 1.2))
+            options['no_repeat_ngram_size'] = int(self.settings.get('no_repeat_ngram_size', 3))
+        results = self._translator.translate_batch(
+            batch,
+            target_prefix=[[prefix]] * len(batch) if prefix else None,
+            beam_size=beam_size,
+            max_batch_size=len(batch),
+            replace_unknowns=True,
+            **options)
+        
+        translated = []
+        for result in results:
+            hypothesis = result.hypotheses[0]
+            if prefix and hypothesis and hypothesis[0] == prefix:
+                hypothesis = hypothesis[1:]
+            translated.append(self._tokenizer.decode(hypothesis))
+        return translated
+
+class ModelResidencyManager:
+    """
+    Garde en mémoire les modèles les plus récemment utilisés dans un budget (Mo)
+    
+    Un modèle est chargé à la demande ; s'il ne tient pas dans le budget, les
+    modèles inutilisés depuis le plus longtemps sont libérés d'abord. Un modèle
+    en cours d'utilisation n'est jamais libéré (le budget peut alors être
+    dépassé temporairement).
+    """
+    
+    def __init__(self, budget_mb: float = 0):
+        """
+        Args:
+            budget_mb: Mémoire max pour les modèles (0 = illimitée)
+        """
+        self.budget_mb = float(budget_mb or 0)
+        self._resident: 'OrderedDict[TranslationHandle, float]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.loads = 0
+        self.hits = 0
+        self.evictions = 0
+        self.prefetches = 0
+    
+    def _make_room(self, needed_mb: float, keep: TranslationHandle) -> bool:
+        """Libère les modèles LRU non occupés. Retourne True si needed_mb tient dans le budget"""
+        if not self.budget_mb:
+            return True
+        victims = []
+        used = sum(self._resident.values())
+        for handle, size in self._resident.items():
+            if used + needed_mb <= self.budget_mb:
+                break
+            if handle is keep or handle.busy:
+                continue
+            victims.append(handle)
+            used -= size
+        for handle in victims:
+            del self._resident[handle]
+            handle.unload()
+            self.evictions += 1
+        return used + needed_mb <= self.budget_mb
+    
+    def acquire(self, handle: TranslationHandle):
+        """Marque un modèle comme occupé et le charge si besoin (avec éviction LRU)"""
+        with self._lock:
+            handle.busy += 1
+            if handle in self._resident and handle.loaded:
+                self._resident.move_to_end(handle)
+                self.hits += 1
+                return
+            self._make_room(handle.size_mb(), keep=handle)
+        if handle._load():
+            with self._lock:
+                if handle not in self._resident:
+                    self.loads += 1
+                self._resident[handle] = handle.size_mb()
+                self._resident.move_to_end(handle)
+    
+    def fits(self, handle: TranslationHandle) -> bool:
+        """Vrai si le modèle est déjà chargé ou tient dans le budget sans rien évincer"""
+        with self._lock:
+            if handle in self._resident or not self.budget_mb:
+                return True
+            return sum(self._resident.values()) + handle.size_mb() <= self.budget_mb
+    
+    def release(self, handle: TranslationHandle):
+        """Libère l'usage d'un modèle (il reste en mémoire jusqu'à éviction)"""
+        with self._lock:
+            handle.busy = max(0, handle.busy - 1)
+    
+    def prefetch(self, handle: TranslationHandle):
+        """
+        Précharge un modèle en arrière-plan (prochaine langue d'un traitement)
+        
+        Ignoré si le modèle est déjà chargé ou s'il faudrait libérer un modèle occupé.
+        """
+        with self._lock:
+            if handle in self._resident or handle.busy:
+                return
+            if not self._make_room(handle.size_mb(), keep=handle):
+                return
+            handle.busy += 1
+            self.prefetches += 1
+        
+        def load():
+            try:
+                if handle._load():
+                    with self._lock:
+                        if handle not in self._resident:
+                            self.loads += 1
+                        self._resident[handle] = handle.size_mb()
+            finally:
+                self.release(handle)
+        
+        threading.Thread(target=load, daemon=True).start()
+    
+    def clear(self):
+        """Libère tous les modèles (changement des packs installés)"""
+        with self._lock:
+            handles = list(self._resident)
+            self._resident.clear()
+        for handle in handles:
+            handle.unload()
+    
+    def get_stats(self) -> Dict:
+        """Modèles résidents et compteurs de chargement/éviction"""
+        with self._lock:
+            resident = [f"{h.package.from_code}->{h.package.to_code}" for h in self._resident]
+            resident_mb = sum(self._resident.values())
+        return {
+            'resident': resident,
+            'resident_mb': resident_mb,
+            'budget_mb': self.budget_mb,
+            'loads': self.loads,
+            'hits': self.hits,
+            'evictions': self.evictions,
+            'prefetches': self.prefetches
+        }
 
 class Translator:
     """Gère les traductions locales via Argos Translate"""
     
-    def __init__(self):
+    def __init__(self, memory: Optional[TranslationMemory] = None, settings: Optional[Dict] = None):
+        """
+        Args:
+            memory: Mémoire de traduction (défaut: data/translation_memory.db)
+            settings: Réglages CTranslate2 (défaut: data/translation_config.json)
+        """
         self.available = False
         self.installed_languages = set()
-        self._init_argos()
+        self.routes: Dict[str, List[str]] = {}  # langue cible -> ['fr', ..., cible]
+        self.route_planner = RoutePlanner()
+        self.package_versions: Dict[tuple, str] = {}
+        self.memory = memory
+        self.settings = load_translation_config()
+        if settings:
+            self.settings.update(settings)
+        self._packages: Dict[tuple, object] = {}
+        self._handles: Dict[tuple, TranslationHandle] = {}
+        self._handles_lock = threading.Lock()
+        self.residency = ModelResidencyManager(self.settings.get('model_memory_mb', 0))
+        self._active_work = 0      # Traductions réelles en cours (le préchauffage leur cède la place)
+        self._work_lock = threading.Lock()
+        self.segmenter = SentenceSegmenter()
+        self.classifier = SegmentClassifier() if self.settings.get('classify_segments', True) else None
+        self.skip_stats = {PASSTHROUGH: 0, ENGLISH: 0}  # Tokens non envoyés au modèle, par type
+        self.chapter_skips: Dict[str, int] = {}         # id chapitre -> tokens non envoyés au modèle
+        self._skip_local = threading.local()            # Compteur par thread (bilan par chapitre)
+        self.daemon = None
+        if not (self.settings.get('daemon') and self._init_daemon()):
+            self._init_argos()
+        self._init_memory()
     
     def _init_argos(self):
         """Initialise Argos Translate"""
@@ -37,25 +534,8 @@ class Translator:
             for p in installed:
                 print(f"  {p.from_code} -> {p.to_code}")
             
-            # Vérifier quelles langues sont disponibles
-            # Langues cibles (via EN) - 17 LANGUES TOTAL !
-            target_langs = ['en', 'es', 'it', 'ru', 'ja', 'zh', 'hi', 'ar', 'de', 'pt', 'tr', 'ko', 'id', 'vi', 'pl', 'th']
-            
-            # Vérifier FR -> EN (requis)
-            has_fr_en = any(p.from_code == 'fr' and p.to_code == 'en' for p in installed)
-            
-            if has_fr_en:
-                self.installed_languages.add('en')
-                print("  -> EN disponible (direct)")
-                
-                # Vérifier EN -> autres langues
-                for target in ['es', 'it', 'ru', 'ja', 'zh', 'hi', 'ar', 'de', 'pt', 'tr', 'ko', 'id', 'vi', 'pl', 'th']:
-                    has_en_target = any(p.from_code == 'en' and p.to_code == target for p in installed)
-                    if has_en_target:
-                        self.installed_languages.add(target)
-                        print(f"  -> {target.upper()} disponible (via EN)")
-                    else:
-                        print(f"  -> {target.upper()} NON disponible")
+            # Routes les moins coûteuses depuis le français (pack direct ou pivot)
+            self.refresh_routes(installed)
             
             print(f"Langues activees: {self.installed_languages}")
             self.available = len(self.installed_languages) > 0
@@ -68,19 +548,372 @@ class Translator:
             print(f"⚠️ Erreur initialisation traducteur: {e}")
             self.available = False
     
+    def _init_daemon(self) -> bool:
+        """
+        Mode client : utilise le démon de traduction local s'il tourne
+        
+        Returns:
+            True si le démon répond (les modèles restent chez lui)
+        """
+        from .translation_daemon import DaemonClient
+        
+        client = DaemonClient.connect(self.settings.get('daemon_port'))
+        if client is None:
+            print("⚠️ Démon de traduction absent, traduction dans l'application")
+            print("   Lancez: python -m core.translation_daemon")
+            return False
+        try:
+            status = client.call('status')
+        except Exception as e:
+            print(f"⚠️ Démon de traduction injoignable: {e}")
+            client.close()
+            return False
+        
+        self.daemon = client
+        self.available = status['available']
+        self.installed_languages = set(status['installed_languages'])
+        self.routes = status['routes']
+        self.package_versions = {(src, tgt): version for src, tgt, version in status['package_versions']}
+        print(f"[OK] Démon de traduction connecté (PID {status['pid']}) - "
+              f"langues: {', '.join(status['installed_languages'])}")
+        return True
+    
+    def _translate_sentences(self, source_lang: str, target_lang: str, sentences: List[str]) -> List[str]:
+        """Traduit des phrases via le démon, ou localement s'il a disparu"""
+        if self.daemon is not None:
+            try:
+                return self.daemon.call('translate_sentences', source_lang, target_lang, sentences)
+            except (OSError, EOFError, ConnectionError) as e:
+                # TimeoutError (démon bloqué) est un OSError : même repli
+                print(f"⚠️ Démon de traduction perdu ({e}), repli local")
+                self.daemon.close()
+                self.daemon = None
+                self._init_argos()
+        
+        handle = self.get_handle(source_lang, target_lang)
+        # Un modèle froid paie son chargement : mesure écartée du débit de la paire
+        warm = handle.warm
+        start = time.perf_counter()
+        results = handle.translate_sentences(sentences)
+        if warm:
+            # Débit mesuré : sert au choix des routes des prochaines sessions
+            self.route_planner.record(source_lang, target_lang, sum(len(s) for s in sentences),
+                                      time.perf_counter() - start)
+        return results
+    
+    def refresh_routes(self, installed: Optional[List] = None) -> bool:
+        """
+        Recalcule les routes FR -> cible si l'ensemble des packs installés a changé
+        
+        Returns:
+            True si les routes ont été recalculées
+        """
+        if installed is None:
+            installed = self.argos_package.get_installed_packages()
+        if not self.route_planner.update(installed):
+            return False
+        
+        with self._handles_lock:
+            self._packages = {(p.from_code, p.to_code): p for p in installed}
+            self.package_versions = {(p.from_code, p.to_code): str(getattr(p, 'package_version', ''))
+                                     for p in installed}
+            self._handles = {}
+        self.residency.clear()
+        
+        self.routes = {}
+        self.installed_languages = set()
+        for target in TARGET_LANGS:
+            route = self.route_planner.get_route('fr', target)
+            if route is None:
+                print(f"  -> {target.upper()} NON disponible")
+                continue
+            self.routes[target] = route
+            self.installed_languages.add(target)
+            if len(route) == 2:
+                print(f"  -> {target.upper()} disponible (direct)")
+            else:
+                via = ' -> '.join(lang.upper() for lang in route[1:-1])
+                print(f"  -> {target.upper()} disponible (via {via})")
+        return True
+    
+    def get_route(self, target_lang: str, target_langs: Optional[List[str]] = None) -> Optional[List[str]]:
+        """
+        Route FR -> cible
+        
+        Args:
+            target_langs: Lot de langues traduites ensemble : la route est alors
+                          planifiée pour le lot (pivot FR -> EN compté une seule fois)
+        """
+        if target_langs is not None and self.daemon is None:
+            route = self.route_planner.plan_batch('fr', target_langs).get(target_lang)
+            if route is not None:
+                return route
+        return self.routes.get(target_lang)
+    
+    def get_source_lang(self, target_lang: str, target_langs: Optional[List[str]] = None) -> str:
+        """Langue depuis laquelle traduire une cible : 'en' si sa route passe par le pivot anglais"""
+        route = self.get_route(target_lang, target_langs)
+        return 'en' if route and 'en' in route[1:-1] else 'fr'
+    
+    def needs_pivot(self, target_langs: List[str]) -> bool:
+        """Vrai si le pivot anglais est demandé ou sert à au moins une langue cible du lot"""
+        return any(lang == 'en' or self.get_source_lang(lang, target_langs) == 'en' for lang in target_langs)
+    
+    def _init_memory(self):
+        """Ouvre la mémoire de traduction persistante (data/translation_memory.db)"""
+        if self.memory is not None or not self.available:
+            return
+        try:
+            self.memory = TranslationMemory()
+        except Exception as e:
+            print(f"⚠️ Mémoire de traduction indisponible: {e}")
+            self.memory = None
+    
+    def get_handle(self, source_lang: str, target_lang: str) -> TranslationHandle:
+        """Retourne la traduction résidente d'une paire (résolue au premier appel)"""
+        key = (source_lang, target_lang)
+        handle = self._handles.get(key)
+        if handle is not None:
+            return handle
+        
+        with self._handles_lock:
+            if key not in self._handles:
+                package = self._packages.get(key)
+                if package is None:
+                    raise ValueError(f"Pack {source_lang} -> {target_lang} non installe")
+                
+                # Objet traduction Argos (repli), résolu une seule fois par paire
+                languages = {lang.code: lang for lang in self.argos_translate.get_installed_languages()}
+                argos_translation = languages[source_lang].get_translation(languages[target_lang])
+                self._handles[key] = TranslationHandle(package, argos_translation, self.settings,
+                                                       self.residency)
+            return self._handles[key]
+    
+    def get_decoding_stats(self) -> Dict[str, float]:
+        """
+        Statistiques du décodage adaptatif
+        
+        Returns:
+            Dict segments, retranslated (passés par le faisceau large), slow_fraction
+        """
+        if self.daemon is not None:
+            try:
+                return self.daemon.call('decoding_stats')
+            except Exception:
+                return {'segments': 0, 'retranslated': 0, 'slow_fraction': 0.0}
+        
+        with self._handles_lock:
+            handles = list(self._handles.values())
+        segments = sum(handle.segments for handle in handles)
+        retranslated = sum(handle.retranslated for handle in handles)
+        return {
+            'segments': segments,
+            'retranslated': retranslated,
+            'slow_fraction': retranslated / segments if segments else 0.0
+        }
+    
+    def get_residency_stats(self) -> Dict:
+        """Modèles en mémoire, budget et compteurs (chargements, évictions, préchargements)"""
+        if self.daemon is not None:
+            try:
+                return self.daemon.call('residency_stats')
+            except Exception:
+                return {}
+        return self.residency.get_stats()
+    
+    def prefetch(self, target_lang: str, source_lang: str = 'fr', target_langs: Optional[List[str]] = None):
+        """Précharge en arrière-plan le premier modèle de la route d'une langue"""
+        if self.daemon is not None or self.settings.get('segmenter') == 'stanza':
+            return
+        try:
+            hops = self.get_hops(source_lang, target_lang, target_langs)
+            handle = self.get_handle(hops[0], hops[1])
+        except Exception:
+            return
+        self.residency.prefetch(handle)
+    
+    def warm_up(self, target_langs: List[str], cancel: threading.Event) -> int:
+        """
+        Préchauffe les modèles (FR -> EN d'abord, puis les routes des langues données)
+        
+        Tourne en arrière-plan : attend tant qu'une vraie traduction est en cours,
+        s'arrête dès que cancel est levé et ne libère jamais un modèle pour en
+        charger un autre (budget mémoire respecté).
+        
+        Returns:
+            Nombre de modèles préchauffés
+        """
+        if not self.available or self.daemon is not None or self.settings.get('segmenter') == 'stanza':
+            return 0
+        
+        pairs = []
+        for lang in ['en'] + [lang for lang in target_langs if lang != 'en']:
+            route = self.get_route(lang, target_langs)
+            for pair in zip(route or [], (route or [])[1:]):
+                if pair not in pairs:
+                    pairs.append(pair)
+        
+        warmed = 0
+        for pair in pairs:
+            # Céder la place au vrai travail
+            while self._active_work and not cancel.is_set():
+                cancel.wait(0.2)
+            if cancel.is_set():
+                break
+            try:
+                handle = self.get_handle(*pair)
+                if not self.residency.fits(handle):
+                    continue
+                if handle.warm_up():
+                    warmed += 1
+            except Exception as e:
+                print(f"⚠️ Préchauffage {pair[0]} -> {pair[1]} impossible: {e}")
+        return warmed
+    
+    def _prefetch_next(self, plan: Dict, position: int):
+        """Précharge la prochaine langue du plan qui a vraiment des paragraphes à traduire"""
+        for lang in plan['langs'][position:]:
+            if lang in self.installed_languages and plan['missing'][lang]:
+                self.prefetch(lang, plan['sources'][lang], plan['targets'])
+                return
+    
+    def get_memory_stats(self) -> Dict[str, float]:
+        """Retourne les statistiques de la mémoire de traduction"""
+        if self.memory is None:
+            return {}
+        return self.memory.get_stats()
+    
+    def _split_sentences(self, paragraph: str, lang: str = 'fr') -> List[str]:
+        """Découpe un paragraphe en [phrase, séparateur, phrase, ...]"""
+        if self.settings.get('segmenter') == 'stanza':
+            # Paragraphe entier : le découpage est laissé à Argos/Stanza
+            return [paragraph]
+        return self.segmenter.split(paragraph, lang)
+    
+    def _translate_pair(self, text: str, source_lang: str, target_lang: str) -> str:
+        """Traduit un texte pour une paire de langues (voir _translate_pair_batch)"""
+        return self._translate_pair_batch([text], source_lang, target_lang)[0]
+    
+    def _translate_pair_batch(self, segments: List[str], source_lang: str, target_lang: str) -> List[str]:
+        """
+        Traduit plusieurs segments pour une paire de langues, phrase par phrase.
+        
+        Les phrases de tous les segments sont dédupliquées ; celles déjà présentes
+        dans la mémoire de traduction ne sont pas renvoyées au modèle et les
+        autres partent en un seul appel (regroupé par longueur par le handle).
+        Les sauts de ligne et les espaces entre phrases sont conservés.
+        """
+        with self._work_lock:
+            self._active_work += 1
+        try:
+            return self._do_translate_pair_batch(segments, source_lang, target_lang)
+        finally:
+            with self._work_lock:
+                self._active_work -= 1
+    
+    def _do_translate_pair_batch(self, segments: List[str], source_lang: str,
+                                 target_lang: str) -> List[str]:
+        """Corps de _translate_pair_batch (le travail en cours est compté par l'appelant)"""
+        version = self.package_versions.get((source_lang, target_lang), "")
+        
+        # Découper chaque ligne en phrases (les séparateurs sont aux indices impairs)
+        split_segments = [[self._split_sentences(line, source_lang) for line in segment.split('\n')]
+                          for segment in segments]
+        sentences = {part.strip() for lines in split_segments for parts in lines
+                     for part in parts[0::2] if part.strip()}
+        
+        # URL, nombres, code, listes de noms : recopiés ; anglais cité : saute l'étape vers l'anglais
+        translated = {}
+        english = []
+        if self.classifier is not None:
+            for sentence in sentences:
+                kind = self.classifier.classify(sentence, source_lang)
+                if kind == PASSTHROUGH or (kind == ENGLISH and target_lang == 'en'):
+                    translated[sentence] = sentence
+                    self._count_skipped(kind, sentence)
+                elif kind == ENGLISH and ('en', target_lang) in self.package_versions:
+                    english.append(sentence)
+        if english:
+            translated.update(zip(english, self._do_translate_pair_batch(english, 'en', target_lang)))
+        sentences = [sentence for sentence in sentences if sentence not in translated]
+        
+        known = {}
+        if self.memory is not None:
+            known = self.memory.get_many(sentences, source_lang, target_lang, version)
+        
+        misses = []
+        for sentence in sentences:
+            normalized = TranslationMemory.normalize(sentence)
+            if normalized in known:
+                translated[sentence] = known[normalized]
+            else:
+                misses.append(sentence)
+        
+        new_entries = {}
+        if misses:
+            results = self._translate_sentences(source_lang, target_lang, misses)
+            new_entries = dict(zip(misses, results))
+            translated.update(new_entries)
+        
+        if self.memory is not None and new_entries:
+            self.memory.put_many(new_entries, source_lang, target_lang, version)
+        
+        # Reconstruire chaque segment en conservant espaces et sauts de ligne
+        outputs = []
+        for lines in split_segments:
+            output_lines = []
+            for parts in lines:
+                rebuilt = []
+                for i, part in enumerate(parts):
+                    if i % 2 == 1 or not part.strip():
+                        rebuilt.append(part)
+                    else:
+                        leading = part[:len(part) - len(part.lstrip())]
+                        trailing = part[len(part.rstrip()):]
+                        rebuilt.append(leading + translated[part.strip()] + trailing)
+                output_lines.append(''.join(rebuilt))
+            outputs.append('\n'.join(output_lines))
+        
+        return outputs
+    
+    def _count_skipped(self, kind: str, sentence: str):
+        """Compte les tokens d'une phrase qui n'est pas passée par le modèle"""
+        tokens = len(sentence.split())
+        with self._work_lock:
+            self.skip_stats[kind] += tokens
+        self._skip_local.tokens = self._thread_skipped() + tokens
+    
+    def _thread_skipped(self) -> int:
+        """Tokens non envoyés au modèle par le thread courant (depuis son démarrage)"""
+        return getattr(self._skip_local, 'tokens', 0)
+    
+    def _report_chapter_skips(self, chapter, tokens: int):
+        """Enregistre et affiche les tokens d'un chapitre qui n'ont pas eu besoin du modèle"""
+        self.chapter_skips[chapter.id] = tokens
+        if tokens:
+            print(f"[OK] {chapter.title} : {tokens} tokens non envoyés au modèle "
+                  f"(URL, nombres, code, noms, anglais cité)")
+    
+    def get_skip_stats(self) -> Dict:
+        """
+        Bilan du classement des phrases avant traduction
+        
+        Returns:
+            Dict passthrough / english (tokens de la session, toutes étapes des
+            routes confondues) et chapters (id chapitre -> tokens du dernier passage)
+        """
+        with self._work_lock:
+            stats = dict(self.skip_stats)
+        stats['chapters'] = dict(self.chapter_skips)
+        return stats
+    
     def _clean_repetitions(self, text: str, lang: str) -> str:
         """Nettoie les répétitions excessives (bug Argos chinois)"""
-        if lang not in ['zh', 'ja']:
+        if lang not in CHAR_LANGS:
             return text
         
-        # Pour chinois : supprimer répétitions de caractères
-        # Exemple : 相相相相相 → 相
-        cleaned = re.sub(r'(.)\1{4,}', r'\1', text)  # 5+ répétitions → 1 seul
-        
-        # Pour phrases répétées
-        cleaned = re.sub(r'(\S+\s+\S+)\s+\1{2,}', r'\1', cleaned)  # Phrases dupliquées
-        
-        return cleaned
+        # Exemple : 相相相相相 → 相, 我爱你我爱你我爱你 → 我爱你 (temps linéaire, ligne par ligne)
+        return REPETITIONS.clean(text, lang)[0]
     
     def translate(self, text: str, target_lang: str) -> str:
         """Traduit un texte du français vers la langue cible"""
@@ -94,26 +927,414 @@ class Translator:
             return f"[Langue {target_lang.upper()} non installee]"
         
         try:
-            # Traduction directe pour EN
-            if target_lang == 'en':
-                translated = self.argos_translate.translate(text, 'fr', 'en')
-                return translated
-            
-            # Traduction en chaîne pour autres langues (FR -> EN -> target)
-            else:
-                # Étape 1: FR -> EN
-                text_en = self.argos_translate.translate(text, 'fr', 'en')
-                # Étape 2: EN -> target
-                translated = self.argos_translate.translate(text_en, 'en', target_lang)
-                
-                # Étape 3: Nettoyage répétitions (chinois/japonais)
-                translated = self._clean_repetitions(translated, target_lang)
-                
-                return translated
-                
+            return self._translate_text(text, target_lang)
         except Exception as e:
             return f"[Erreur traduction {target_lang.upper()}: {str(e)[:50]}]"
     
+    def _translate_text(self, text: str, target_lang: str) -> str:
+        """Traduit un texte (lève une exception en cas d'erreur Argos)"""
+        return self._translate_batch([text], target_lang)[0]
+    
+    def _translate_batch(self, segments: List[str], target_lang: str) -> List[str]:
+        """Traduit des segments FR vers la langue cible (lève une exception en cas d'erreur)"""
+        return self._translate_route_batch(segments, 'fr', target_lang)
+    
+    def _translate_route_batch(self, segments: List[str], source_lang: str, target_lang: str,
+                               target_langs: Optional[List[str]] = None) -> List[str]:
+        """
+        Traduit des segments en suivant la route de la langue cible (+ nettoyage répétitions)
+        
+        Args:
+            source_lang: 'fr', ou une langue intermédiaire de la route (pivot 'en')
+            target_langs: Lot de langues dont la route a été planifiée ensemble
+        """
+        return self._translate_hops(segments, self.get_hops(source_lang, target_lang, target_langs))
+    
+    def get_hops(self, source_lang: str, target_lang: str,
+                 target_langs: Optional[List[str]] = None) -> List[str]:
+        """Partie de la route de la cible qui commence à source_lang (ex: ['en', 'ja'])"""
+        route = self.get_route(target_lang, target_langs) or (
+            ['fr', 'en', target_lang] if target_lang != 'en' else ['fr', 'en'])
+        if source_lang not in route:
+            raise ValueError(f"Route {' -> '.join(route)} ne passe pas par {source_lang}")
+        return route[route.index(source_lang):]
+    
+    def _translate_hops(self, segments: List[str], hops: List[str]) -> List[str]:
+        """Enchaîne les packs d'une route (+ nettoyage répétitions de la langue finale)"""
+        translated = segments
+        for hop_source, hop_target in zip(hops, hops[1:]):
+            translated = self._translate_pair_batch(translated, hop_source, hop_target)
+        
+        # Nettoyage répétitions (chinois/japonais), les lignes restent alignées
+        return [self._clean_repetitions(segment, hops[-1]) for segment in translated]
+    
+    def translate_job(self, segments: List[str], hops: List[str]) -> Tuple[List[str], Dict]:
+        """
+        Exécute un travail d'un processus ou d'une machine de travail
+        
+        Returns:
+            (lignes traduites, stats) : stats de décodage cumulées et
+            skipped_tokens, les tokens de ce travail non envoyés au modèle
+        """
+        before = self._thread_skipped()
+        lines = self._translate_hops(segments, hops)
+        stats = self.get_decoding_stats()
+        stats['skipped_tokens'] = self._thread_skipped() - before
+        return lines, stats
+    
+    def translate_batch(self, segments: List[str], target_lang: str) -> List[str]:
+        """
+        Traduit une liste de segments (paragraphes, titres...) du français vers la langue cible
+        
+        Toutes les phrases sont traduites ensemble, regroupées par longueur,
+        puis réassemblées dans l'ordre des segments.
+        """
+        if not self.available or target_lang not in self.installed_languages:
+            return [self.translate(segment, target_lang) for segment in segments]
+        
+        try:
+            return self._translate_batch(segments, target_lang)
+        except Exception as e:
+            return [f"[Erreur traduction {target_lang.upper()}: {str(e)[:50]}]" if segment.strip() else ""
+                    for segment in segments]
+    
+    def translate_titles(self, titles: List[str], target_langs: List[str],
+                         route_langs: Optional[List[str]] = None) -> Dict[str, List[str]]:
+        """
+        Traduit des titres de chapitres vers plusieurs langues
+        
+        Tous les titres partent en un seul lot, avec un pivot anglais commun
+        aux langues dont la route passe par l'anglais.
+        
+        Args:
+            route_langs: Lot pour lequel les routes sont planifiées (défaut:
+                         target_langs), ex. les langues de "Tout traduire" pour
+                         passer par les mêmes routes (mêmes entrées de mémoire)
+        
+        Returns:
+            Dict langue -> titres traduits (même ordre que titles)
+        """
+        if not self.available:
+            return {lang: [self.translate(title, lang) for title in titles] for lang in target_langs}
+        
+        if route_langs is None:
+            route_langs = target_langs
+        results = {}
+        sources = {'fr': titles}
+        pivot_error = None
+        if any(lang == 'en' or self.get_source_lang(lang, route_langs) == 'en' for lang in target_langs):
+            try:
+                sources['en'] = self._translate_route_batch(titles, 'fr', 'en')
+            except Exception as e:
+                pivot_error = e
+        
+        for lang in target_langs:
+            source_lang = 'en' if lang == 'en' else self.get_source_lang(lang, route_langs)
+            if lang not in self.installed_languages:
+                results[lang] = [f"[Langue {lang.upper()} non installee]"] * len(titles)
+            elif source_lang == 'en' and pivot_error is not None:
+                results[lang] = [f"[Erreur traduction {lang.upper()}: {str(pivot_error)[:50]}]"] * len(titles)
+            elif lang == 'en':
+                results[lang] = sources['en']
+            else:
+                try:
+                    results[lang] = self._translate_route_batch(sources[source_lang], source_lang, lang,
+                                                                route_langs)
+                except Exception as e:
+                    results[lang] = [f"[Erreur traduction {lang.upper()}: {str(e)[:50]}]"] * len(titles)
+        return results
+    
+    def translate_to_many(self, text: str, target_langs: List[str]) -> Dict[str, str]:
+        """
+        Traduit un texte vers plusieurs langues en calculant le pivot FR -> EN une seule fois
+        
+        Returns:
+            Dict langue -> traduction. Contient aussi 'en' (le pivot) dès qu'il a
+            été calculé, même si 'en' n'était pas demandé.
+        """
+        if not self.available or not text or not text.strip():
+            return {lang: self.translate(text, lang) for lang in target_langs}
+        
+        # Le pivot est gratuit une fois calculé : le renvoyer aussi
+        langs = list(target_langs)
+        if self.needs_pivot(langs) and 'en' not in langs:
+            langs.append('en')
+        return {lang: translations[0]
+                for lang, translations in self.translate_titles([text], langs).items()}
+    
+    def translate_chapter(self, chapter, target_lang: str) -> int:
+        """
+        Retraduit un chapitre de façon incrémentale vers une langue
+        
+        Returns:
+            Nombre de paragraphes effectivement traduits
+        """
+        return self.translate_chapter_to_many(chapter, [target_lang]).get(target_lang, 0)
+    
+    def translate_chapter_to_many(self, chapter, target_langs: List[str],
+                                  progress_callback=None, result_callback=None) -> Dict[str, int]:
+        """
+        Retraduit un chapitre de façon incrémentale vers plusieurs langues
+        
+        Seuls les paragraphes ajoutés ou modifiés depuis la dernière traduction
+        sont envoyés au moteur ; les autres sont repris de Chapter.translations.
+        Le pivot anglais est calculé une seule fois pour toutes les langues qui
+        passent par lui et enregistré comme traduction 'en' ; les langues ayant
+        un pack direct FR -> X sont traduites depuis le français.
+        
+        Args:
+            progress_callback: Appelé avec (langue, index, total) avant chaque langue
+            result_callback: Appelé avec la langue dès que sa traduction (ou son
+                             message d'erreur) est enregistrée, pivot 'en' compris
+        
+        Returns:
+            Dict langue -> nombre de paragraphes effectivement traduits
+        """
+        counts = {lang: 0 for lang in target_langs}
+        if not chapter.content_fr.strip():
+            return counts
+        
+        def stored(lang):
+            if result_callback:
+                result_callback(lang)
+        
+        if not self.available:
+            # Traducteur indisponible : message d'erreur comme avant
+            for lang in target_langs:
+                chapter.set_translation(lang, self.translate(chapter.content_fr, lang))
+                stored(lang)
+            return counts
+        
+        plan = self.plan_chapter(chapter, target_langs)
+        paragraphs = plan['paragraphs']
+        needed = plan['pivot_needed']
+        skipped_before = self._thread_skipped()
+        
+        pivot_error = None
+        if plan['pivot_used']:
+            # Pendant le pivot, charger déjà le modèle de la première langue
+            self._prefetch_next(plan, 0)
+            if progress_callback and 'en' in target_langs:
+                progress_callback('en', 0, len(target_langs))
+            try:
+                if needed:
+                    paragraphs_en = self._translate_route_batch([paragraphs[i] for i in needed], 'fr', 'en')
+                    plan['pivot'].update(zip(needed, paragraphs_en))
+                self.store_plan_result(chapter, plan, 'en', plan['pivot'])
+                counts['en'] = len(needed)
+            except Exception as e:
+                pivot_error = str(e)[:50]
+                chapter.set_translation('en', f"[Erreur traduction EN: {pivot_error}]")
+            stored('en')
+        
+        for position, lang in enumerate(plan['langs']):
+            if progress_callback:
+                progress_callback(lang, position + (1 if 'en' in target_langs else 0), len(target_langs))
+            
+            if lang not in self.installed_languages:
+                chapter.set_translation(lang, f"[Langue {lang.upper()} non installee]")
+                stored(lang)
+                continue
+            
+            if plan['sources'][lang] == 'en' and pivot_error is not None:
+                chapter.set_translation(lang, f"[Erreur traduction {lang.upper()}: {pivot_error}]")
+                stored(lang)
+                continue
+            
+            missing = plan['missing'][lang]
+            # Pendant cette langue, charger le modèle de la suivante
+            self._prefetch_next(plan, position + 1)
+            try:
+                lines = []
+                if missing:
+                    lines = self._translate_route_batch(self.plan_inputs(plan, lang, missing),
+                                                        plan['sources'][lang], lang, plan['targets'])
+            except Exception as e:
+                chapter.set_translation(lang, f"[Erreur traduction {lang.upper()}: {str(e)[:50]}]")
+                stored(lang)
+                continue
+            
+            self.store_plan_result(chapter, plan, lang, dict(zip(missing, lines)))
+            counts[lang] = len(missing)
+            stored(lang)
+        
+        self._report_chapter_skips(chapter, self._thread_skipped() - skipped_before)
+        return counts
+    
+    def _stream_chunks(self, indices: List[int]) -> Iterator[List[int]]:
+        """Découpe en lots croissants : premier résultat immédiat, puis lots efficaces"""
+        size = 1
+        position = 0
+        while position < len(indices):
+            yield indices[position:position + size]
+            position += size
+            size = min(size * 2, STREAM_MAX_CHUNK)
+    
+    def translate_stream(self, text: str, target_lang: str) -> Iterator[Tuple[int, str]]:
+        """
+        Traduit un texte en produisant chaque paragraphe dès qu'il est prêt
+        
+        Yields:
+            (index du paragraphe, paragraphe traduit), dans l'ordre du texte
+        """
+        if not self.available or not text or not text.strip() or target_lang not in self.installed_languages:
+            yield 0, self.translate(text, target_lang)
+            return
+        
+        paragraphs = text.split('\n')
+        for chunk in self._stream_chunks(list(range(len(paragraphs)))):
+            try:
+                translated = self._translate_batch([paragraphs[i] for i in chunk], target_lang)
+            except Exception as e:
+                yield chunk[0], f"[Erreur traduction {target_lang.upper()}: {str(e)[:50]}]"
+                return
+            for i, paragraph in zip(chunk, translated):
+                yield i, paragraph
+    
+    def translate_chapter_stream(self, chapter, target_langs: List[str]) -> Iterator[Tuple[str, Optional[int], str]]:
+        """
+        Retraduit un chapitre (incrémental, routes de plan_chapter) en produisant les
+        paragraphes au fil de l'eau, pour un affichage progressif
+        
+        Les paragraphes réutilisables sont produits immédiatement, puis les
+        paragraphes à traduire par lots croissants, toutes langues confondues.
+        Les traductions sont enregistrées dans le chapitre à la fin.
+        
+        Yields:
+            (langue, index du paragraphe, texte). Un index None signifie que le
+            texte remplace toute la traduction (message d'erreur).
+        """
+        if not chapter.content_fr.strip():
+            return
+        
+        if not self.available:
+            for lang in target_langs:
+                message = self.translate(chapter.content_fr, lang)
+                chapter.set_translation(lang, message)
+                yield lang, None, message
+            return
+        
+        plan = self.plan_chapter(chapter, target_langs)
+        pivot_needed = set(plan['pivot_needed'])
+        skipped_before = self._thread_skipped()
+        
+        active = []
+        for lang in (['en'] if plan['pivot_used'] else []) + plan['langs']:
+            if lang != 'en' and lang not in self.installed_languages:
+                message = f"[Langue {lang.upper()} non installee]"
+                chapter.set_translation(lang, message)
+                yield lang, None, message
+                continue
+            active.append(lang)
+            for i, paragraph in sorted(plan['reusable'][lang].items()):
+                yield lang, i, paragraph
+        
+        translated = {lang: {} for lang in active}
+        missing = {lang: set(plan['missing'][lang]) for lang in active}
+        failed = set()
+        
+        for chunk in self._stream_chunks(sorted(set().union(*missing.values()))):
+            pivot_todo = [i for i in chunk if i in pivot_needed and i not in plan['pivot']]
+            try:
+                if pivot_todo and 'en' not in failed:
+                    paragraphs_en = self._translate_route_batch([plan['paragraphs'][i] for i in pivot_todo],
+                                                                'fr', 'en')
+                    plan['pivot'].update(zip(pivot_todo, paragraphs_en))
+            except Exception as e:
+                # Seules les langues passant par le pivot anglais sont perdues
+                for lang in active:
+                    if lang not in failed and (lang == 'en' or plan['sources'][lang] == 'en'):
+                        failed.add(lang)
+                        message = f"[Erreur traduction {lang.upper()}: {str(e)[:50]}]"
+                        chapter.set_translation(lang, message)
+                        yield lang, None, message
+            
+            for lang in active:
+                indices = [i for i in chunk if i in missing[lang]]
+                if lang in failed or not indices:
+                    continue
+                try:
+                    if lang == 'en':
+                        lines = [plan['pivot'][i] for i in indices]
+                    else:
+                        lines = self._translate_route_batch(self.plan_inputs(plan, lang, indices),
+                                                            plan['sources'][lang], lang, plan['targets'])
+                except Exception as e:
+                    failed.add(lang)
+                    message = f"[Erreur traduction {lang.upper()}: {str(e)[:50]}]"
+                    chapter.set_translation(lang, message)
+                    yield lang, None, message
+                    continue
+                
+                translated[lang].update(zip(indices, lines))
+                for i, line in zip(indices, lines):
+                    yield lang, i, line
+        
+        for lang in active:
+            if lang not in failed:
+                self.store_plan_result(chapter, plan, lang, translated[lang])
+        self._report_chapter_skips(chapter, self._thread_skipped() - skipped_before)
+    
+    def plan_chapter(self, chapter, target_langs: List[str]) -> Dict:
+        """
+        Prépare la retraduction incrémentale d'un chapitre
+        
+        Returns:
+            Dict avec :
+            - paragraphs: paragraphes source actuels
+            - source_hashes: hash de ces paragraphes
+            - targets: langues demandées (lot dont les routes sont planifiées ensemble)
+            - langs: langues cibles hors 'en'
+            - sources: Dict langue -> langue de départ ('en' = pivot, 'fr' = route directe)
+            - reusable: Dict langue -> {index: traduction encore valide}
+            - missing: Dict langue -> indices à traduire (depuis sa langue de départ)
+            - pivot_used: le pivot anglais est demandé ou sert à une langue cible
+            - pivot: {index: texte anglais} déjà connu (EN à jour)
+            - pivot_needed: indices à traduire FR -> EN
+        """
+        paragraphs = chapter.get_source_paragraphs()
+        langs = [lang for lang in target_langs if lang != 'en']
+        sources = {lang: self.get_source_lang(lang, target_langs) for lang in langs}
+        reusable = {lang: chapter.plan_retranslation(lang)[1] for lang in ['en'] + langs}
+        missing = {lang: [i for i in range(len(paragraphs)) if i not in reusable[lang]]
+                   for lang in ['en'] + langs}
+        
+        # Pivot anglais : réutiliser la traduction EN existante quand elle est à jour
+        pivot_used = self.needs_pivot(target_langs)
+        pivot = dict(reusable['en'])
+        needed = set()
+        if pivot_used:
+            needed.update(missing['en'])
+            for lang in langs:
+                if sources[lang] == 'en':
+                    needed.update(missing[lang])
+        
+        return {
+            'paragraphs': paragraphs,
+            'source_hashes': chapter.get_source_hashes(),
+            'targets': list(target_langs),
+            'langs': langs,
+            'sources': sources,
+            'reusable': reusable,
+            'missing': missing,
+            'pivot_used': pivot_used,
+            'pivot': pivot,
+            'pivot_needed': sorted(i for i in needed if i not in pivot)
+        }
+    
+    def plan_inputs(self, plan: Dict, lang: str, indices: List[int]) -> List[str]:
+        """Textes à traduire pour une langue : pivot anglais ou paragraphes français"""
+        if plan['sources'][lang] == 'en':
+            return [plan['pivot'][i] for i in indices]
+        return [plan['paragraphs'][i] for i in indices]
+    
+    def store_plan_result(self, chapter, plan: Dict, lang: str, translated: Dict[int, str]):
+        """Fusionne les paragraphes traduits avec les paragraphes réutilisés et enregistre"""
+        result = dict(plan['reusable'][lang])
+        result.update(translated)
+        chapter.set_translation(lang, '\n'.join(result[i] for i in range(len(plan['paragraphs']))),
+                                source_hashes=plan['source_hashes'])
+    
     def get_language_name(self, code: str) -> str:
         """Retourne le nom complet de la langue"""
         names = {
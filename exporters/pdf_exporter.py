@@ -16,6 +16,7 @@ import os
 # Ajouter le chemin parent pour importer i18n
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 from core.i18n import I18n
+from core.char_normalizer import normalize
 
 class PDFExporter:
     """Exporte le livre en PDF avec support Unicode complet"""
@@ -144,43 +145,15 @@ class PDFExporter:
             print(f"⚠️ Polices Unicode non disponibles pour {lang}, utilisation Helvetica")
             return 'Helvetica'
     
-    def _clean_text_for_cid(self, text: str, lang: str) -> str:
+    def _clean_text_for_cid(self, text: str, lang: str, font_name=None, markup=False) -> str:
         """Nettoie le texte pour les polices CID (Chinois/Japonais/Coréen)
         
         🔧 AJOUT 22/01/2026 : Remplacement automatique des caractères non-CID
         Les polices CID ne supportent que leur script natif, pas les caractères latins/symboles
+        Table commune (core.char_normalizer) appliquée en un seul str.translate ;
+        markup=True échappe aussi &, < et > dans le même passage.
         """
-        # Langues CID nécessitant nettoyage
-        if lang not in ['zh', 'ja', 'ko']:
-            return text
-        
-        if not text or not text.strip():
-            return text
-        
-        # Remplacements automatiques pour compatibilité CID
-        replacements = {
-            '·': ' ',           # Point médian → espace
-            '•': ' ',           # Bullet → espace
-            '–': '-',           # Tiret cadratin → tiret simple
-            '—': '-',           # Tiret long → tiret simple
-            ''': "'",           # Guillemet courbe → guillemet droit
-            ''': "'",           # Guillemet courbe → guillemet droit
-            '"': '"',           # Guillemet double courbe → droit
-            '"': '"',           # Guillemet double courbe → droit
-            '…': '...',         # Points de suspension → trois points
-            '€': 'EUR',         # Symbole euro → texte
-            '£': 'GBP',         # Livre sterling → texte
-            '§': '',            # Paragraphe → vide
-            '©': '(C)',         # Copyright → texte
-            '®': '(R)',         # Registered → texte
-            '™': '(TM)',        # Trademark → texte
-        }
-        
-        cleaned_text = text
-        for old_char, new_char in replacements.items():
-            cleaned_text = cleaned_text.replace(old_char, new_char)
-        
-        return cleaned_text
+        return normalize(text, lang, font_name, markup)
     
     def export(self, book_manager, output_dir: Path, lang='fr') -> Path:
         """
@@ -259,18 +232,18 @@ class PDFExporter:
         story = []
         
         # Page de titre (nettoyage CID si nécessaire)
-        clean_title = self._clean_text_for_cid(book_manager.title, lang)
+        clean_title = self._clean_text_for_cid(book_manager.title, lang, font_name)
         story.append(Paragraph(clean_title, title_style))
         
         # Auteur avec traduction "Par" / "By" / etc. (nettoyage CID si nécessaire)
         by_text = I18n.get('by', lang)
-        clean_author = self._clean_text_for_cid(book_manager.author, lang)
+        clean_author = self._clean_text_for_cid(book_manager.author, lang, font_name)
         story.append(Paragraph(f"{by_text} {clean_author}", author_style))
         story.append(Spacer(1, 2*cm))
         
         # Sous-titre traduit (nettoyage CID si nécessaire)
         subtitle = I18n.get('subtitle', lang)
-        clean_subtitle = self._clean_text_for_cid(subtitle, lang)
+        clean_subtitle = self._clean_text_for_cid(subtitle, lang, font_name)
         story.append(Paragraph(clean_subtitle, body_style))
         story.append(PageBreak())
         
@@ -279,7 +252,7 @@ class PDFExporter:
             # Titre du chapitre avec traduction (nettoyage CID si nécessaire)
             chapter_num = I18n.get_chapter_number(i+1, lang)
             chapter_title = chapter.get_title_translation(lang)
-            clean_chapter_title = self._clean_text_for_cid(chapter_title, lang)
+            clean_chapter_title = self._clean_text_for_cid(chapter_title, lang, font_name)
             story.append(Paragraph(f"{chapter_num}: {clean_chapter_title}", chapter_title_style))
             
             # Contenu selon la langue
@@ -289,20 +262,18 @@ class PDFExporter:
                 content = chapter.get_translation(lang)
             
             if content and content.strip():
-                # Nettoyage CID sur tout le contenu si nécessaire
-                content = self._clean_text_for_cid(content, lang)
+                # Nettoyage CID + échappement des caractères spéciaux, en un passage
+                content = self._clean_text_for_cid(content, lang, font_name, markup=True)
                 
                 # Diviser en paragraphes
                 paragraphs = content.split('\n\n')
                 for para in paragraphs:
                     if para.strip():
-                        # Échapper les caractères spéciaux
-                        para_clean = para.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
-                        story.append(Paragraph(para_clean, body_style))
+                        story.append(Paragraph(para, body_style))
             else:
                 # Texte "chapitre vide" traduit
                 empty_text = I18n.get('empty_chapter', lang)
-                clean_empty_text = self._clean_text_for_cid(empty_text, lang)
+                clean_empty_text = self._clean_text_for_cid(empty_text, lang, font_name)
                 story.append(Paragraph(clean_empty_text, body_style))
             
             # Page break après chaque chapitre (sauf le dernier)
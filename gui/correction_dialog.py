@@ -193,9 +193,11 @@ class CorrectionDialog:
         
         # Sauvegarder texte corrigé
         if self.lang_code == 'fr':
-            self.chapter.content_fr = fixed_text
+            self.chapter.update_content(fixed_text)
         else:
-            self.chapter.set_translation(self.lang_code, fixed_text)
+            # Les corrections conservent les lignes : garder la provenance des paragraphes
+            self.chapter.set_translation(self.lang_code, fixed_text,
+                                         source_hashes=self.chapter.get_translation_sources(self.lang_code))
         
         self.corrections_applied = True
         self.auto_fix_btn['state'] = tk.DISABLED
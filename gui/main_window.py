@@ -9,7 +9,13 @@ from pathlib import Path
 import json
 
 from core.book_manager import BookManager
-from core.translator import Translator
+from core.translator import TARGET_LANGS, Translator
+from core.translation_config import load_translation_config
+from core.translation_engine import TranslationEngine
+from core.translation_queue import TranslationQueue
+from core.translation_farm import FarmCoordinator
+from core.live_translator import LiveTranslator
+from core.quality_scan import QualityScanner
 from core.security_checker import SecurityChecker, SecurityAlert
 from core.autosave import AutoSave
 from core.story_coach import StoryCoach
@@ -25,6 +31,7 @@ from exporters.epub_exporter import EPUBExporter
 from exporters.docx_exporter import DOCXExporter
 from exporters.kdp_exporter import KDPExporter
 from gui.correction_dialog import CorrectionDialog
+from gui.quality_report_dialog import QualityReportDialog
 
 class BookWriterApp:
     """Application principale Book Writer Pro"""
@@ -40,6 +47,24 @@ class BookWriterApp:
         # Managers
         self.book_manager = BookManager()
         self.translator = Translator()
+        self.translation_config = load_translation_config()
+        self.translation_queue = TranslationQueue()
+        self.translation_farm = None
+        if self.translation_config.get('farm'):
+            # Coordinateur : "Tout traduire" part vers les machines travailleuses
+            try:
+                self.translation_farm = FarmCoordinator()
+                self.translation_farm.start()
+            except Exception as e:
+                print(f"[!] Ferme de traduction indisponible : {e}")
+                self.translation_farm = None
+        self.translation_engine = TranslationEngine(
+            self.translator,
+            workers=self.translation_config['workers'],
+            threads_per_worker=self.translation_config['threads_per_worker'],
+            queue=self.translation_queue,
+            farm=self.translation_farm)
+        self.quality_scanner = QualityScanner()
         self.security_checker = SecurityChecker()
         self.story_coach = StoryCoach()
         self.cover_generator = CoverGenerator()
@@ -52,11 +77,15 @@ class BookWriterApp:
         self.translating = False
         
         # Auto-save
-        self.autosave = AutoSave(self._do_autosave, interval=30)
+        self.autosave = AutoSave(self._do_autosave, self.book_manager.get_revision, interval=30)
         
         # Charger livre existant
         self.book_manager.load()
         
+        # Traductions terminées avant une interruption mais jamais sauvegardées
+        if self.translation_queue.restore(self.book_manager.chapters, self.book_manager.get_book_key()):
+            self.book_manager.save()
+        
         # Créer l'interface
         self._create_ui()
         
@@ -66,6 +95,24 @@ class BookWriterApp:
         # Mettre à jour l'interface
         self._update_chapter_tree()
         self._update_stats()
+        
+        # Proposer de reprendre une traduction interrompue
+        self.root.after(500, self._offer_translation_resume)
+        
+        # Préchauffer les modèles quand l'interface est au repos
+        self._warm_up_cancel = threading.Event()
+        self.root.after_idle(lambda: self.root.after(1000, self._start_warm_up))
+        
+        # Traduction en direct (optionnelle) des paragraphes terminés
+        self.live_translator = None
+        if self.translation_config.get('live_translation'):
+            self.live_translator = LiveTranslator(
+                self.translator, self.translation_config.get('live_translation_delay', 5),
+                busy=lambda: self.translating or self.translation_engine.is_busy(),
+                default_langs=self._get_used_target_langs,
+                route_langs=TARGET_LANGS)
+            if not self.live_translator.start():
+                self.live_translator = None
     
     def _create_ui(self):
         """Crée l'interface utilisateur"""
@@ -175,6 +222,8 @@ class BookWriterApp:
                   command=self._translate_selection).pack(side=tk.LEFT, padx=5)
         ttk.Button(editor_btn_frame, text=_('button.check_quality'), 
                   command=self._check_translation_quality).pack(side=tk.LEFT, padx=5)
+        ttk.Button(editor_btn_frame, text=_('button.check_book_quality'), 
+                  command=self._check_book_quality).pack(side=tk.LEFT, padx=5)
         
         self.autosave_label = ttk.Label(editor_btn_frame, text=_('stats.autosave_never'))
         self.autosave_label.pack(side=tk.RIGHT, padx=5)
@@ -240,6 +289,10 @@ class BookWriterApp:
             content = self.editor.get('1.0', tk.END).strip()
             chapter.update_content(content)
             self._update_stats()
+            if self.live_translator is not None:
+                # Sans langues configurées : langues du livre, calculées par le thread
+                # de traduction en direct (jamais à chaque frappe)
+                self.live_translator.note_edit(chapter, self.translation_config.get('live_translation_langs') or None)
     
     def _check_security(self):
         """Vérifie le contenu pour alertes de sécurité (désactivé en version simplifiée)"""
@@ -282,6 +335,43 @@ class BookWriterApp:
                     text_widget.insert('1.0', translation)
                 text_widget.config(state='disabled')
     
+    def _prepare_streamed_translation(self, lang, paragraph_count):
+        """Vide l'onglet d'une langue et y place une ligne vide par paragraphe"""
+        text_widget = self.translation_texts.get(lang)
+        if text_widget is None:
+            return
+        text_widget.config(state='normal')
+        text_widget.delete('1.0', tk.END)
+        text_widget.insert('1.0', '\n' * max(0, paragraph_count - 1))
+        text_widget.config(state='disabled')
+    
+    def _show_streamed_paragraph(self, lang, index, text):
+        """Affiche un paragraphe traduit à sa place (index None : remplace tout l'onglet)"""
+        text_widget = self.translation_texts.get(lang)
+        if text_widget is None:
+            return
+        text_widget.config(state='normal')
+        if index is None:
+            text_widget.delete('1.0', tk.END)
+            text_widget.insert('1.0', text)
+        else:
+            line = index + 1
+            text_widget.delete(f'{line}.0', f'{line}.end')
+            text_widget.insert(f'{line}.0', text)
+        text_widget.config(state='disabled')
+    
+    def _refresh_translation_tab(self, chapter, lang):
+        """Recharge l'onglet d'une langue si le chapitre traduit est affiché"""
+        if chapter is not self.book_manager.get_current_chapter():
+            return
+        text_widget = self.translation_texts.get(lang)
+        if text_widget is None:
+            return
+        text_widget.config(state='normal')
+        text_widget.delete('1.0', tk.END)
+        text_widget.insert('1.0', chapter.get_translation(lang))
+        text_widget.config(state='disabled')
+    
     def _add_chapter(self):
         """Ajoute un nouveau chapitre"""
         title = tk.simpledialog.askstring(_('chapter.new_title'), 
@@ -321,28 +411,90 @@ class BookWriterApp:
         """Effectue la traduction (dans un thread)"""
         try:
             total = len(self.book_manager.chapters)
-            for i, chapter in enumerate(self.book_manager.chapters):
-                if not chapter.content_fr.strip():
-                    continue
-                
-                self.root.after(0, lambda i=i, t=total: self.stats_label.config(
-                    text=_('translation.translating', current=i+1, total=t)))
-                
-                for lang in ['en', 'es', 'it', 'ru', 'ja', 'zh', 'hi', 'ar', 'de', 'pt', 'tr', 'ko', 'id', 'vi', 'pl', 'th']:
-                    translation = self.translator.translate(chapter.content_fr, lang)
-                    chapter.set_translation(lang, translation)
+            
+            def on_progress(done, t):
+                self.root.after(0, lambda d=done, t=t: self.stats_label.config(
+                    text=_('translation.translating', current=d, total=t)))
+            
+            langs = list(TARGET_LANGS)
+            
+            # Chapitres x langues répartis sur le pool de processus (pivot FR -> EN calculé
+            # une seule fois par chapitre, seuls les paragraphes modifiés sont retraduits)
+            def on_result(chapter, lang):
+                # Affichage au fil de l'eau si le chapitre traduit est celui affiché
+                self.root.after(0, lambda c=chapter, l=lang: self._refresh_translation_tab(c, l))
+            
+            # Clé de la file persistante : le livre ouvert au lancement de la traduction
+            book_key = self.book_manager.get_book_key()
+            self.translation_engine.translate_book(self.book_manager.chapters, langs,
+                                                   progress_callback=on_progress,
+                                                   result_callback=on_result,
+                                                   book_id=book_key)
+            
+            # Titres encore non traduits : un seul lot pour tout le livre
+            self._fill_missing_title_translations(self.book_manager.chapters, langs)
             
             self.root.after(0, lambda: messagebox.showinfo(_('success'), 
                                                            _('translation.success', total=total)))
             self.root.after(0, self._load_chapter_content)
             self.root.after(0, self._update_stats)
-            self.book_manager.save()
+            if self.book_manager.save().result():
+                # Tout est dans le livre sauvegardé : plus rien à reprendre
+                self.translation_queue.clear(book_key)
             
         except Exception as e:
             self.root.after(0, lambda: messagebox.showerror(_('error'), _('translation.error', error=str(e))))
         finally:
             self.translating = False
     
+    def _start_warm_up(self):
+        """Lance le préchauffage des modèles (FR -> EN + langues les plus traduites du livre)"""
+        if not self.translation_config.get('warm_up', True) or not self.translator.available:
+            return
+        
+        langs = self._get_used_target_langs()[:int(self.translation_config.get('warm_up_langs', 3))]
+        
+        def warm_up():
+            warmed = self.translator.warm_up(langs, self._warm_up_cancel)
+            if warmed:
+                print(f"[OK] Préchauffage : {warmed} modèle(s) prêt(s)")
+        
+        threading.Thread(target=warm_up, daemon=True).start()
+    
+    def _get_used_target_langs(self):
+        """Langues cibles du livre (hors 'en'), de la plus traduite à la moins traduite"""
+        # Nombre de chapitres déjà traduits (hors messages d'erreur)
+        usage = {}
+        for chapter in list(self.book_manager.chapters):
+            for lang in chapter.get_translated_langs():
+                if lang != 'en':
+                    usage[lang] = usage.get(lang, 0) + 1
+        return sorted(usage, key=usage.get, reverse=True)
+    
+    def _offer_translation_resume(self):
+        """Propose de reprendre une traduction complète interrompue"""
+        pending = self.translation_queue.get_pending(self.book_manager.get_book_key())
+        if not pending:
+            return
+        if messagebox.askyesno(_('translation.resume_title'),
+                               _('translation.resume_prompt', count=len(pending))):
+            self._translate_all()
+        else:
+            self.translation_queue.clear(self.book_manager.get_book_key())
+    
+    def _fill_missing_title_translations(self, chapters, langs):
+        """Traduit en lot les titres de chapitres vides (ne remplace jamais un titre saisi)"""
+        todo = [c for c in chapters if any(not c.title_translations.get(lang) for lang in langs)]
+        if not todo:
+            return
+        
+        results = self.translator.translate_titles([c.title for c in todo], langs)
+        for lang, titles in results.items():
+            for chapter, title in zip(todo, titles):
+                # Les messages d'erreur du traducteur sont entre crochets
+                if not chapter.title_translations.get(lang) and title and not title.startswith('['):
+                    chapter.set_title_translation(lang, title)
+    
     def _translate_selection(self):
         """Traduit le chapitre courant vers des langues sélectionnées"""
         chapter = self.book_manager.get_current_chapter()
@@ -510,24 +662,33 @@ class BookWriterApp:
             self.root.after(0, lambda: progress_label.config(
                 text=_('translation.of_languages', total=total)))
             
-            for i, lang in enumerate(selected_langs):
-                # Mise à jour de la barre de progression
-                progress_percent = int((i / total) * 100)
-                self.root.after(0, lambda p=progress_percent: progress_bar.config(value=p))
-                
-                # Mise à jour du label
-                lang_name = _('language.name.' + lang)
-                
-                self.root.after(0, lambda i=i, t=total, ln=lang_name: progress_label.config(
-                    text=_('translation.current', current=i+1, total=t, language=ln)))
+            # Affichage progressif : chaque onglet reçoit une ligne vide par paragraphe,
+            # remplie dès que le paragraphe traduit arrive
+            paragraph_count = len(chapter.get_source_paragraphs())
+            shown_langs = set(selected_langs) | ({'en'} if self.translator.needs_pivot(selected_langs) else set())
+            for lang in shown_langs:
+                self.root.after(0, lambda l=lang: self._prepare_streamed_translation(l, paragraph_count))
+            
+            expected = max(1, paragraph_count * len(shown_langs))
+            received = 0
+            last_lang = None
+            
+            # TRADUCTION (langues choisies, pivot EN commun, paragraphes modifiés uniquement !)
+            for lang, index, text in self.translator.translate_chapter_stream(chapter, selected_langs):
+                self.root.after(0, lambda l=lang, i=index, t=text: self._show_streamed_paragraph(l, i, t))
                 
-                # Mise à jour du label de stats en bas aussi
-                self.root.after(0, lambda i=i, t=total, l=lang: self.stats_label.config(
-                    text=_('translation.current_short', current=i+1, total=t, code=l.upper())))
+                received += paragraph_count if index is None else 1
+                progress_percent = min(99, int(received / expected * 100))
+                self.root.after(0, lambda p=progress_percent: progress_bar.config(value=p))
                 
-                # TRADUCTION (seulement cette langue !)
-                translation = self.translator.translate(chapter.content_fr, lang)
-                chapter.set_translation(lang, translation)
+                if lang != last_lang and lang in selected_langs:
+                    last_lang = lang
+                    position = selected_langs.index(lang)
+                    lang_name = _('language.name.' + lang)
+                    self.root.after(0, lambda i=position, t=total, ln=lang_name: progress_label.config(
+                        text=_('translation.current', current=i+1, total=t, language=ln)))
+                    self.root.after(0, lambda i=position, t=total, l=lang: self.stats_label.config(
+                        text=_('translation.current_short', current=i+1, total=t, code=l.upper())))
             
             # Finaliser la barre à 100%
             self.root.after(0, lambda: progress_bar.config(value=100))
@@ -535,7 +696,7 @@ class BookWriterApp:
                 text=_('translation.completed', total=total)))
             
             # Sauvegarder AVANT de fermer la fenêtre
-            self.book_manager.save()
+            self.book_manager.save().result()
             
             # Attendre un peu pour que l'utilisateur voie le 100%
             import time
@@ -650,6 +811,19 @@ class BookWriterApp:
         # Ouvrir le dialogue de correction
         CorrectionDialog(self.root, chapter, lang_code, lang_name)
     
+    def _check_book_quality(self):
+        """Ouvre le rapport qualité de tout le livre (chapitres x langues)"""
+        if not self.book_manager.chapters:
+            messagebox.showwarning(_('attention'), _('quality.no_chapter'))
+            return
+        
+        def on_fixed():
+            self.book_manager.save()
+            self._load_chapter_content()
+        
+        QualityReportDialog(self.root, self.book_manager.chapters, list(self.translation_texts),
+                            self.quality_scanner, self.translator.get_language_name, on_fixed)
+    
     def _import_conversations(self):
         """Importe des conversations"""
         files = filedialog.askopenfilenames(
@@ -808,16 +982,24 @@ class BookWriterApp:
             self.autosave_label.config(text=_('stats.autosave_ago', seconds=elapsed))
     
     def _manual_save(self):
-        """Sauvegarde manuelle"""
-        if self.book_manager.save():
-            messagebox.showinfo(_('success'), _('save.manual_success'))
-            self.autosave.last_save_time = 0
-            self._update_stats()
+        """Sauvegarde manuelle (écriture en arrière-plan, confirmation à la fin)"""
+        def on_saved(future):
+            if future.result():
+                self.root.after(0, self._manual_save_done)
+        
+        self.book_manager.save().add_done_callback(on_saved)
+    
+    def _manual_save_done(self):
+        """Sauvegarde manuelle écrite sur disque"""
+        messagebox.showinfo(_('success'), _('save.manual_success'))
+        self.autosave.last_save_time = 0
+        self._update_stats()
     
     def _do_autosave(self):
         """Effectue la sauvegarde automatique"""
-        self.book_manager.save()
+        saved = self.book_manager.save().result()
         self.root.after(0, self._update_stats)
+        return saved
     
     def run(self):
         """Lance l'application"""
@@ -917,6 +1099,21 @@ class BookWriterApp:
                 for entry in entries.values():
                     entry.delete(0, tk.END)
         
+        def auto_translate():
+            if not self.translator.available:
+                messagebox.showerror(_('error'), _('translation.not_available'))
+                return
+            
+            # Remplir uniquement les champs vides (un seul lot, pivot EN commun)
+            empty_langs = [code for code, entry in entries.items() if not entry.get().strip()]
+            results = self.translator.translate_titles([chapter.title], empty_langs)
+            for lang_code in empty_langs:
+                title = results[lang_code][0]
+                if title and not title.startswith('['):
+                    entries[lang_code].insert(0, title)
+        
+        ttk.Button(btn_frame, text=_('translate_title.auto'), 
+                  command=auto_translate).pack(side=tk.LEFT, padx=5)
         ttk.Button(btn_frame, text=_('button.save'), 
                   command=save_translations).pack(side=tk.LEFT, padx=5)
         ttk.Button(btn_frame, text=_('button.delete'), 
@@ -959,8 +1156,7 @@ class BookWriterApp:
         btn_frame.grid(row=3, column=0, columnspan=2, pady=10)
         
         def save_settings():
-            self.book_manager.title = title_entry.get().strip()
-            self.book_manager.author = author_entry.get().strip()
+            self.book_manager.set_book_info(title_entry.get().strip(), author_entry.get().strip())
             self.book_manager.save()
             messagebox.showinfo(_('success'), _('settings.save_success'))
             settings_window.destroy()
@@ -980,8 +1176,15 @@ class BookWriterApp:
     
     def _on_close(self):
         """Appele a la fermeture"""
+        self._warm_up_cancel.set()
+        if self.live_translator is not None:
+            self.live_translator.stop()
         self.autosave.stop()
-        self.book_manager.save()
+        # Replier le journal : le livre repart d'un seul fichier au prochain lancement
+        self.book_manager.save(compact=True).result()
+        self.translation_engine.shutdown()
+        if self.translation_farm is not None:
+            self.translation_farm.shutdown()
         self.root.destroy()
 
 
@@ -0,0 +1,193 @@
+"""
+Quality Report Dialog - Vérification qualité de tout le livre
+Tableau chapitres x langues du nombre d'erreurs détectées, correction
+automatique en masse. L'analyse tourne hors du thread Tk.
+"""
+import tkinter as tk
+from tkinter import ttk, messagebox
+import threading
+
+from core.i18n_gui import _
+from gui.correction_dialog import CorrectionDialog
+
+class QualityReportDialog:
+    """Rapport qualité consolidé (chapitre x langue)"""
+
+    def __init__(self, parent, chapters, langs, scanner, get_language_name, on_fixed=None):
+        """
+        Args:
+            chapters: Chapitres du livre
+            langs: Langues à vérifier
+            scanner: QualityScanner (cache partagé entre les vérifications)
+            get_language_name: Code langue -> nom affiché
+            on_fixed: Appelé (thread Tk) après des corrections automatiques
+        """
+        self.parent = parent
+        self.chapters = chapters
+        self.langs = langs
+        self.scanner = scanner
+        self.get_language_name = get_language_name
+        self.on_fixed = on_fixed
+        self.report = None
+        self.busy = False
+
+        self.dialog = tk.Toplevel(parent)
+        self.dialog.title(_('book_quality.window_title'))
+        self.dialog.geometry("1100x600")
+        self.dialog.transient(parent)
+
+        self._create_widgets()
+        self._start_scan()
+
+    def _create_widgets(self):
+        """Crée l'interface"""
+        main_frame = ttk.Frame(self.dialog, padding="10")
+        main_frame.pack(fill=tk.BOTH, expand=True)
+
+        ttk.Label(main_frame, text=_('book_quality.header'),
+                  font=('Arial', 14, 'bold')).pack(pady=(0, 10))
+
+        # Tableau : une ligne par chapitre, une colonne par langue
+        table_frame = ttk.Frame(main_frame)
+        table_frame.pack(fill=tk.BOTH, expand=True)
+
+        columns = ['total'] + self.langs
+        self.table = ttk.Treeview(table_frame, columns=columns, show='tree headings')
+        self.table.heading('#0', text=_('book_quality.column_chapter'))
+        self.table.column('#0', width=220, stretch=False)
+        self.table.heading('total', text=_('book_quality.column_total'))
+        self.table.column('total', width=50, anchor=tk.CENTER, stretch=False)
+        for lang in self.langs:
+            self.table.heading(lang, text=lang.upper())
+            self.table.column(lang, width=45, anchor=tk.CENTER, stretch=False)
+
+        x_scroll = ttk.Scrollbar(table_frame, orient=tk.HORIZONTAL, command=self.table.xview)
+        y_scroll = ttk.Scrollbar(table_frame, orient=tk.VERTICAL, command=self.table.yview)
+        self.table.configure(xscrollcommand=x_scroll.set, yscrollcommand=y_scroll.set)
+        y_scroll.pack(side=tk.RIGHT, fill=tk.Y)
+        x_scroll.pack(side=tk.BOTTOM, fill=tk.X)
+        self.table.pack(fill=tk.BOTH, expand=True)
+
+        self.table.tag_configure('errors', foreground='red')
+        self.table.tag_configure('clean', foreground='green')
+        self.table.bind('<Double-1>', self._open_cell)
+
+        ttk.Label(main_frame, text=_('book_quality.legend'),
+                  font=('Arial', 9), foreground='gray').pack(anchor=tk.W, pady=(5, 0))
+
+        self.progress = ttk.Progressbar(main_frame, mode='determinate')
+        self.progress.pack(fill=tk.X, pady=(10, 0))
+        self.status_label = ttk.Label(main_frame, text="")
+        self.status_label.pack(anchor=tk.W, pady=(5, 0))
+
+        button_frame = ttk.Frame(main_frame)
+        button_frame.pack(fill=tk.X, pady=(10, 0))
+
+        self.fix_btn = ttk.Button(button_frame, text=_('book_quality.fix_all'),
+                                  command=self._start_fix_all, state=tk.DISABLED)
+        self.fix_btn.pack(side=tk.LEFT, padx=(0, 5))
+        self.rescan_btn = ttk.Button(button_frame, text=_('book_quality.rescan'),
+                                     command=self._start_scan, state=tk.DISABLED)
+        self.rescan_btn.pack(side=tk.LEFT, padx=5)
+        ttk.Button(button_frame, text=_('button.close'), command=self.dialog.destroy).pack(side=tk.RIGHT)
+
+    def _set_progress(self, done, total):
+        """Mise à jour de la progression (appelée depuis un thread de travail)"""
+        try:
+            self.dialog.after(0, lambda: self.progress.config(value=done * 100 / max(total, 1)))
+        except tk.TclError:
+            pass  # Dialogue fermé pendant l'analyse
+
+    def _set_busy(self, busy, message):
+        """Active/désactive les boutons pendant une analyse ou une correction"""
+        self.busy = busy
+        state = tk.DISABLED if busy else tk.NORMAL
+        self.rescan_btn.config(state=state)
+        self.fix_btn.config(state=tk.DISABLED if busy or not self._has_fixable() else tk.NORMAL)
+        self.status_label.config(text=message)
+
+    def _has_fixable(self):
+        """Au moins une traduction avec une erreur corrigeable automatiquement"""
+        return self.report is not None and any(
+            error['auto_fixable'] for result in self.report['results'].values() for error in result['errors'])
+
+    def _start_scan(self):
+        """Lance la vérification dans un thread (pool de processus)"""
+        if self.busy:
+            return
+        self.progress.config(value=0)
+        self._set_busy(True, _('book_quality.scanning'))
+
+        def scan():
+            try:
+                report = self.scanner.scan(self.chapters, self.langs, self._set_progress)
+                self.dialog.after(0, lambda: self._show_report(report))
+            except Exception as e:
+                self.dialog.after(0, lambda error=e: self._set_busy(False, _('book_quality.scan_error', error=error)))
+
+        threading.Thread(target=scan, daemon=True).start()
+
+    def _show_report(self, report):
+        """Remplit le tableau chapitre x langue"""
+        if not self.dialog.winfo_exists():
+            return
+        self.report = report
+        self.progress.config(value=100)
+        self.table.delete(*self.table.get_children())
+
+        total_errors = 0
+        for i, chapter in enumerate(self.chapters):
+            row = report['matrix'][chapter.id]
+            chapter_errors = sum(count for count in row.values() if count)
+            total_errors += chapter_errors
+            values = [chapter_errors] + ['-' if row[lang] is None else (row[lang] or '✓') for lang in self.langs]
+            self.table.insert('', 'end', iid=str(i), text=_('book_quality.chapter_row', number=i + 1, title=chapter.title), values=values,
+                              tags=('errors' if chapter_errors else 'clean',))
+
+        self._set_busy(False, _('book_quality.summary', errors=total_errors, scanned=report['scanned'],
+                                cached=report['cached'], seconds=f"{report['seconds']:.1f}"))
+
+    def _start_fix_all(self):
+        """Applique les corrections automatiques à tout le livre"""
+        if self.busy or not messagebox.askyesno(
+                _('book_quality.fix_title'), _('book_quality.fix_confirm'),
+                parent=self.dialog):
+            return
+        self.progress.config(value=0)
+        self._set_busy(True, _('book_quality.fixing'))
+
+        def fix():
+            try:
+                applied = self.scanner.auto_fix_all(self.chapters, self.report, self._set_progress)
+                self.dialog.after(0, lambda: self._fixed(applied))
+            except Exception as e:
+                self.dialog.after(0, lambda error=e: self._set_busy(False, _('book_quality.fix_error', error=error)))
+
+        threading.Thread(target=fix, daemon=True).start()
+
+    def _fixed(self, applied):
+        """Corrections terminées : prévenir l'application puis revérifier"""
+        corrections = sum(len(items) for items in applied.values())
+        if self.on_fixed and applied:
+            self.on_fixed()
+        self._set_busy(False, "")
+        messagebox.showinfo(_('success'), _('book_quality.fix_success', corrections=corrections,
+                                              translations=len(applied)), parent=self.dialog)
+        self._start_scan()
+
+    def _open_cell(self, event):
+        """Double-clic : détail et correction d'une traduction (dialogue existant)"""
+        row = self.table.identify_row(event.y)
+        column = self.table.identify_column(event.x)
+        index = int(column.lstrip('#') or 0) - 2  # #1 = total
+        if not row or self.busy or not 0 <= index < len(self.langs):
+            return
+        chapter = self.chapters[int(row)]
+        lang = self.langs[index]
+        if not chapter.get_translation(lang).strip():
+            return
+        correction = CorrectionDialog(self.dialog, chapter, lang, self.get_language_name(lang))
+        self.dialog.wait_window(correction.dialog)
+        if correction.corrections_applied and self.on_fixed:
+            self.on_fixed()
+        self._start_scan()
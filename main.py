@@ -8,6 +8,7 @@ Cree avec amour par Maman pour PHOBOS
 
 import sys
 import os
+import multiprocessing
 from pathlib import Path
 
 # Ajouter le repertoire parent au path
@@ -39,5 +40,7 @@ def main():
         sys.exit(1)
 
 if __name__ == "__main__":
+    # Requis pour le pool de traduction multi-processus dans l'EXE compile
+    multiprocessing.freeze_support()
     main()
 
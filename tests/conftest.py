@@ -0,0 +1,7 @@
+"""
+Configuration pytest : rend les paquets du dépôt (core, gui, ...) importables
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
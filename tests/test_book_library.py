@@ -0,0 +1,159 @@
+"""
+Tests de la bibliothèque SQLite : chargement paresseux des traductions et
+sauvegardes concurrentes des modifications
+"""
+import sys
+import threading
+
+import pytest
+
+from core import book_manager
+from core.book_library import BookLibrary
+from core.book_manager import BookManager
+from core.backup_store import BackupStore
+
+LANGS = ['en', 'de', 'es', 'it']
+
+def _manager(data_dir):
+    manager = BookManager()
+    manager.data_dir = data_dir
+    manager.backups = BackupStore(data_dir / "backups")
+    return manager
+
+@pytest.fixture
+def library_book(tmp_path):
+    """Livre JSON de 3 chapitres traduits, migré dans une bibliothèque"""
+    manager = _manager(tmp_path)
+    for i in range(3):
+        chapter = manager.add_chapter(f"Chapitre {i}")
+        chapter.update_content(f"Bonjour {i}\nSuite")
+        for lang in LANGS:
+            chapter.set_translation(lang, f"{lang} {i}", chapter.get_source_hashes())
+    assert manager.save(compact=True).result()
+
+    library = BookLibrary(tmp_path / "library.db")
+    book_id = manager.migrate_to_library(library)
+    yield tmp_path, library, book_id
+    library.close()
+
+def test_migration_is_idempotent(library_book):
+    data_dir, library, book_id = library_book
+    assert _manager(data_dir).migrate_to_library(library) == book_id
+    assert [(book['id'], book['chapter_count']) for book in library.list_books()] == [(book_id, 3)]
+
+def test_translations_load_on_first_access(library_book):
+    data_dir, library, book_id = library_book
+    loaded = []
+    load_translation = library.load_translation
+    library.load_translation = lambda chapter_id, lang: (loaded.append(lang), load_translation(chapter_id, lang))[1]
+
+    manager = _manager(data_dir)
+    assert manager.open_library(library, book_id)
+    assert loaded == []
+    assert manager.chapters[1].get_translation('de') == "de 1"
+    assert loaded == ['de']
+
+def test_translations_set_during_saves_are_never_lost(library_book):
+    """set_translation entrelacé avec save() : chaque dernière traduction arrive en base"""
+    data_dir, library, book_id = library_book
+    manager = _manager(data_dir)
+    assert manager.open_library(library, book_id)
+
+    expected = {}
+    stop = threading.Event()
+
+    def translate():
+        for i in range(3000):
+            chapter = manager.chapters[i % 3]
+            lang = LANGS[(i // 3) % len(LANGS)]
+            chapter.set_translation(lang, f"{lang} v{i}")
+            expected[(chapter.id, lang)] = f"{lang} v{i}"
+        stop.set()
+
+    def save():
+        while not stop.is_set():
+            manager.save()
+
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)  # Maximiser les entrelacements
+    try:
+        threads = [threading.Thread(target=translate), threading.Thread(target=save)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        sys.setswitchinterval(interval)
+
+    assert manager.save().result()
+    assert not manager.is_dirty()
+    for (chapter_id, lang), text in expected.items():
+        assert library.load_translation(chapter_id, lang)[0] == text
+
+def test_save_between_revision_and_translation_record(library_book):
+    """Une sauvegarde qui tombe au milieu de set_translation ne perd pas la traduction"""
+    data_dir, library, book_id = library_book
+    manager = _manager(data_dir)
+    assert manager.open_library(library, book_id)
+    chapter = manager.chapters[0]
+    savers = []
+
+    class SaveWhileRecording(dict):
+        """Lance une sauvegarde juste avant l'enregistrement de la révision de la langue"""
+        def __setitem__(self, lang, revision):
+            saver = threading.Thread(target=lambda: manager.save().result())
+            saver.start()
+            saver.join(timeout=0.5)  # Bloquée par revision_lock si la publication est atomique
+            savers.append(saver)
+            super().__setitem__(lang, revision)
+
+    chapter._translation_revisions = SaveWhileRecording(chapter._translation_revisions)
+    chapter.set_translation('de', "nouveau")
+    for saver in savers:
+        saver.join()
+
+    assert manager.save().result()
+    assert library.load_translation(chapter.id, 'de')[0] == "nouveau"
+
+def test_imported_copies_do_not_share_chapters(library_book):
+    data_dir, library, book_id = library_book
+    original = _manager(data_dir)
+    assert original.open_library(library, book_id)
+    data = library.export_book(book_id)
+    copy_id = library.import_book(data)
+
+    # Le même livre importé deux fois : chaque livre garde ses chapitres et traductions
+    assert sorted(book['chapter_count'] for book in library.list_books()) == [3, 3]
+    copy = _manager(data_dir)
+    assert copy.open_library(library, copy_id)
+    assert not {chapter.id for chapter in copy.chapters} & {chapter.id for chapter in original.chapters}
+    assert copy.chapters[1].get_translation('de') == "de 1"
+
+    copy.chapters[0].update_content("Copie modifiée")
+    copy.remove_chapter(2)
+    assert copy.save().result()
+    assert [chapter['content_fr'] for chapter in library.load_book(book_id)['chapters']] == [
+        "Bonjour 0\nSuite", "Bonjour 1\nSuite", "Bonjour 2\nSuite"]
+    assert library.load_book(copy_id)['chapters'][0]['content_fr'] == "Copie modifiée"
+
+    # Un chapitre d'un autre livre n'est jamais déplacé
+    with pytest.raises(ValueError):
+        library.apply_records(copy_id, [{'op': 'chapter', 'data': data['chapters'][0]}])
+
+def test_library_saves_take_backups(library_book, monkeypatch):
+    data_dir, library, book_id = library_book
+    manager = _manager(data_dir)
+    assert manager.open_library(library, book_id)
+    assert manager.list_backups() == []
+
+    manager.chapters[0].update_content("Modifié")
+    assert manager.save().result()
+    assert manager.list_backups() == []  # Sauvegarde de secours récente (ouverture)
+
+    monkeypatch.setattr(book_manager, 'COMPACT_INTERVAL', 0)
+    manager.chapters[0].update_content("Modifié encore")
+    assert manager.save().result()
+    assert len(manager.list_backups()) == 1
+    restored = manager.backups.restore(manager.backups.list_backups()[0])
+    assert restored['chapters'][0]['content_fr'] == "Modifié encore"
+    assert restored['chapters'][1]['translations']['de'] == "de 1"
@@ -0,0 +1,72 @@
+"""
+Sauvegarde instantané + journal : ancien format sans ids et journal qui ne
+correspond pas à l'instantané
+"""
+import json
+
+from core.backup_store import BackupStore
+from core.book_manager import BookManager, JOURNAL_SUFFIX
+
+def _manager(data_dir):
+    manager = BookManager()
+    manager.data_dir = data_dir
+    manager.backups = BackupStore(data_dir / "backups")
+    return manager
+
+def _legacy_book(data_dir):
+    """current_book.json d'avant le journal : chapitres sans id ni journal_seq"""
+    chapters = [{"title": f"C{i}", "content_fr": f"Texte {i}", "mode": "public"} for i in range(3)]
+    (data_dir / "current_book.json").write_text(
+        json.dumps({"title": "Livre", "author": "Auteur", "chapters": chapters}), encoding='utf-8')
+
+def test_legacy_book_keeps_its_chapters_after_edit(tmp_path):
+    _legacy_book(tmp_path)
+    manager = _manager(tmp_path)
+    assert manager.load()
+    manager.chapters[0].update_content("Texte modifié")
+    manager.add_chapter("Nouveau")
+    assert manager.save().result()
+
+    # Premier enregistrement : instantané complet (ids sur disque), pas de journal
+    assert not (tmp_path / ("current_book" + JOURNAL_SUFFIX)).exists()
+    assert "journal_seq" in json.loads((tmp_path / "current_book.json").read_text(encoding='utf-8'))
+
+    # Les sauvegardes suivantes passent par le journal
+    manager.chapters[1].update_content("Texte 1 modifié")
+    assert manager.save().result()
+    assert (tmp_path / ("current_book" + JOURNAL_SUFFIX)).exists()
+
+    reloaded = _manager(tmp_path)
+    assert reloaded.load()
+    assert [(chapter.title, chapter.content_fr) for chapter in reloaded.chapters] == [
+        ("C0", "Texte modifié"), ("C1", "Texte 1 modifié"), ("C2", "Texte 2"), ("Nouveau", "")]
+    assert [chapter.id for chapter in reloaded.chapters] == [chapter.id for chapter in manager.chapters]
+
+def test_journal_with_unknown_chapter_is_set_aside(tmp_path):
+    manager = _manager(tmp_path)
+    for i in range(2):
+        manager.add_chapter(f"C{i}").update_content(f"Texte {i}")
+    assert manager.save().result()
+    manager.chapters[0].update_content("Texte 0 modifié")
+    assert manager.save().result()
+
+    # Ordre qui désigne un chapitre absent de l'instantané
+    journal_path = tmp_path / ("current_book" + JOURNAL_SUFFIX)
+    BookManager._append_journal(journal_path, manager._journal_seq + 1,
+                                [{"op": "order", "ids": ["inconnu", manager.chapters[1].id]}])
+
+    reloaded = _manager(tmp_path)
+    assert reloaded.load()
+    # Rejeu arrêté avant l'ordre corrompu : aucun chapitre perdu
+    assert [(chapter.title, chapter.content_fr) for chapter in reloaded.chapters] == [
+        ("C0", "Texte 0 modifié"), ("C1", "Texte 1")]
+    assert not journal_path.exists()
+    assert (tmp_path / ("current_book" + JOURNAL_SUFFIX + ".corrupt")).exists()
+
+    # Prochaine sauvegarde : instantané complet
+    reloaded.chapters[1].update_content("Texte 1 modifié")
+    assert reloaded.save().result()
+    assert not journal_path.exists()
+    again = _manager(tmp_path)
+    assert again.load()
+    assert [chapter.content_fr for chapter in again.chapters] == ["Texte 0 modifié", "Texte 1 modifié"]
@@ -0,0 +1,92 @@
+"""
+Traduction en direct : routes de "Tout traduire", pause pendant les
+traductions demandées et état borné
+"""
+from core import live_translator
+from core.chapter import Chapter
+from core.live_translator import LiveTranslator
+
+class RecordingTranslator:
+    """Traducteur factice : note les lots demandés"""
+
+    available = True
+    memory = object()
+    _active_work = 0
+
+    def __init__(self):
+        self.calls = []
+
+    def translate_titles(self, titles, target_langs, route_langs=None):
+        self.calls.append((titles, target_langs, route_langs))
+        return {lang: [f"{lang}: {title}" for title in titles] for lang in target_langs}
+
+def _chapter(text):
+    chapter = Chapter("Chapitre")
+    chapter.update_content(text)
+    return chapter
+
+def test_routes_are_planned_for_the_batch_languages():
+    translator = RecordingTranslator()
+    live = LiveTranslator(translator, delay=0, route_langs=['en', 'de', 'ja'])
+    live.note_edit(_chapter("Bonjour\nSuite"), ['de'])
+    live._translate_stable()
+    assert translator.calls == [(["Bonjour"], ['de'], ['en', 'de', 'ja']),
+                                (["Suite"], ['de'], ['en', 'de', 'ja'])]
+
+def test_waits_while_a_requested_translation_runs():
+    translator = RecordingTranslator()
+    running = [True]
+    live = LiveTranslator(translator, delay=0, busy=lambda: running[0])
+    live.note_edit(_chapter("Bonjour"), ['de'])
+    live._translate_stable()
+    assert translator.calls == []
+    running[0] = False
+    live._translate_stable()
+    assert len(translator.calls) == 1
+
+def test_paragraphs_covered_by_the_chapter_translation_are_skipped():
+    translator = RecordingTranslator()
+    chapter = _chapter("Bonjour\nSuite")
+    chapter.set_translation('de', "Hallo\n", [chapter.get_source_hashes()[0], ""])
+    live = LiveTranslator(translator, delay=0)
+    live.note_edit(chapter, ['de'])
+    live._translate_stable()
+    assert [call[0] for call in translator.calls] == [["Suite"]]
+
+def test_state_is_pruned(monkeypatch):
+    monkeypatch.setattr(live_translator, 'MAX_CHAPTERS', 2)
+    translator = RecordingTranslator()
+    live = LiveTranslator(translator, delay=0)
+    chapter = _chapter("Premier\nDeuxième")
+    live.note_edit(chapter, ['de'])
+    live._translate_stable()
+    assert len(live._done[chapter.id]) == 2
+
+    # Paragraphe remplacé : son entrée disparaît
+    chapter.update_content("Premier\nAutre")
+    live.note_edit(chapter, ['de'])
+    live._translate_stable()
+    assert {paragraph_hash for paragraph_hash, _ in live._done[chapter.id]} == set(chapter.get_source_hashes())
+
+    # Au plus MAX_CHAPTERS chapitres suivis
+    for i in range(3):
+        live.note_edit(_chapter(f"Texte {i}"), ['de'])
+    live._translate_stable()
+    assert chapter.id not in live._done and chapter.id not in live._seen
+    assert len(live._seen) == 2
+
+def test_default_languages_are_computed_off_the_keystroke_path():
+    translator = RecordingTranslator()
+    computed = []
+    live = LiveTranslator(translator, delay=0, default_langs=lambda: computed.append(1) or ['es'])
+    chapter = _chapter("Bonjour")
+    for _ in range(20):
+        live.note_edit(chapter)
+    assert computed == []
+    live._translate_stable()
+    chapter.update_content("Bonjour\nSuite")
+    live.note_edit(chapter)
+    live._translate_stable()
+    # Recalculées au plus toutes les LANGS_REFRESH secondes
+    assert computed == [1]
+    assert [call[1] for call in translator.calls] == [['es'], ['es']]
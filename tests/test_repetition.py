@@ -0,0 +1,71 @@
+"""
+Tests du moteur de répétitions sur des entrées de plusieurs mégaoctets
+(sorties de modèle dégénérées, sans espaces)
+"""
+import random
+import time
+
+from core.repetition import RepetitionEngine
+
+# Budget par caractère (find + clean) : large, mais un moteur quadratique le dépasse de loin
+MAX_SECONDS_PER_CHAR = 10e-6
+
+def _timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+def _random_text(length: int, seed: int) -> str:
+    """Texte aléatoire sur ~20 000 idéogrammes : aucune répétition attendue"""
+    rng = random.Random(seed)
+    return ''.join(chr(rng.randrange(0x4E00, 0x9FFF)) for _ in range(length))
+
+def test_identical_characters():
+    engine = RepetitionEngine()
+    text = '啊' * 3_000_000
+
+    found, find_seconds = _timed(engine.find, text, 'zh')
+    assert [(r['kind'], r['unit'], r['count'], r['start'], r['end']) for r in found] == \
+        [('char', '啊', 3_000_000, 0, 3_000_000)]
+
+    (cleaned, removed), clean_seconds = _timed(engine.clean, text, 'zh')
+    assert cleaned == '啊'
+    assert len(removed) == 1
+    assert find_seconds + clean_seconds < MAX_SECONDS_PER_CHAR * len(text)
+
+def test_repeated_phrase():
+    engine = RepetitionEngine()
+    text = '我爱你' * 1_000_000
+
+    found, find_seconds = _timed(engine.find, text, 'zh')
+    assert [(r['kind'], r['unit'], r['count'], r['start'], r['end'], r['unit_end']) for r in found] == \
+        [('phrase', '我爱你', 1_000_000, 0, 3_000_000, 3)]
+
+    (cleaned, _), clean_seconds = _timed(engine.clean, text, 'zh')
+    assert cleaned == '我爱你'
+    assert find_seconds + clean_seconds < MAX_SECONDS_PER_CHAR * len(text)
+
+def test_random_characters():
+    engine = RepetitionEngine()
+    before = _random_text(1_000_000, seed=1)
+    after = _random_text(1_000_000, seed=2)
+    text = before + '好' * 10 + after
+
+    found, find_seconds = _timed(engine.find, text, 'zh')
+    # Seule la répétition insérée est trouvée, à sa place exacte
+    assert [(r['kind'], r['unit'], r['count'], r['start'], r['end']) for r in found] == \
+        [('char', '好', 10, len(before), len(before) + 10)]
+
+    (cleaned, _), clean_seconds = _timed(engine.clean, text, 'zh')
+    assert cleaned == before + '好' + after
+    assert find_seconds + clean_seconds < MAX_SECONDS_PER_CHAR * len(text)
+
+def test_time_grows_linearly():
+    """4x plus de texte : ~4x plus de temps (16x si quadratique)"""
+    engine = RepetitionEngine()
+    small = '我爱你' * 250_000
+    large = '我爱你' * 1_000_000
+
+    _, small_seconds = _timed(engine.find, small, 'zh')
+    _, large_seconds = _timed(engine.find, large, 'zh')
+    assert large_seconds < 8 * small_seconds
@@ -0,0 +1,41 @@
+"""
+Routes de traduction : pivot FR -> EN compté une seule fois par lot
+"""
+from types import SimpleNamespace
+
+import pytest
+
+from core.route_planner import RoutePlanner
+from core.translator import TranslationHandle
+
+def _package(source, target):
+    return SimpleNamespace(from_code=source, to_code=target, package_version='1.0')
+
+@pytest.fixture
+def planner(tmp_path):
+    planner = RoutePlanner(tmp_path / "route_stats.json")
+    # Caractères / seconde : le pack direct FR -> JA est deux fois plus lent
+    planner.throughput.update({'fr>en': 1000.0, 'en>ja': 1000.0, 'fr>ja': 500.0, 'en>de': 1000.0})
+    planner.update([_package('fr', 'en'), _package('en', 'ja'), _package('fr', 'ja'), _package('en', 'de')])
+    return planner
+
+def test_single_target_takes_direct_route(planner):
+    assert planner.get_route('fr', 'ja') == ['fr', 'ja']
+    assert planner.plan_batch('fr', ['ja']) == {'ja': ['fr', 'ja']}
+
+def test_pivot_is_paid_once_per_batch(planner):
+    # EN est calculé de toute façon : JA ne paie plus que EN -> JA
+    assert planner.plan_batch('fr', ['en', 'ja']) == {'en': ['fr', 'en'], 'ja': ['fr', 'en', 'ja']}
+    # DE n'est joignable que par le pivot : JA en profite aussi
+    assert planner.plan_batch('fr', ['ja', 'de']) == {'ja': ['fr', 'en', 'ja'], 'de': ['fr', 'en', 'de']}
+
+def test_unreachable_target(planner):
+    assert planner.plan_batch('fr', ['ja', 'ko']) == {'ja': ['fr', 'ja'], 'ko': None}
+
+def test_first_call_of_a_handle_is_not_warm():
+    # Objet Argos (mode stanza) : chargé lors de son premier appel
+    argos = SimpleNamespace(translate=lambda sentence: sentence.upper())
+    handle = TranslationHandle(_package('fr', 'en'), argos, {'segmenter': 'stanza'})
+    assert not handle.warm
+    assert handle.translate_sentences(['bonjour']) == ['BONJOUR']
+    assert handle.warm
@@ -0,0 +1,37 @@
+"""
+Classement des phrases : anglais cité dans un texte français, y compris du
+français tapé sans accents
+"""
+import pytest
+
+from core.translator import ENGLISH, PASSTHROUGH, TRANSLATE, SegmentClassifier
+
+@pytest.fixture
+def classifier():
+    return SegmentClassifier()
+
+@pytest.mark.parametrize("sentence", [
+    "Ou vas-tu avec ton sac ?",
+    "Jusqu a quand tu vas rester avec moi ?",
+    "Il etait une fois un garcon qui aimait la mer.",
+    "Tu as vu ce qu il a fait hier soir ?",
+    "Elle est partie tot ce matin pour son travail.",
+    "Je ne sais pas ou il est alle.",
+])
+def test_unaccented_french_is_translated(classifier, sentence):
+    assert classifier.classify(sentence) == TRANSLATE
+
+@pytest.mark.parametrize("sentence", [
+    "I think that it was the best day of my life.",
+    "The quick brown fox jumps over the lazy dog.",
+    "This is what happens when you stop listening to your body.",
+])
+def test_english_skips_the_first_hop(classifier, sentence):
+    assert classifier.classify(sentence) == ENGLISH
+
+def test_english_source_is_never_flagged(classifier):
+    assert classifier.classify("The quick brown fox jumps over the lazy dog.", 'en') == TRANSLATE
+
+def test_urls_and_numbers_pass_through(classifier):
+    assert classifier.classify("https://example.com/page.") == PASSTHROUGH
+    assert classifier.classify("42 000") == PASSTHROUGH
@@ -0,0 +1,14 @@
+"""
+Benchmark des segmenteurs : chaque moteur mesuré dans son propre processus
+"""
+import os
+
+from core.segmenter import benchmark_segmenters
+
+def test_rules_benchmark_reports_process_rss():
+    results = benchmark_segmenters("Bonjour M. Dupont. Comment allez-vous ?\nTrès bien, merci !")
+    stats = results['rules']
+    assert stats['sentences'] == 3
+    if os.name == 'posix':
+        # RSS d'un interpréteur entier, pas seulement les allocations Python
+        assert stats['peak_mb'] >= stats['base_mb'] > 1
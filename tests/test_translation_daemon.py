@@ -0,0 +1,63 @@
+"""
+Client du démon de traduction : un démon bloqué ne bloque pas l'application
+"""
+import threading
+import time
+from multiprocessing.connection import Listener
+
+import pytest
+
+from core import translation_daemon
+from core.translation_daemon import DaemonClient
+
+AUTHKEY = b"test-daemon-key"
+
+@pytest.fixture
+def stuck_daemon():
+    """Démon factice : répond au ping puis ne répond plus jamais"""
+    listener = Listener(('127.0.0.1', 0), authkey=AUTHKEY)
+    connections = []
+
+    def serve():
+        conn = listener.accept()
+        connections.append(conn)
+        conn.recv()
+        conn.send(('ok', 'pong'))
+        while True:
+            try:
+                conn.recv()
+            except (EOFError, OSError):
+                return
+
+    threading.Thread(target=serve, daemon=True).start()
+    yield listener.address[1]
+    for conn in connections:
+        conn.close()
+    listener.close()
+
+def test_call_times_out_on_stuck_daemon(stuck_daemon):
+    client = DaemonClient(stuck_daemon, AUTHKEY, call_timeout=0.3)
+    start = time.time()
+    with pytest.raises(TimeoutError):
+        client.call('translate_sentences', 'fr', 'en', ['Bonjour'])
+    assert time.time() - start < 5
+
+    # Connexion abandonnée : les appels suivants échouent comme un démon perdu
+    with pytest.raises(OSError):
+        client.call('status')
+    client.close()
+
+def test_key_is_private_to_its_owner(tmp_path, monkeypatch):
+    key_file = tmp_path / "translation_daemon.key"
+    monkeypatch.setattr(translation_daemon, 'KEY_FILE', key_file)
+    key = translation_daemon.load_authkey(create=True)
+    assert len(key) == 32
+    assert key_file.stat().st_mode & 0o777 == 0o600
+    assert translation_daemon.load_authkey(create=True) == key
+
+    # Clé lisible par le groupe ou les autres : refusée (le canal désérialise du pickle)
+    key_file.chmod(0o644)
+    assert translation_daemon.load_authkey() is None
+    assert translation_daemon.load_authkey(create=True) is None
+    key_file.chmod(0o600)
+    assert translation_daemon.load_authkey() == key
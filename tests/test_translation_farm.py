@@ -0,0 +1,141 @@
+"""
+Ferme de traduction : coordinateur et travailleurs locaux (traducteur factice)
+"""
+import multiprocessing
+import os
+import signal
+import time
+from concurrent.futures import CancelledError
+
+import pytest
+
+from core import translation_farm
+from core.translation_farm import FarmCoordinator, FarmWorker
+
+AUTHKEY = b"test-farm-key"
+
+class StubTranslator:
+    """Traducteur factice : préfixe chaque paragraphe par la langue cible"""
+
+    package_versions = {('fr', 'en'): '1.0', ('en', 'de'): '1.0'}
+
+    def __init__(self, marker: str):
+        self.marker = marker
+
+    def translate_job(self, paragraphs, hops):
+        if 'hang' in paragraphs:
+            # Le premier travailleur qui reçoit ce travail se bloque (puis est tué)
+            try:
+                fd = os.open(self.marker, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            except FileExistsError:
+                pass
+            else:
+                os.write(fd, str(os.getpid()).encode())
+                os.close(fd)
+                time.sleep(60)
+        time.sleep(0.02)
+        return [f"{hops[-1]}:{paragraph}" for paragraph in paragraphs], {'segments': len(paragraphs)}
+
+def _run_stub_worker(port: int, marker: str):
+    FarmWorker('127.0.0.1', port, AUTHKEY, translator=StubTranslator(marker)).run(retry_delay=0.2)
+
+def _wait_for(condition, timeout: float = 10.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if condition():
+            return True
+        time.sleep(0.05)
+    return False
+
+@pytest.fixture
+def farm(tmp_path):
+    """Coordinateur sur un port libre de 127.0.0.1 et deux travailleurs locaux"""
+    coordinator = FarmCoordinator(host='127.0.0.1', port=0, job_timeout=30,
+                                  idle_timeout=30, authkey=AUTHKEY)
+    coordinator.start()
+    marker = str(tmp_path / "hang.pid")
+    context = multiprocessing.get_context('fork')
+    workers = [context.Process(target=_run_stub_worker, args=(coordinator.port, marker), daemon=True)
+               for _ in range(2)]
+    for worker in workers:
+        worker.start()
+    try:
+        assert _wait_for(lambda: len(coordinator.get_stats()['workers']) == 2)
+        yield coordinator, marker
+    finally:
+        coordinator.shutdown()
+        for worker in workers:
+            if worker.is_alive():
+                worker.kill()
+            worker.join(5)
+
+def test_jobs_are_spread_over_workers(farm):
+    coordinator, _ = farm
+    futures = [coordinator.submit(['fr', 'en', 'de'], [f"p{i}", f"q{i}"]) for i in range(20)]
+    workers = set()
+    for i, future in enumerate(futures):
+        lines, worker, stats = future.result(timeout=30)
+        assert lines == [f"de:p{i}", f"de:q{i}"]
+        assert stats == {'segments': 2}
+        workers.add(worker)
+
+    assert len(workers) == 2
+    # Identifiant par connexion : hôte:pid#compteur
+    assert all('#' in worker for worker in workers)
+    stats = coordinator.get_stats()
+    assert stats['completed'] == 20
+    assert sum(stats['workers'].values()) == 20
+
+def test_job_of_killed_worker_is_retried(farm):
+    coordinator, marker = farm
+    future = coordinator.submit(['fr', 'en'], ['hang', 'ok'])
+    assert _wait_for(lambda: os.path.exists(marker) and os.path.getsize(marker) > 0)
+    with open(marker) as f:
+        killed = int(f.read())
+    os.kill(killed, signal.SIGKILL)
+
+    lines, worker, _ = future.result(timeout=30)
+    assert lines == ['en:hang', 'en:ok']
+    assert f":{killed}#" not in worker
+    stats = coordinator.get_stats()
+    assert stats['retries'] >= 1
+    assert stats['lost_workers'] >= 1
+
+def test_job_without_capable_worker_fails_after_idle_timeout(farm):
+    coordinator, _ = farm
+    coordinator.idle_timeout = 0.5
+    future = coordinator.submit(['fr', 'ja'], ['bonjour'])
+    with pytest.raises(RuntimeError, match="aucun travailleur capable"):
+        future.result(timeout=10)
+
+def test_job_fails_when_no_worker_connects():
+    coordinator = FarmCoordinator(host='127.0.0.1', port=0, idle_timeout=0.5, authkey=AUTHKEY)
+    coordinator.start()
+    try:
+        future = coordinator.submit(['fr', 'en'], ['bonjour'])
+        with pytest.raises(RuntimeError):
+            future.result(timeout=10)
+    finally:
+        coordinator.shutdown()
+
+def test_shutdown_cancels_pending_jobs():
+    coordinator = FarmCoordinator(host='127.0.0.1', port=0, idle_timeout=60, authkey=AUTHKEY)
+    coordinator.start()
+    future = coordinator.submit(['fr', 'en'], ['bonjour'])
+    coordinator.shutdown()
+    with pytest.raises(CancelledError):
+        future.result(timeout=5)
+
+def test_key_is_private_to_its_owner(tmp_path, monkeypatch):
+    key_file = tmp_path / "translation_farm.key"
+    monkeypatch.setattr(translation_farm, 'KEY_FILE', key_file)
+    key = translation_farm.load_farm_key(create=True)
+    assert len(key) == 32
+    assert key_file.stat().st_mode & 0o777 == 0o600
+
+    # Clé lisible par d'autres : refusée, et le coordinateur n'ouvre pas de port
+    key_file.chmod(0o640)
+    assert translation_farm.load_farm_key(create=True) is None
+    coordinator = FarmCoordinator(host='127.0.0.1', port=0)
+    with pytest.raises(RuntimeError, match="clé"):
+        coordinator.start()
@@ -0,0 +1,41 @@
+"""
+Mémoire de traduction : éviction LRU sans COUNT(*) à chaque insertion
+"""
+import pytest
+
+from core.translation_memory import TranslationMemory
+
+@pytest.fixture
+def memory(tmp_path):
+    memory = TranslationMemory(tmp_path / "memory.db", max_entries=100)
+    yield memory
+    memory.close()
+
+def test_puts_do_not_count_the_table(memory):
+    statements = []
+    memory._conn.set_trace_callback(statements.append)
+    for i in range(50):
+        memory.put_many({f"Phrase {i}": f"Sentence {i}"}, 'fr', 'en')
+    memory._conn.set_trace_callback(None)
+
+    # Un seul comptage (le premier ajout), aucune éviction sous la limite
+    assert sum('COUNT(*)' in statement for statement in statements) == 1
+    assert memory.get_stats()['entries'] == 50
+
+def test_replaced_sentences_are_not_counted_twice(memory):
+    for _ in range(3):
+        memory.put_many({f"Phrase {i}": f"Sentence {i}" for i in range(60)}, 'fr', 'en')
+    assert memory._entries == 60
+    assert memory.evictions == 0
+    assert memory.get_many(["Phrase 7"], 'fr', 'en') == {"Phrase 7": "Sentence 7"}
+
+def test_least_recently_used_sentences_are_evicted(memory):
+    memory.put_many({f"Ancienne {i}": f"Old {i}" for i in range(60)}, 'fr', 'en')
+    memory.get_many(["Ancienne 0"], 'fr', 'en')  # Reste récente
+    memory.put_many({f"Nouvelle {i}": f"New {i}" for i in range(60)}, 'fr', 'en')
+
+    # 120 > 100 : retour à 90 % de la limite
+    assert memory.get_stats()['entries'] == 90
+    assert memory._entries == 90
+    assert memory.evictions == 30
+    assert memory.get_many(["Ancienne 0", "Ancienne 1"], 'fr', 'en') == {"Ancienne 0": "Old 0"}
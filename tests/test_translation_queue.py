@@ -0,0 +1,93 @@
+"""
+File de traduction persistante : clé (livre, chapitre, langue) et
+enregistrement de chaque travail dès qu'il est terminé
+"""
+import sqlite3
+
+import pytest
+
+from core.chapter import Chapter
+from core.translation_engine import TranslationEngine
+from core.translation_queue import TranslationQueue
+
+def _chapter(text="Bonjour\nSuite"):
+    chapter = Chapter("Chapitre")
+    chapter.update_content(text)
+    return chapter
+
+def _translate(chapter, lang):
+    chapter.set_translation(lang, f"{lang}: {chapter.content_fr}", chapter.get_source_hashes())
+
+@pytest.fixture
+def queue(tmp_path):
+    queue = TranslationQueue(tmp_path / "queue.db")
+    yield queue
+    queue.close()
+
+def test_jobs_are_keyed_by_book(queue):
+    # Même id de chapitre dans deux livres (copies du même fichier)
+    original = _chapter()
+    imported = Chapter.from_dict(original.to_dict(include_translations=False))
+    assert queue.enqueue([original], ['en', 'de'], 'json') == 2
+    assert queue.enqueue([imported], ['en', 'de'], 'library') == 2
+
+    _translate(original, 'en')
+    queue.checkpoint(original, 'en', 'json')
+    assert queue.get_pending('json') == [(original.id, 'de')]
+    assert len(queue.get_pending('library')) == 2
+
+    # Le résultat d'un livre n'est jamais réappliqué à l'autre
+    assert queue.restore([imported], 'library') == 0
+    assert imported.get_translation('en') == ""
+
+    queue.clear('json')
+    assert queue.get_pending('json') == []
+    assert len(queue.get_pending('library')) == 2
+
+def test_old_queue_is_migrated_to_current_book(tmp_path):
+    chapter = _chapter()
+    _translate(chapter, 'en')
+    conn = sqlite3.connect(str(tmp_path / "queue.db"))
+    conn.execute("CREATE TABLE jobs (chapter_id TEXT NOT NULL, lang TEXT NOT NULL,"
+                 " source_hash TEXT NOT NULL, status TEXT NOT NULL, translation TEXT,"
+                 " source_hashes TEXT, updated_at REAL NOT NULL, PRIMARY KEY (chapter_id, lang))")
+    conn.execute("INSERT INTO jobs VALUES (?, 'en', ?, 'done', ?, ?, 0)",
+                 (chapter.id, TranslationQueue.content_hash(chapter), chapter.get_translation('en'),
+                  '["%s", "%s"]' % tuple(chapter.get_source_hashes())))
+    conn.commit()
+    conn.close()
+
+    queue = TranslationQueue(tmp_path / "queue.db")
+    restored = _chapter()
+    restored.id = chapter.id
+    assert queue.restore([restored]) == 1
+    assert restored.get_translation('en') == chapter.get_translation('en')
+    queue.close()
+
+class InterruptedTranslator:
+    """Traducteur séquentiel factice : s'arrête net après la première langue"""
+
+    available = True
+
+    def needs_pivot(self, target_langs):
+        return False
+
+    def translate_chapter_to_many(self, chapter, target_langs, progress_callback=None, result_callback=None):
+        _translate(chapter, target_langs[0])
+        result_callback(target_langs[0])
+        raise KeyboardInterrupt("fermeture de l'application")
+
+    def get_decoding_stats(self):
+        return {'segments': 0, 'retranslated': 0}
+
+def test_sequential_mode_checkpoints_each_language(queue):
+    chapter = _chapter()
+    engine = TranslationEngine(InterruptedTranslator(), workers=1, queue=queue)
+    with pytest.raises(KeyboardInterrupt):
+        engine.translate_book([chapter], ['de', 'es'], book_id='livre')
+
+    # DE est terminé avant l'interruption : seul ES reste à faire
+    assert queue.get_pending('livre') == [(chapter.id, 'es')]
+    fresh = Chapter.from_dict(chapter.to_dict(include_translations=False))
+    assert queue.restore([fresh], 'livre') == 1
+    assert fresh.get_translation('de') == chapter.get_translation('de')